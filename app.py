@@ -12,7 +12,12 @@ from flask_swagger_ui import get_swaggerui_blueprint
 from flask_cors import CORS
 
 from config import Config
-from extensions import db  # extensions.py에 db = SQLAlchemy()만 있어야 합니다.
+from extensions import (  # 확장 인스턴스는 extensions.py에서만 생성합니다.
+    db, supabase_registry, signed_url_cache, content_cache, search_index, table_versions, query_cache,
+    conditional_get, compressor, job_queue, upload_sessions, pdf_texts, content_index,
+    image_variants, label_sheets, pool_monitor, repositories, sql_profiler, metrics
+)
+from services.json_provider import FastJSONProvider
 
 def create_app():
     """
@@ -32,19 +37,66 @@ def create_app():
     CORS(
         app,
         resources={r"/api/*": {"origins": "*"}},  # 모든 API 경로에 대해 모든 도메인 허용
-        expose_headers=["Content-Disposition"]    # 파일 다운로드를 위한 헤더 노출
+        # 파일 다운로드 및 PDF 뷰어의 Range 요청을 위한 헤더 노출
+        expose_headers=["Content-Disposition", "Content-Range", "Accept-Ranges", "Content-Length", "ETag",
+                        "X-DB-Queries", "Server-Timing"]
     )
 
     # 한글 JSON 응답을 위한 설정
-    # 기본적으로 Flask는 ASCII로만 JSON을 인코딩하므로 한글 지원을 위해 False로 설정
-    app.config["JSON_AS_ASCII"] = False
+    # Flask 3부터 JSON_AS_ASCII 설정은 무시되므로 JSON 제공자에서 직접 UTF-8로 출력합니다.
+    # orjson이 있으면 고속 직렬화, 없으면 표준 json 모듈(ensure_ascii=False) 사용
+    app.json = FastJSONProvider(app)
+
+    # 메트릭 수집 등록 (라우트 계측 미들웨어, 스토리지 호출은 레지스트리의 httpx 전송 계층에서 계측)
+    metrics.init_app(app)
 
     # 데이터베이스 초기화 (여기서 "한 번만" 실행)
+    # 연결 풀 설정(DB_POOL_*)에 계측 풀 클래스를 지정한 뒤 엔진을 만들고 풀 이벤트를 구독
+    pool_monitor.init_app(app)
     db.init_app(app)
+    # SQL 프로파일러 등록 (SQL_PROFILE=true일 때만 요청 훅/커서 이벤트 구독)
+    sql_profiler.init_app(app)
+    with app.app_context():
+        pool_monitor.watch(db.engine)
+        sql_profiler.watch(db.engine)
+    # 요청 단위 Repository 등록 (요청이 끝나면 연결을 풀에 반환)
+    repositories.init_app(app)
+
+    # Supabase 클라이언트 레지스트리 초기화 (모든 요청이 연결 풀을 공유)
+    supabase_registry.init_app(app)
+    # 서명 URL 캐시 초기화 (만료 시간/캐시 크기 설정 적용)
+    signed_url_cache.init_app(app)
+    # 로컬 콘텐츠 캐시 초기화 (PDF/첨부 이미지 디스크 캐시)
+    content_cache.init_app(app)
+    # 검색 색인 초기화 (첫 검색 시 DB에서 구성)
+    search_index.init_app(app)
+    # 테이블 버전 카운터와 쿼리 캐시 초기화 (쓰기 시 버전 증가 → 캐시 무효화)
+    table_versions.init_app(app)
+    query_cache.init_app(app)
+    # 조건부 GET 미들웨어 등록 (읽기 응답에 ETag/Last-Modified, 일치 시 SQL 없이 304)
+    conditional_get.init_app(app)
+    # 응답 압축 등록 (COMPRESS_MIN_SIZE 이상 응답을 br/gzip으로 압축)
+    compressor.init_app(app)
+    # 백그라운드 작업 큐 초기화 (JOB_WORKERS개 워커, JOB_QUEUE_SIZE 초과 시 503)
+    job_queue.init_app(app)
+    # 이어 올리기 업로드 세션 저장소 초기화 (UPLOAD_SPOOL_DIR/sessions)
+    upload_sessions.init_app(app)
+    # PDF 본문 저장소 초기화 (PDF_TEXT_DIR, 추출 프로세스 풀 PDF_TEXT_WORKERS)
+    pdf_texts.init_app(app)
+    # 첨부 이미지 변형 초기화 (IMAGE_VARIANT_WIDTHS, 워커 IMAGE_VARIANT_WORKERS)
+    image_variants.init_app(app)
+    # 라벨 시트 생성기 초기화 (QR/PDF 프로세스 풀 LABEL_WORKERS, 결과는 콘텐츠 캐시에 보관)
+    label_sheets.init_app(app)
 
     # 블루프린트 등록 - MSDS 관련 라우트들을 /api/msds 경로에 등록
     from routes.msds import msds_bp
     app.register_blueprint(msds_bp, url_prefix="/api/msds")
+    # 이전 프로세스가 끝내지 못한 작업을 실패로 기록하고 스풀 파일/업로드 세션 정리 (라우트의 정리 함수 등록 후)
+    job_queue.recover()
+
+    # CLI 명령 등록 (검색 색인 재구성 등)
+    from commands import register_commands
+    register_commands(app)
 
     # 헬스체크 엔드포인트 - 서비스 상태 확인용
     @app.get("/healthz")
@@ -52,6 +104,46 @@ def create_app():
         """서비스 상태를 확인하는 헬스체크 엔드포인트"""
         return jsonify({"status": "ok"})
 
+    # 스토리지 클라이언트 통계 엔드포인트 - 연결 재사용 현황 확인용
+    @app.get("/debug/storage")
+    def debug_storage():
+        """Supabase 클라이언트/연결 재사용, 서명 URL 캐시, 로컬 콘텐츠 캐시, 쿼리 캐시, 압축, 작업 큐 통계를 반환하는 엔드포인트"""
+        return jsonify({
+            "client": supabase_registry.stats(),
+            "signed_url_cache": signed_url_cache.stats(),
+            "content_cache": content_cache.stats(),
+            "query_cache": query_cache.stats(),
+            "conditional_get": conditional_get.stats(),
+            "compression": compressor.stats(),
+            "jobs": job_queue.stats(),
+            "upload_sessions": upload_sessions.stats(),
+            "pdf_text": pdf_texts.stats(),
+            "content_index": content_index.stats(),
+            "image_variants": image_variants.stats(),
+            "labels": label_sheets.stats(),
+            "json_backend": app.json.backend
+        })
+
+    # 데이터베이스 연결 풀 통계 엔드포인트 - 풀 고갈/대기 현황 확인용 (워커 프로세스별)
+    @app.get("/debug/pool")
+    def debug_pool():
+        """연결 풀 크기/사용 중 연결/오버플로, 연결 생성 수, 체크아웃 대기 시간, 요청 단위 데이터 접근 통계를 반환하는 엔드포인트"""
+        stats = pool_monitor.stats()
+        stats["repository"] = repositories.stats()
+        return jsonify(stats)
+
+    # SQL 프로파일 엔드포인트 - 엔드포인트별 쿼리 수/DB 시간과 최근 느린 쿼리(실행 계획 포함) 확인용 (워커 프로세스별)
+    @app.get("/debug/sql")
+    def debug_sql():
+        """엔드포인트별 쿼리 수/DB 시간 누적과 최근 느린 쿼리를 반환하는 엔드포인트 (SQL_PROFILE=true일 때 수집)"""
+        return jsonify(sql_profiler.stats())
+
+    # Prometheus 메트릭 엔드포인트 - 라우트별 지연 시간/상태 코드, 처리 중 요청 수, 스토리지 호출 지연 시간 (모든 워커 합산)
+    @app.get("/metrics")
+    def metrics_endpoint():
+        """Prometheus 텍스트 형식으로 메트릭을 반환하는 엔드포인트"""
+        return app.response_class(metrics.render(), mimetype="text/plain; version=0.0.4")
+
     # 루트 경로 → Swagger 문서로 리다이렉트
     @app.get("/")
     def index():
@@ -0,0 +1,399 @@
+"""
+API 핫 경로 벤치마크
+합성 MSDS 카탈로그(기본 1천/1만/10만 건, 첨부파일 연결 포함)를 SQLite에 만들고,
+Flask 테스트 클라이언트로 목록/상세/검색/옵션/수정 요청을 여러 동시성에서 실행하여
+p50/p95/p99 지연 시간과 처리량을 JSON으로 저장합니다. 스토리지 호출은 로컬 가짜 Supabase 서버로 보냅니다.
+
+- 카탈로그 크기마다 별도 프로세스에서 앱을 만들어 캐시/색인 상태가 섞이지 않게 합니다.
+- 같은 --seed면 같은 데이터와 같은 요청 순서를 사용하므로 커밋 간 결과를 --compare로 비교할 수 있습니다.
+- SQLite와 테스트 클라이언트로 측정하므로 운영(MySQL, gunicorn) 절대값이 아니라 코드 변경 전후 비교용입니다.
+
+사용법:
+    # 기본 실행 (1천/1만/10만 건 × 동시성 1/4/16, 결과는 benchmarks/results/<커밋>.json)
+    python benchmarks/bench_api.py
+
+    # 일부만 빠르게 측정
+    python benchmarks/bench_api.py --sizes 1000 --concurrency 1,8 --requests 200 --output /tmp/bench.json
+
+    # 이전 결과와 비교 (p95가 --threshold 이상 나빠진 시나리오 표시, 있으면 종료 코드 1)
+    python benchmarks/bench_api.py --compare benchmarks/results/abc1234.json
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+
+# 저장소 루트를 import 경로에 추가 (benchmarks/에서 직접 실행 시)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# 시드 데이터 형식이 바뀌면 올려서 캐시된 DB를 다시 만들게 함
+CATALOG_VERSION = 1
+
+CHEMICALS = [
+    "염산", "황산", "질산", "수산화나트륨", "톨루엔", "자일렌", "아세톤", "메탄올", "에탄올", "이소프로필알코올",
+    "과산화수소", "암모니아수", "포름알데히드", "차아염소산나트륨", "헥산", "벤젠", "클로로포름", "디클로로메탄",
+    "Acetone", "Toluene", "Hydrochloric acid", "Sodium hydroxide", "Ethyl acetate", "Nitric acid",
+]
+USAGES = ["배관 세척", "pH 조정", "시약", "세척용", "실험용", "도장 희석제", "소독", "추출 용매", "표면 처리", "분석용 표준물질"]
+PROTECTIVE = ["방독마스크", "방진마스크", "보안경", "안면보호구", "내화학장갑", "니트릴장갑", "보호복", "안전화", "귀마개", "송기마스크"]
+WARNINGS = ["폭발성", "인화성", "산화성", "고압가스", "부식성", "급성독성", "경고", "건강유해성", "환경유해성"]
+SEARCH_TERMS = ["염산", "황산", "톨루엔", "아세톤", "메탄올", "수산화", "세척", "시약", "Acetone", "acid", "M0001", "과산화"]
+
+DEFAULT_SIZES = "1000,10000,100000"
+DEFAULT_CONCURRENCY = "1,4,16"
+
+
+def has_pdf(index):
+    """index번째 MSDS에 PDF가 있는지 (수정 시나리오가 file_loc을 바꾸지 않도록 결정적으로 계산)"""
+    return index % 10 != 0
+
+
+def mid_of(index):
+    return f"M{index:06d}"
+
+
+def seed_catalog(path, size, seed):
+    """
+    합성 MSDS 카탈로그를 SQLite 파일로 만드는 함수
+
+    - 추가자료: 보호구 40개(이미지), 보관 장소 200개, 경고 표지 9개(이미지)
+    - MSDS마다 보호구 1~4개, 장소 1~2개, 경고 표지 0~4개를 연결 (평균 약 6개)
+
+    Args:
+        path (str): 만들 SQLite 파일 경로
+        size (int): MSDS 건수
+        seed (int): 난수 시드
+    """
+    rng = random.Random(seed)
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    con = sqlite3.connect(tmp_path)
+    con.executescript("""
+        CREATE TABLE msds (
+            mid VARCHAR(20) PRIMARY KEY, title VARCHAR(255) NOT NULL, usage VARCHAR(255), file_loc VARCHAR(1024),
+            is_osh INTEGER NOT NULL DEFAULT 0, is_chr INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE msds_additional_info (
+            aid INTEGER PRIMARY KEY, mid VARCHAR(20), title VARCHAR(255), type INTEGER, file_loc VARCHAR(1024),
+            createdAt TEXT DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE msds_additional_relation (
+            mid VARCHAR(20), aid INTEGER, createdAt TEXT DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE INDEX idx_relation_mid ON msds_additional_relation (mid);
+        CREATE INDEX idx_relation_aid ON msds_additional_relation (aid);
+    """)
+    infos = []
+    for i in range(40):
+        infos.append((len(infos) + 1, f"{PROTECTIVE[i % len(PROTECTIVE)]} {i // len(PROTECTIVE) + 1}형", 0,
+                      f"msds/protective/{i + 1}.png"))
+    for i in range(200):
+        infos.append((len(infos) + 1, f"제{i // 20 + 1}공장 보관창고 {chr(65 + i % 20)}", 1, None))
+    for i, name in enumerate(WARNINGS):
+        infos.append((len(infos) + 1, name, 2, f"msds/warning/{i + 1}.png"))
+    con.executemany("INSERT INTO msds_additional_info (aid, title, type, file_loc) VALUES (?, ?, ?, ?)", infos)
+    by_type = {t: [aid for aid, _, kind, _ in infos if kind == t] for t in (0, 1, 2)}
+
+    rows, relations = [], []
+    for i in range(1, size + 1):
+        mid = mid_of(i)
+        rows.append((
+            mid,
+            f"{rng.choice(CHEMICALS)} {rng.randint(1, 99)}% ({rng.choice(USAGES)})",
+            rng.choice(USAGES),
+            f"msds/pdf/{mid}.pdf" if has_pdf(i) else None,
+            int(rng.random() < 0.6),
+            int(rng.random() < 0.3),
+        ))
+        for kind, low, high in ((0, 1, 4), (1, 1, 2), (2, 0, 4)):
+            relations.extend((mid, aid) for aid in rng.sample(by_type[kind], rng.randint(low, high)))
+        if len(rows) >= 10_000:
+            con.executemany("INSERT INTO msds VALUES (?, ?, ?, ?, ?, ?)", rows)
+            con.executemany("INSERT INTO msds_additional_relation (mid, aid) VALUES (?, ?)", relations)
+            rows, relations = [], []
+    con.executemany("INSERT INTO msds VALUES (?, ?, ?, ?, ?, ?)", rows)
+    con.executemany("INSERT INTO msds_additional_relation (mid, aid) VALUES (?, ?)", relations)
+    con.commit()
+    con.close()
+    os.replace(tmp_path, path)
+
+
+# --- 시나리오: (난수, 카탈로그 크기) -> (메서드, URL, JSON 본문) ---
+
+def _list_page(rng, size):
+    return rng.randint(1, max(1, min(size // 20, 50)))
+
+
+SCENARIOS = {
+    "list_msds": lambda rng, size: ("GET", f"/api/msds?page={_list_page(rng, size)}&per_page=20", None),
+    "list_msds_detailed": lambda rng, size: (
+        "GET", f"/api/msds?page={_list_page(rng, size)}&per_page=20&detailed=true&include=signed_urls", None),
+    "get_msds": lambda rng, size: ("GET", f"/api/msds/{mid_of(rng.randint(1, size))}", None),
+    "search_msds": lambda rng, size: ("GET", f"/api/msds/search?q={rng.choice(SEARCH_TERMS)}&per_page=20", None),
+    "get_options": lambda rng, size: ("GET", "/api/msds/options", None),
+    "update_msds": lambda rng, size: _update(rng, size),
+}
+
+
+def _update(rng, size):
+    index = rng.randint(1, size)
+    mid = mid_of(index)
+    body = {
+        "title": f"{rng.choice(CHEMICALS)} {rng.randint(1, 99)}% ({rng.choice(USAGES)})",
+        "usage": rng.choice(USAGES),
+        "file_loc": f"msds/pdf/{mid}.pdf" if has_pdf(index) else None,  # PDF 경로는 그대로 (본문 추출 작업 없음)
+        "is_osh": rng.randint(0, 1),
+        "is_chr": rng.randint(0, 1),
+    }
+    return "PUT", f"/api/msds/{mid}", body
+
+
+def percentile(samples, p):
+    """정렬된 표본에서 p 백분위 값을 반환하는 함수 (nearest-rank)"""
+    if not samples:
+        return None
+    return samples[max(0, math.ceil(p / 100 * len(samples)) - 1)]
+
+
+def run_scenario(app, name, size, concurrency, total, seed):
+    """
+    한 시나리오를 동시성 concurrency로 total번 실행하는 함수 (스레드마다 테스트 클라이언트 하나)
+
+    Returns:
+        dict: 요청 수, 오류 수, 처리량(req/s), 지연 시간(ms) p50/p95/p99/평균/최대
+    """
+    scenario = SCENARIOS[name]
+    tickets = count()
+
+    def worker(index):
+        client = app.test_client()
+        rng = random.Random(f"{seed}:{name}:{concurrency}:{index}")
+        latencies, errors = [], 0
+        while next(tickets) < total:
+            method, url, body = scenario(rng, size)
+            started = time.perf_counter()
+            response = client.open(url, method=method, json=body)
+            response.get_data()
+            response.close()
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+        return latencies, errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(worker, range(concurrency)))
+    wall = time.perf_counter() - started
+    samples = sorted(latency for latencies, _ in results for latency in latencies)
+    ms = lambda value: round(value * 1000, 3)  # noqa: E731
+    return {
+        "requests": len(samples),
+        "errors": sum(errors for _, errors in results),
+        "throughput_rps": round(len(samples) / wall, 1) if wall else None,
+        "latency_ms": {
+            "p50": ms(percentile(samples, 50)),
+            "p95": ms(percentile(samples, 95)),
+            "p99": ms(percentile(samples, 99)),
+            "mean": ms(sum(samples) / len(samples)),
+            "max": ms(samples[-1]),
+        },
+    }
+
+
+def run_worker(args):
+    """카탈로그 하나에 대해 앱을 만들고 모든 시나리오/동시성을 측정하여 --worker-output에 JSON을 쓰는 함수"""
+    import logging
+
+    import config
+
+    state_dir = tempfile.mkdtemp(prefix="msds-bench-")
+    overrides = {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.abspath(args.database)}",
+        "SUPABASE_URL": args.supabase_url,
+        "SUPABASE_SERVICE_ROLE_KEY": "bench.service.role",
+        "SQL_PROFILE": False,
+        "JOB_WORKERS": 1,
+        "PDF_TEXT_WORKERS": 1,
+        "DB_POOL_SIZE": max(args.concurrency_levels) + 2,
+        "DB_POOL_TIMEOUT": 60,
+    }
+    for name in ("CONTENT_CACHE_DIR", "TABLE_VERSION_DIR", "JOB_DIR", "UPLOAD_SPOOL_DIR", "PDF_TEXT_DIR", "METRICS_DIR"):
+        overrides[name] = os.path.join(state_dir, name.lower())
+    for key, value in overrides.items():
+        setattr(config.Config, key, value)
+    options = dict(config.Config.SQLALCHEMY_ENGINE_OPTIONS)
+    options.update(pool_size=overrides["DB_POOL_SIZE"], pool_timeout=overrides["DB_POOL_TIMEOUT"])
+    config.Config.SQLALCHEMY_ENGINE_OPTIONS = options
+
+    from app import create_app
+
+    app = create_app()
+    app.logger.setLevel(logging.ERROR)
+    client = app.test_client()
+    # 첫 요청 비용(검색 색인 구성, 서명 URL 발급 등)은 측정에서 제외
+    warmup_rng = random.Random(args.seed)
+    for name in args.scenario_names:
+        for _ in range(args.warmup):
+            method, url, body = SCENARIOS[name](warmup_rng, args.size)
+            client.open(url, method=method, json=body).close()
+
+    results = {}
+    for name in args.scenario_names:
+        results[name] = {}
+        for concurrency in args.concurrency_levels:
+            results[name][str(concurrency)] = run_scenario(app, name, args.size, concurrency, args.requests, args.seed)
+    with open(args.worker_output, "w", encoding="utf-8") as fh:
+        json.dump(results, fh)
+
+
+def git_commit():
+    """현재 커밋 해시(짧은 형식)를 반환하는 함수 (작업 트리가 수정되었으면 -dirty)"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True).stdout.strip()
+        return f"{commit}-dirty" if dirty else commit
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(baseline, current, threshold):
+    """
+    두 결과의 p95를 비교하여 출력하는 함수
+
+    Returns:
+        list: threshold 비율 이상 느려진 (크기, 시나리오, 동시성) 목록
+    """
+    regressions = []
+    print(f"\n{'catalog':>8} {'scenario':<20} {'conc':>4} {'p95 base':>10} {'p95 now':>10} {'change':>8}")
+    for size, scenarios in current["results"].items():
+        for name, levels in scenarios.items():
+            for concurrency, now in levels.items():
+                base = baseline.get("results", {}).get(size, {}).get(name, {}).get(concurrency)
+                if not base:
+                    continue
+                before, after = base["latency_ms"]["p95"], now["latency_ms"]["p95"]
+                change = (after - before) / before if before else 0.0
+                flag = "  <-- regression" if change >= threshold else ""
+                print(f"{size:>8} {name:<20} {concurrency:>4} {before:>10.2f} {after:>10.2f} {change:>+8.1%}{flag}")
+                if flag:
+                    regressions.append((size, name, concurrency))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MSDS API 핫 경로 벤치마크")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"카탈로그 크기 목록 (기본값: {DEFAULT_SIZES})")
+    parser.add_argument("--concurrency", default=DEFAULT_CONCURRENCY,
+                        help=f"동시성 목록 (기본값: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="실행할 시나리오 (기본값: 전체)")
+    parser.add_argument("--requests", type=int, default=200, help="시나리오/동시성마다 요청 수 (기본값: 200)")
+    parser.add_argument("--warmup", type=int, default=20, help="시나리오마다 측정 전 요청 수 (기본값: 20)")
+    parser.add_argument("--seed", type=int, default=42, help="데이터/요청 난수 시드 (기본값: 42)")
+    parser.add_argument("--storage-delay-ms", type=float, default=0, help="가짜 스토리지 응답 지연(ms)")
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "msds-bench"),
+                        help="시드 DB 보관 디렉터리 (같은 크기/시드는 재사용)")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본값: benchmarks/results/<커밋>.json)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.10, help="회귀로 표시할 p95 증가 비율 (기본값: 0.10)")
+    # 내부용: 카탈로그 하나를 측정하는 하위 프로세스
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--database", help=argparse.SUPPRESS)
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--supabase-url", help=argparse.SUPPRESS)
+    parser.add_argument("--worker-output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    args.concurrency_levels = [int(v) for v in args.concurrency.split(",") if v.strip()]
+    args.scenario_names = [v.strip() for v in args.scenarios.split(",") if v.strip()]
+    unknown = [name for name in args.scenario_names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)} (choose from {', '.join(SCENARIOS)})")
+
+    if args.worker:
+        run_worker(args)
+        return
+
+    from fake_supabase import serve
+
+    sizes = [int(v) for v in args.sizes.split(",") if v.strip()]
+    os.makedirs(args.data_dir, exist_ok=True)
+    server = serve(delay_ms=args.storage_delay_ms)
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "settings": {
+            "sizes": sizes, "concurrency": args.concurrency_levels, "scenarios": args.scenario_names,
+            "requests": args.requests, "warmup": args.warmup, "seed": args.seed,
+            "storage_delay_ms": args.storage_delay_ms, "database": "sqlite",
+        },
+        "results": {},
+    }
+    try:
+        for size in sizes:
+            path = os.path.join(args.data_dir, f"catalog-v{CATALOG_VERSION}-{size}-{args.seed}.db")
+            if not os.path.exists(path):
+                started = time.perf_counter()
+                seed_catalog(path, size, args.seed)
+                print(f"seeded {size} MSDS in {time.perf_counter() - started:.1f}s -> {path}", file=sys.stderr)
+            # 수정 시나리오가 시드 DB를 바꾸지 않도록 복사본에서 측정
+            work_path = os.path.join(args.data_dir, f"run-{os.getpid()}-{size}.db")
+            with sqlite3.connect(path) as source, sqlite3.connect(work_path) as target:
+                source.backup(target)
+            worker_output = f"{work_path}.json"
+            try:
+                command = [
+                    sys.executable, os.path.abspath(__file__), "--worker",
+                    "--database", work_path, "--size", str(size), "--supabase-url", server.url,
+                    "--worker-output", worker_output, "--concurrency", args.concurrency,
+                    "--scenarios", ",".join(args.scenario_names), "--requests", str(args.requests),
+                    "--warmup", str(args.warmup), "--seed", str(args.seed),
+                ]
+                subprocess.run(command, cwd=ROOT, check=True)
+                with open(worker_output, encoding="utf-8") as fh:
+                    report["results"][str(size)] = json.load(fh)
+            finally:
+                for leftover in (work_path, worker_output):
+                    if os.path.exists(leftover):
+                        os.remove(leftover)
+            for name, levels in report["results"][str(size)].items():
+                for concurrency, result in levels.items():
+                    lat = result["latency_ms"]
+                    print(f"{size:>8} {name:<20} c={concurrency:<3} p50={lat['p50']:>8.2f}ms p95={lat['p95']:>8.2f}ms "
+                          f"p99={lat['p99']:>8.2f}ms {result['throughput_rps']:>8.1f} req/s errors={result['errors']}",
+                          file=sys.stderr)
+    finally:
+        server.shutdown()
+
+    output = args.output or os.path.join(ROOT, "benchmarks", "results", f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, ensure_ascii=False, indent=2)
+    print(f"results written to {output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            regressions = compare(json.load(fh), report, args.threshold)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+JSON 직렬화/응답 압축 벤치마크
+/api/msds?detailed=true 응답에서 직렬화 엔진과 압축으로 줄어드는 바이트와 시간을 측정합니다.
+
+사용법:
+    # 합성 데이터(한글 제목 + 첨부파일 3개)로 측정
+    python benchmarks/bench_json_compression.py --items 100
+
+    # 실행 중인 서버의 실제 응답으로 측정 (Accept-Encoding별 전송 바이트/응답 시간)
+    python benchmarks/bench_json_compression.py --url "http://localhost:5001/api/msds?detailed=true&per_page=100"
+"""
+
+import argparse
+import gzip
+import json
+import os
+import statistics
+import sys
+import time
+
+# 저장소 루트를 import 경로에 추가 (benchmarks/에서 직접 실행 시)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask  # noqa: E402
+
+from services.compression import Compressor, brotli  # noqa: E402
+from services.json_provider import FastJSONProvider  # noqa: E402
+
+
+def make_page(items):
+    """상세 목록 한 페이지와 같은 구조의 합성 데이터를 만드는 함수"""
+    attachments = [
+        {"aid": 1, "title": "방독마스크", "type": 0, "file_loc": "msds/protective/gas_mask.png", "createdAt": None},
+        {"aid": 7, "title": "제1공장 약품창고", "type": 1, "file_loc": None, "createdAt": None},
+        {"aid": 12, "title": "부식성 물질", "type": 2, "file_loc": "msds/warning/corrosive.png", "createdAt": None},
+    ]
+    rows = [
+        {
+            "mid": f"M{i:04d}",
+            "title": f"염산 {i}% 수용액 (Hydrochloric acid solution)",
+            "usage": "배관 세척 및 pH 조정용 시약",
+            "file_loc": f"msds/pdf/M{i:04d}.pdf",
+            "is_osh": 1,
+            "is_chr": i % 2,
+            "attachments": attachments,
+        }
+        for i in range(items)
+    ]
+    return {"items": rows, "page": 1, "per_page": items, "total": 5000, "has_more": True,
+            "next_cursor": "eyJrIjoiTTAxMDAiLCJkIjoibmV4dCJ9", "prev_cursor": None}
+
+
+def timeit(fn, repeat):
+    """fn을 repeat번 실행하여 중앙값(ms)을 반환하는 함수"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def bench_local(items, repeat):
+    """직렬화 엔진/인코딩별 크기와 시간을 측정하는 함수"""
+    app = Flask(__name__)
+    provider = FastJSONProvider(app)
+    compressor = Compressor()
+    page = make_page(items)
+
+    # 기존 동작: Flask 기본 제공자(ensure_ascii=True, sort_keys=True)
+    baseline = json.dumps(page, ensure_ascii=True, sort_keys=True, separators=(",", ":")).encode("ascii")
+    fast = provider.dumps(page).encode("utf-8")
+
+    result = {
+        "items": items,
+        "backend": provider.backend,
+        "serialize_ms": {
+            "json_ascii_baseline": timeit(
+                lambda: json.dumps(page, ensure_ascii=True, sort_keys=True, separators=(",", ":")), repeat),
+            provider.backend: timeit(lambda: provider.dumps(page), repeat),
+        },
+        "bytes": {"json_ascii_baseline": len(baseline), "utf8": len(fast)},
+        "compress_ms": {},
+    }
+    encodings = ["gzip"] + (["br"] if brotli is not None else [])
+    for encoding in encodings:
+        result["bytes"][encoding] = len(compressor.compress(fast, encoding))
+        result["compress_ms"][encoding] = timeit(lambda: compressor.compress(fast, encoding), repeat)
+    best = min(result["bytes"][e] for e in encodings)
+    result["bytes_saved"] = len(baseline) - best
+    result["ms_saved_serialize"] = round(
+        result["serialize_ms"]["json_ascii_baseline"] - result["serialize_ms"][provider.backend], 3)
+    return result
+
+
+def bench_url(url, repeat):
+    """실행 중인 서버에 Accept-Encoding별로 요청하여 전송 바이트/응답 시간을 측정하는 함수"""
+    import httpx
+
+    result = {"url": url, "encodings": {}}
+    with httpx.Client(timeout=30) as client:
+        for encoding in ("identity", "gzip", "br"):
+            sizes = []
+
+            def fetch():
+                with client.stream("GET", url, headers={"Accept-Encoding": encoding}) as res:
+                    sizes.append(sum(len(chunk) for chunk in res.iter_raw()))
+
+            ms = timeit(fetch, repeat)
+            result["encodings"][encoding] = {"bytes": sizes[-1], "median_ms": ms}
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON 직렬화/압축 벤치마크")
+    parser.add_argument("--items", type=int, default=100, help="합성 페이지 항목 수 (기본값: 100)")
+    parser.add_argument("--repeat", type=int, default=50, help="반복 횟수 (기본값: 50)")
+    parser.add_argument("--url", help="측정할 서버 URL (지정 시 실제 응답으로 측정)")
+    args = parser.parse_args()
+
+    result = bench_url(args.url, args.repeat) if args.url else bench_local(args.items, args.repeat)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
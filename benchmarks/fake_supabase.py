@@ -0,0 +1,128 @@
+"""
+벤치마크용 가짜 Supabase 스토리지 서버
+서명 URL 발급, 업로드, 다운로드, 삭제 요청에 Supabase Storage API와 같은 형식으로 응답합니다.
+네트워크나 실제 버킷 없이 스토리지 호출이 포함된 경로를 측정하기 위한 것이며, 객체는 메모리에만 보관합니다.
+
+사용법:
+    # 단독 실행 (SUPABASE_URL=http://127.0.0.1:54321 로 앱을 띄워 사용)
+    python benchmarks/fake_supabase.py --port 54321 --delay-ms 20
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+# 저장된 객체가 없을 때 돌려줄 기본 PDF 본문 크기
+DEFAULT_OBJECT_SIZE = 100_000
+
+
+class FakeStorageHandler(BaseHTTPRequestHandler):
+    """/storage/v1/object/... 요청을 처리하는 핸들러 (server.objects, server.delay 사용)"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, code, body, content_type="application/json", headers=None):
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _delay(self):
+        if self.server.delay:
+            time.sleep(self.server.delay)
+
+    def do_POST(self):
+        body = self._body()
+        self._delay()
+        path = unquote(self.path.split("?")[0])
+        prefix = "/storage/v1/object/sign/"
+        if path.startswith(prefix):
+            rest = path[len(prefix):]
+            if "/" not in rest:
+                # create_signed_urls: {"paths": [...], "expiresIn": n}
+                paths = json.loads(body or b"{}").get("paths", [])
+                payload = [{"path": p, "signedURL": f"/object/sign/{rest}/{p}?token=bench", "error": None}
+                           for p in paths]
+            else:
+                payload = {"signedURL": f"/object/sign/{rest}?token=bench"}
+            self._send(200, json.dumps(payload).encode())
+            return
+        self.server.objects[path] = body
+        self._send(200, json.dumps({"Key": path.rsplit("/object/", 1)[-1]}).encode())
+
+    do_PUT = do_POST
+
+    def do_GET(self):
+        self._delay()
+        path = unquote(self.path.split("?")[0]).replace("/object/authenticated/", "/object/")
+        body = self.server.objects.get(path) or self.server.default_object
+        byte_range = self.headers.get("Range")
+        if byte_range:
+            start, _, end = byte_range.split("=", 1)[1].partition("-")
+            start, end = int(start), int(end) if end else len(body) - 1
+            self._send(206, body[start:end + 1], "application/pdf",
+                       {"Content-Range": f"bytes {start}-{end}/{len(body)}", "ETag": '"bench"'})
+        else:
+            self._send(200, body, "application/pdf", {"ETag": '"bench"'})
+
+    def do_DELETE(self):
+        body = self._body()
+        self._delay()
+        prefixes = json.loads(body or b"{}").get("prefixes", [])
+        bucket = unquote(self.path.split("?")[0]).rsplit("/", 1)[-1]
+        for name in prefixes:
+            self.server.objects.pop(f"/storage/v1/object/{bucket}/{name}", None)
+        self._send(200, json.dumps([{"name": name} for name in prefixes]).encode())
+
+
+def serve(host="127.0.0.1", port=0, delay_ms=0):
+    """
+    가짜 스토리지 서버를 백그라운드 스레드에서 시작하는 함수
+
+    Args:
+        host (str): 바인드 주소
+        port (int): 포트 (0이면 빈 포트 자동 선택)
+        delay_ms (float): 요청마다 추가할 지연 시간(ms) - 실제 네트워크 왕복 흉내
+
+    Returns:
+        ThreadingHTTPServer: 실행 중인 서버 (server.url, shutdown()으로 종료)
+    """
+    server = ThreadingHTTPServer((host, port), FakeStorageHandler)
+    server.daemon_threads = True
+    server.objects = {}
+    server.delay = delay_ms / 1000
+    server.default_object = b"%PDF-1.4\n" + b"x" * DEFAULT_OBJECT_SIZE
+    server.url = f"http://{host}:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, name="fake-supabase", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크용 가짜 Supabase 스토리지 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--delay-ms", type=float, default=0, help="요청마다 추가할 지연 시간(ms)")
+    args = parser.parse_args()
+    server = serve(args.host, args.port, args.delay_ms)
+    print(f"fake supabase listening on {server.url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Flask CLI 명령 모듈
+운영/유지보수용 명령들을 정의합니다. (예: flask --app app:create_app search-index rebuild, import msds FILE, pdf-text backfill)
+"""
+
+import csv
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy.exc import SQLAlchemyError
+
+from extensions import db, search_index, table_versions, pdf_texts
+from services.importer import SPECS, run_import
+
+# 검색 색인 관리 명령 그룹
+search_index_cli = AppGroup("search-index", help="MSDS 검색 색인 관리")
+
+
+@search_index_cli.command("rebuild")
+def rebuild_search_index():
+    """
+    모든 서버 워커의 검색 색인 재구성을 요청합니다.
+
+    색인은 워커 프로세스별 메모리에 있으므로 CLI 프로세스에서 만들어도 워커에는 반영되지 않습니다.
+    대신 "msds" 테이블 버전을 올려, 각 워커가 다음 검색 때 버전 변화를 보고 전체를 다시 읽도록 합니다.
+    """
+    versions = table_versions.bump("msds")
+    click.echo(f"검색 색인 재구성 요청 완료 (msds 버전 {versions['msds']}): 각 워커가 다음 검색 때 재구성합니다.")
+
+
+@search_index_cli.command("stats")
+def search_index_stats():
+    """검색 색인 상태를 출력합니다. (이 CLI 프로세스에서 현재 버전 기준으로 구성한 색인)"""
+    search_index.ensure_fresh(db.engine)
+    for key, value in search_index.stats().items():
+        click.echo(f"{key}: {value}")
+
+
+# 대량 가져오기 명령 그룹
+import_cli = AppGroup("import", help="MSDS/추가자료 스프레드시트 대량 가져오기")
+
+
+def _import(kind, path, batch_size, dry_run, sheet, rejects):
+    """가져오기 명령 공통 처리 함수 (진행 상황/거부 행 요약 출력)"""
+    batch_size = batch_size or current_app.config.get("IMPORT_BATCH_SIZE", 1000)
+    latest = {}  # 마지막 배치까지의 결과 (도중에 중단되어도 기록된 행 수를 알기 위해 보관)
+
+    def progress(result):
+        latest["result"] = result
+        click.echo(f"  {result.processed}행 처리 / {result.written}행 {'검증' if dry_run else '기록'} "
+                   f"/ {result.rejected_count}행 거부", err=True)
+
+    reject_file = open(rejects, "w", encoding="utf-8-sig", newline="") if rejects else None
+    try:
+        writer = None
+        if reject_file:
+            writer = csv.writer(reject_file)
+            writer.writerow(["row", "reason", "values"])
+        result = run_import(
+            db.engine, kind, path,
+            batch_size=batch_size,
+            dry_run=dry_run,
+            sheet=sheet,
+            progress=progress,
+            reject_writer=(lambda number, reason, values: writer.writerow([number, reason, list(values)]))
+            if writer else None,
+        )
+    except (ValueError, OSError, SQLAlchemyError) as e:
+        raise click.ClickException(str(e))
+    finally:
+        if reject_file:
+            reject_file.close()
+        if not dry_run and "result" in latest and latest["result"].written:
+            # 다른 워커의 캐시/ETag 무효화 (중단된 경우에도 앞서 커밋된 배치가 있으면 반영)
+            table_versions.bump(*SPECS[kind].version_tables)
+
+    rate = result.processed / result.elapsed if result.elapsed else 0
+    click.echo(f"{'[dry-run] ' if dry_run else ''}완료: {result.processed}행 처리, "
+               f"{result.written}행 {'검증 통과' if dry_run else '업서트'}, {result.rejected_count}행 거부 "
+               f"({result.batches}배치, {result.elapsed:.1f}초, {rate:.0f}행/초)")
+    if result.rejected_count:
+        click.echo("거부 사유:")
+        for reason, count in sorted(result.reasons.items(), key=lambda item: -item[1]):
+            click.echo(f"  {count:>6}  {reason}")
+        click.echo("거부 행 예시:")
+        for number, reason in result.rejected:
+            click.echo(f"  {number}행: {reason}")
+        if rejects:
+            click.echo(f"전체 거부 행: {rejects}")
+    if result.failed_batches:
+        raise click.ClickException(f"{result.failed_batches}개 배치가 데이터베이스 오류로 롤백되었습니다 (거부 행에 포함)")
+
+
+def _import_options(command):
+    """가져오기 명령 공통 옵션을 붙이는 데코레이터"""
+    command = click.option("--rejects", type=click.Path(dir_okay=False),
+                           help="거부된 행을 기록할 CSV 경로")(command)
+    command = click.option("--sheet", help="xlsx 시트명 (기본값: 첫 시트)")(command)
+    command = click.option("--dry-run", is_flag=True, help="검증만 하고 기록하지 않음")(command)
+    command = click.option("--batch-size", type=click.IntRange(1), default=None,
+                           help="executemany 배치 크기 (기본값: IMPORT_BATCH_SIZE)")(command)
+    command = click.argument("path", type=click.Path(exists=True, dir_okay=False))(command)
+    return command
+
+
+@import_cli.command("msds")
+@_import_options
+def import_msds(path, batch_size, dry_run, sheet, rejects):
+    """MSDS 시트(mid, title, usage, file_loc, is_osh, is_chr)를 가져옵니다."""
+    _import("msds", path, batch_size, dry_run, sheet, rejects)
+    if not dry_run:
+        # _import에서 올린 "msds" 버전을 보고 각 워커가 색인을 다시 읽음
+        click.echo("검색 색인은 각 서버 워커가 다음 검색 때 재구성합니다.")
+
+
+@import_cli.command("additional")
+@_import_options
+def import_additional(path, batch_size, dry_run, sheet, rejects):
+    """추가자료 시트(aid, mid, title, type, file_loc)를 가져옵니다."""
+    _import("additional", path, batch_size, dry_run, sheet, rejects)
+
+
+# PDF 본문 추출 명령 그룹
+pdf_text_cli = AppGroup("pdf-text", help="PDF 본문 추출 (검색 scope=content)")
+
+
+@pdf_text_cli.command("backfill")
+@click.option("--force", is_flag=True, help="이미 추출한 PDF도 모두 다시 추출")
+@click.option("--retry-failed", is_flag=True, help="이전에 추출에 실패한 PDF를 다시 시도")
+def pdf_text_backfill(force, retry_failed):
+    """본문이 없거나 file_loc이 바뀐 MSDS의 PDF 본문을 추출합니다."""
+    if not pdf_texts.available:
+        raise click.ClickException("pypdf가 설치되어 있지 않습니다 (pip install pypdf)")
+
+    def progress(result):
+        status = f"실패 - {result['error']}" if result.get("error") else f"{result.get('pages', 0)}쪽, {result.get('chars', 0)}자"
+        click.echo(f"  {result['mid']}: {status}", err=True)
+
+    summary = pdf_texts.backfill(db.engine, force=force, retry_failed=retry_failed, progress=progress)
+    click.echo(f"완료: {summary['checked']}건 확인, {summary['extracted']}건 추출, {summary['skipped']}건 건너뜀, "
+               f"{summary['failed']}건 실패, {summary['removed']}건 삭제")
+
+
+@pdf_text_cli.command("stats")
+def pdf_text_stats():
+    """PDF 본문 저장소 상태를 출력합니다."""
+    for key, value in pdf_texts.stats().items():
+        click.echo(f"{key}: {value}")
+
+
+def register_commands(app):
+    """
+    Flask 애플리케이션에 CLI 명령들을 등록하는 함수
+
+    Args:
+        app (Flask): Flask 애플리케이션 인스턴스
+    """
+    app.cli.add_command(search_index_cli)
+    app.cli.add_command(import_cli)
+    app.cli.add_command(pdf_text_cli)
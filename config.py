@@ -23,6 +23,32 @@ class Config:
     # SQLAlchemy 변경 추적 비활성화 (성능 향상을 위해)
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # 데이터베이스 연결 풀 설정 (워커 프로세스마다 별도의 풀)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))  # 유지할 연결 수
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))  # 풀이 가득 찼을 때 추가로 열 수 있는 연결 수
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))  # 연결을 얻기까지 기다릴 최대 시간(초) - 초과 시 풀 고갈 오류
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "280"))  # 연결 재생성 주기(초) - MySQL wait_timeout보다 짧게
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")  # 체크아웃 시 연결 확인
+    DB_POOL_SLOW_WAIT_MS = float(os.getenv("DB_POOL_SLOW_WAIT_MS", "100"))  # 이 시간 이상 기다린 체크아웃은 slow_waits로 집계
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+    # SQL 프로파일러 설정 (켜면 응답에 X-DB-Queries/Server-Timing 헤더, 느린 쿼리 로그와 EXPLAIN 기록)
+    SQL_PROFILE = os.getenv("SQL_PROFILE", "false").lower() in ("1", "true", "yes")  # 프로파일러 사용 여부 (기본값: 끔)
+    SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", "100"))  # 이 시간 이상 걸린 문장을 느린 쿼리로 기록
+    SQL_EXPLAIN_SLOW = os.getenv("SQL_EXPLAIN_SLOW", "true").lower() in ("1", "true", "yes")  # 느린 쿼리의 실행 계획 조회 여부
+    SQL_SLOW_LOG_SIZE = int(os.getenv("SQL_SLOW_LOG_SIZE", "100"))  # /debug/sql에 보관할 최근 느린 쿼리 수
+
+    # 메트릭 설정 (/metrics - 라우트/스토리지 지연 시간, gunicorn 워커 합산)
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")  # 수집 여부 (기본값: 켬)
+    METRICS_DIR = os.getenv("METRICS_DIR") or None  # 워커별 스냅샷 디렉터리 (기본값: instance/metrics, 워커 간 공유 필요)
+    METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))  # 워커가 스냅샷을 기록하는 간격(초)
+
     # Swagger API 문서 설정
     SWAGGER_URL = os.getenv("SWAGGER_URL", "/docs")  # Swagger UI 접속 경로
     OPENAPI_SPEC_PATH = os.getenv("OPENAPI_SPEC_PATH", "/openapi.yaml")  # OpenAPI 스펙 파일 경로
@@ -32,3 +58,76 @@ class Config:
     SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")  # 서비스 롤 키
     SUPABASE_BUCKET = os.getenv("SUPABASE_BUCKET", "msds")  # 스토리지 버킷명
     SUPABASE_SIGNED_URL_EXPIRES = int(os.getenv("SUPABASE_SIGNED_URL_EXPIRES", "300"))  # 서명 URL 만료 시간(초)
+
+    # Supabase 연결 풀 설정 (요청 간 keep-alive 연결 재사용)
+    SUPABASE_POOL_MAXSIZE = int(os.getenv("SUPABASE_POOL_MAXSIZE", "20"))  # 최대 동시 연결 수
+    SUPABASE_POOL_KEEPALIVE = int(os.getenv("SUPABASE_POOL_KEEPALIVE", "10"))  # 유지할 keep-alive 연결 수
+    SUPABASE_KEEPALIVE_EXPIRY = float(os.getenv("SUPABASE_KEEPALIVE_EXPIRY", "30"))  # 유휴 연결 유지 시간(초)
+    SUPABASE_CONNECT_TIMEOUT = float(os.getenv("SUPABASE_CONNECT_TIMEOUT", "5"))  # 연결 타임아웃(초)
+    SUPABASE_READ_TIMEOUT = float(os.getenv("SUPABASE_READ_TIMEOUT", "30"))  # 읽기 타임아웃(초)
+
+    # 서명 URL 캐시 설정
+    SIGNED_URL_CACHE_SIZE = int(os.getenv("SIGNED_URL_CACHE_SIZE", "4096"))  # 최대 캐시 항목 수 (LRU)
+    SIGNED_URL_CACHE_MARGIN = int(os.getenv("SIGNED_URL_CACHE_MARGIN", "60"))  # 만료 전 안전 여유(초)
+
+    # 스토리지 스트리밍 설정 (PDF 직접 다운로드 시 청크 크기, 바이트)
+    STORAGE_STREAM_CHUNK_SIZE = int(os.getenv("STORAGE_STREAM_CHUNK_SIZE", str(64 * 1024)))
+
+    # 로컬 콘텐츠 캐시 설정 (PDF/첨부 이미지 디스크 캐시)
+    CONTENT_CACHE_DIR = os.getenv("CONTENT_CACHE_DIR", "")  # 캐시 디렉토리 (비어 있으면 instance/content_cache)
+    CONTENT_CACHE_MAX_BYTES = int(os.getenv("CONTENT_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))  # 최대 용량 (모든 워커가 공유하는 디렉토리 전체 기준, 0이면 비활성화)
+
+    # 검색 색인 설정
+    SEARCH_INDEX_REFRESH_SECONDS = int(os.getenv("SEARCH_INDEX_REFRESH_SECONDS", "300"))  # 전체 재색인 주기(초, 0이면 비활성화)
+
+    # 쿼리 캐시/테이블 버전 설정
+    TABLE_VERSION_DIR = os.getenv("TABLE_VERSION_DIR", "")  # 버전 카운터 디렉토리 (비어 있으면 instance/table_versions)
+    QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "1024"))  # 최대 캐시 항목 수
+    QUERY_CACHE_TTL = int(os.getenv("QUERY_CACHE_TTL", "300"))  # 버전이 같아도 다시 읽는 주기(초)
+
+    # 응답 압축 설정
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))  # 이 크기(바이트) 이상 응답만 압축
+    COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", "6"))  # gzip 압축 레벨 (1~9, 0이면 압축 비활성화)
+    COMPRESS_BR_LEVEL = int(os.getenv("COMPRESS_BR_LEVEL", "4"))  # brotli 품질 (0~11, brotli 설치 시)
+
+    # 대량 가져오기 설정
+    IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))  # executemany 한 번에 기록할 행 수
+
+    # 내보내기 설정
+    EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "1000"))  # 서버 측 커서에서 한 번에 가져올 행 수
+
+    # 일괄 작업 설정
+    MSDS_BATCH_MAX_OPERATIONS = int(os.getenv("MSDS_BATCH_MAX_OPERATIONS", "500"))  # POST /api/msds/batch 최대 작업 수
+
+    # 백그라운드 작업 설정 (PDF 업로드)
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))  # 프로세스당 작업 워커 스레드 수
+    JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "16"))  # 대기 작업 최대 수 (초과 시 503 + Retry-After)
+    JOB_RETRY_AFTER = int(os.getenv("JOB_RETRY_AFTER", "5"))  # 큐가 가득 찼을 때 안내할 재시도 대기 시간(초)
+    JOB_RETENTION_SECONDS = int(os.getenv("JOB_RETENTION_SECONDS", "86400"))  # 완료된 작업 기록 보관 시간(초)
+    JOB_DIR = os.getenv("JOB_DIR", "")  # 작업 상태 디렉토리 (비어 있으면 instance/jobs)
+    UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR", "")  # 업로드 임시 파일 디렉토리 (비어 있으면 instance/uploads)
+
+    # 이어 올리기(resumable) 업로드 설정
+    UPLOAD_PART_SIZE = int(os.getenv("UPLOAD_PART_SIZE", str(8 * 1024 * 1024)))  # 최대(기본) 조각 크기(바이트)
+    UPLOAD_MAX_SIZE = int(os.getenv("UPLOAD_MAX_SIZE", str(512 * 1024 * 1024)))  # 세션당 최대 파일 크기(바이트)
+    UPLOAD_SESSION_TTL = int(os.getenv("UPLOAD_SESSION_TTL", "86400"))  # 활동 없는 세션 만료 시간(초)
+
+    # PDF 본문 추출 설정 (pypdf 설치 시)
+    PDF_TEXT_DIR = os.getenv("PDF_TEXT_DIR", "")  # 본문 저장 디렉토리 (비어 있으면 instance/pdf_text)
+    PDF_TEXT_WORKERS = int(os.getenv("PDF_TEXT_WORKERS", "2"))  # 추출 프로세스 풀 크기
+    PDF_TEXT_MAX_CHARS = int(os.getenv("PDF_TEXT_MAX_CHARS", "200000"))  # MSDS당 보관할 최대 글자 수
+    PDF_TEXT_TIMEOUT = float(os.getenv("PDF_TEXT_TIMEOUT", "120"))  # PDF 하나의 추출 제한 시간(초, 워커 안에서 파싱 시간만 측정)
+    PDF_TEXT_QUEUE_SIZE = int(os.getenv("PDF_TEXT_QUEUE_SIZE", "256"))  # 업로드 후 추출 전용 큐 크기 (초과분은 백필로 처리)
+
+    # 첨부 이미지 변형 설정 (Pillow 설치 + 콘텐츠 캐시 사용 시)
+    IMAGE_VARIANT_WIDTHS = os.getenv("IMAGE_VARIANT_WIDTHS", "64,128,256")  # 허용 너비(px) - ?w= 값은 이 중 하나로 맞춤
+    IMAGE_VARIANT_WORKERS = int(os.getenv("IMAGE_VARIANT_WORKERS", "2"))  # 리사이즈 워커 수
+    IMAGE_VARIANT_QUALITY = int(os.getenv("IMAGE_VARIANT_QUALITY", "80"))  # WebP 품질 (1~100)
+    IMAGE_VARIANT_TIMEOUT = float(os.getenv("IMAGE_VARIANT_TIMEOUT", "30"))  # 변형 생성 대기 제한 시간(초)
+
+    # 라벨 시트 설정 (reportlab 설치 시 POST /api/msds/labels)
+    LABEL_WORKERS = int(os.getenv("LABEL_WORKERS", "2"))  # QR 인코딩/PDF 생성 프로세스 수
+    LABEL_TIMEOUT = float(os.getenv("LABEL_TIMEOUT", "120"))  # 시트 생성 대기 제한 시간(초)
+    LABEL_MAX_COUNT = int(os.getenv("LABEL_MAX_COUNT", "1000"))  # 한 시트의 최대 라벨 수
+    LABEL_BASE_URL = os.getenv("LABEL_BASE_URL", "")  # QR에 넣을 프론트엔드 주소 (비우면 요청의 base_url/Origin 사용)
+    LABEL_FONT_PATH = os.getenv("LABEL_FONT_PATH", "")  # 한글 TTF 글꼴 경로 (비우면 뷰어 내장 CID 글꼴)
@@ -6,6 +6,78 @@ Flask 확장 모듈
 # extensions.py - db를 별도 모듈로 분리하기 (권장)
 from flask_sqlalchemy import SQLAlchemy
 
+from services.storage import SupabaseRegistry, SignedUrlCache
+from services.content_cache import ContentCache
+from services.search_index import SearchIndex, ContentIndex
+from services.versions import TableVersions
+from services.query_cache import VersionedCache
+from services.conditional import ConditionalGet
+from services.compression import Compressor
+from services.jobs import JobQueue
+from services.uploads import UploadSessions
+from services.pdf_text import PdfTextStore
+from services.thumbnails import ImageVariants
+from services.labels import LabelSheets
+from services.db_pool import PoolMonitor
+from services.repository import Repositories
+from services.sql_profiler import SqlProfiler
+from services.metrics import Metrics
+
 # SQLAlchemy 데이터베이스 인스턴스 생성
 # 애플리케이션 팩토리 패턴에서 사용하기 위해 전역에서 생성
 db = SQLAlchemy()
+
+# 연결 풀 모니터 생성 - 풀 설정을 적용하고 체크아웃 대기/풀 고갈을 계측합니다 (/debug/pool)
+pool_monitor = PoolMonitor()
+
+# 요청 단위 데이터 접근 계층 생성 - 요청마다 연결 하나로 쿼리를 실행하고 같은 요청의 조회를 IN 쿼리로 합칩니다
+repositories = Repositories(db)
+
+# SQL 프로파일러 생성 - 요청별 쿼리 수/DB 시간을 헤더로 알리고 느린 쿼리를 실행 계획과 함께 기록합니다 (SQL_PROFILE)
+sql_profiler = SqlProfiler()
+
+# 메트릭 수집기 생성 - 라우트/스토리지 호출 지연 시간을 워커별로 모아 /metrics에서 Prometheus 형식으로 내보냅니다
+metrics = Metrics()
+
+# Supabase 클라이언트 레지스트리 생성
+# 앱 팩토리에서 init_app()으로 설정을 주입하고, 모든 요청이 같은 연결 풀을 공유합니다
+supabase_registry = SupabaseRegistry(metrics)
+
+# 서명 URL 캐시 생성 - (bucket, path)별 서명 URL을 만료 전까지 재사용합니다
+signed_url_cache = SignedUrlCache(supabase_registry)
+
+# 로컬 콘텐츠 캐시 생성 - PDF/첨부 이미지를 디스크에 보관하여 반복 다운로드를 로컬에서 처리합니다
+content_cache = ContentCache(supabase_registry)
+
+# 테이블 버전 카운터 생성 - 쓰기 라우트가 버전을 올려 캐시를 무효화합니다
+table_versions = TableVersions()
+
+# MSDS 검색 색인 생성 - title/usage/mid 바이그램 역색인 (프로세스 내 메모리, "msds" 버전이 바뀌면 재구성)
+search_index = SearchIndex(table_versions)
+
+# 쿼리 결과 캐시 생성 - 개수 등 자주 반복되는 조회 결과를 테이블 버전에 묶어 보관합니다
+query_cache = VersionedCache(table_versions)
+
+# 조건부 GET 미들웨어 생성 - 테이블 버전으로 ETag를 만들어 변경이 없으면 304를 반환합니다
+conditional_get = ConditionalGet(table_versions)
+
+# 응답 압축 미들웨어 생성 - 큰 JSON 응답을 brotli/gzip으로 압축합니다
+compressor = Compressor()
+
+# 백그라운드 작업 큐 생성 - PDF 업로드 등 오래 걸리는 작업을 워커 스레드에서 처리합니다
+job_queue = JobQueue()
+
+# 이어 올리기 업로드 세션 저장소 생성 - 큰 PDF를 조각 단위로 받아 끊겨도 빠진 조각만 다시 받습니다
+upload_sessions = UploadSessions()
+
+# PDF 본문 저장소 생성 - 업로드/백필 시 PDF 텍스트를 프로세스 풀에서 추출하여 MSDS별로 보관합니다
+pdf_texts = PdfTextStore(supabase_registry, content_cache, table_versions, job_queue)
+
+# PDF 본문 검색 생성 - /api/msds/search?scope=content에서 추출된 본문을 검색합니다
+content_index = ContentIndex(pdf_texts, table_versions)
+
+# 이미지 변형 생성기 생성 - 첨부 이미지의 축소판(?w=64 등)을 WebP/PNG로 만들어 콘텐츠 캐시에 보관합니다
+image_variants = ImageVariants(content_cache)
+
+# 라벨 시트 생성기 생성 - 여러 MSDS의 QR 라벨을 인쇄용 PDF로 만들어 입력 해시로 캐시합니다
+label_sheets = LabelSheets(content_cache, image_variants)
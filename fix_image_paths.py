@@ -7,7 +7,7 @@
 from flask import Flask
 from config import Config
 from extensions import db
-from routes.msds import fetch_all, exec_write
+from services.repository import Repository
 
 def create_app():
     """Flask 애플리케이션 생성"""
@@ -20,11 +20,11 @@ def fix_image_paths():
     """잘못된 이미지 파일 경로를 수정하는 함수"""
     app = create_app()
     
-    with app.app_context():
+    with app.app_context(), Repository(db.engine) as repo:
         print("=== 이미지 파일 경로 수정 시작 ===")
         
         # 잘못된 파일 경로를 가진 첨부파일 조회
-        problematic_files = fetch_all("""
+        problematic_files = repo.all("""
             SELECT aid, title, type, file_loc
             FROM msds_additional_info
             WHERE file_loc = 'None' OR file_loc LIKE '%____%'
@@ -73,7 +73,7 @@ def fix_image_paths():
             
             if new_path:
                 # 파일 경로 업데이트
-                exec_write(
+                repo.write(
                     "UPDATE msds_additional_info SET file_loc = :new_path WHERE aid = :aid",
                     {"new_path": new_path, "aid": aid}
                 )
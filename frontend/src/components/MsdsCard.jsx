@@ -304,7 +304,7 @@ export default function MsdsCard({ item }) {
                           {hasImage && (
                             <div className="relative">
                               <img 
-                                src={`${process.env.NEXT_PUBLIC_API_BASE || 'http://localhost:5001'}/api/msds/${item.mid}/attachment/${warningItem.aid}`}
+                                src={`${process.env.NEXT_PUBLIC_API_BASE || 'http://localhost:5001'}/api/msds/${item.mid}/attachment/${warningItem.aid}?w=64`}
                                 alt={warning}
                                 className="w-8 h-8 object-contain rounded border border-gray-200 cursor-help"
                                 onError={(e) => {
@@ -366,7 +366,7 @@ export default function MsdsCard({ item }) {
                           {hasImage && (
                             <div className="relative">
                               <img 
-                                src={`${process.env.NEXT_PUBLIC_API_BASE || 'http://localhost:5001'}/api/msds/${item.mid}/attachment/${equipmentItem.aid}`}
+                                src={`${process.env.NEXT_PUBLIC_API_BASE || 'http://localhost:5001'}/api/msds/${item.mid}/attachment/${equipmentItem.aid}?w=64`}
                                 alt={equipment}
                                 className="w-8 h-8 object-contain rounded border border-gray-200 cursor-help"
                                 onError={(e) => {
@@ -46,7 +46,7 @@ export default function MsdsManagement() {
     setLoading(true); // 로딩 시작
     try {
       // API에서 MSDS 데이터를 가져옵니다 (상세 정보 포함, 페이지네이션 지원)
-      const data = await apiGet(`/api/msds?page=${page}&per_page=${itemsPerPage}&detailed=true`);
+      const data = await apiGet(`/api/msds?page=${page}&per_page=${itemsPerPage}&detailed=true&include=signed_urls`);
       
       // 응답 데이터가 배열인지 확인하고, 아니면 items 속성을 사용합니다
       const list = Array.isArray(data) ? data : data.items || [];
@@ -464,7 +464,7 @@ export default function MsdsManagement() {
                                   {hasImage && (
                                     <div className="relative">
                                       <img
-                                        src={`${process.env.NEXT_PUBLIC_API_BASE || 'http://localhost:5001'}/api/msds/${item.mid}/attachment/${warning.aid}`}
+                                        src={warning.signed_url || `${process.env.NEXT_PUBLIC_API_BASE || 'http://localhost:5001'}/api/msds/${item.mid}/attachment/${warning.aid}`}
                                         alt={warning.title}
                                         className="w-8 h-8 object-contain rounded border border-gray-200 cursor-help"
                                         onError={(e) => {
@@ -521,7 +521,7 @@ export default function MsdsManagement() {
                                   {hasImage && (
                                     <div className="relative">
                                       <img
-                                        src={`${process.env.NEXT_PUBLIC_API_BASE || 'http://localhost:5001'}/api/msds/${item.mid}/attachment/${equipment.aid}`}
+                                        src={equipment.signed_url || `${process.env.NEXT_PUBLIC_API_BASE || 'http://localhost:5001'}/api/msds/${item.mid}/attachment/${equipment.aid}`}
                                         alt={equipment.title}
                                         className="w-8 h-8 object-contain rounded border border-gray-200 cursor-help"
                                         onError={(e) => {
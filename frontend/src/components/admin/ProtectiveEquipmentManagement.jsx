@@ -157,7 +157,7 @@ export default function ProtectiveEquipmentManagement() {
                   {equipment.file_loc && equipment.file_loc !== "None" ? (
                     /* 실제 이미지가 있는 경우 */
                     <img 
-                      src={`${process.env.NEXT_PUBLIC_API_BASE || 'http://localhost:5001'}/api/msds/${equipment.mid}/attachment/${equipment.aid}`}
+                      src={`${process.env.NEXT_PUBLIC_API_BASE || 'http://localhost:5001'}/api/msds/${equipment.mid}/attachment/${equipment.aid}?w=128`}
                       alt={equipment.title}
                       className="w-16 h-16 object-contain rounded-lg border border-gray-200"
                       onError={(e) => {
@@ -1,6 +1,7 @@
 "use client";
 
 import { useState } from "react";
+import { uploadMsdsPdf } from "@/lib/api";
 
 /**
  * PDF 관리 모달 컴포넌트
@@ -123,22 +124,8 @@ export default function PdfManagementModal({
 
     setUploading(true);
     try {
-      const formData = new FormData();
-      formData.append('pdf_file', selectedFile);
-
-      const response = await fetch(
-        `${process.env.NEXT_PUBLIC_API_BASE || 'http://localhost:5001'}/api/msds/${msdsItem.mid}/pdf`,
-        {
-          method: 'POST',
-          body: formData,
-        }
-      );
-
-      if (!response.ok) {
-        throw new Error('PDF 업로드에 실패했습니다.');
-      }
-
-      const result = await response.json();
+      // 서버는 202 + 작업 ID를 반환하고, 업로드 작업이 끝날 때까지 상태를 조회
+      const result = await uploadMsdsPdf(msdsItem.mid, selectedFile);
       alert('PDF 파일이 성공적으로 업로드되었습니다.');
       
       // MSDS 업데이트 이벤트 발생
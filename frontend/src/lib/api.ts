@@ -15,8 +15,8 @@ export async function apiGet(path: string) {
   // URL 구성 (경로가 /로 시작하지 않으면 /를 추가)
   const url = `${API_BASE}${path.startsWith("/") ? path : `/${path}`}`;
   
-  // fetch 요청 (캐시 비활성화)
-  const res = await fetch(url, { cache: "no-store" });
+  // fetch 요청 (브라우저 캐시에 저장하되 매번 ETag로 재검증 → 변경이 없으면 304로 본문 재사용)
+  const res = await fetch(url, { cache: "no-cache" });
   const text = await res.text(); // 일단 텍스트로 받아서 확인
   
   // HTTP 상태 코드가 성공이 아닌 경우 에러 처리
@@ -196,11 +196,22 @@ export async function searchMsds({ q = "", page = 1, per_page = 12 } = {}) {
 
 /**
  * MSDS 상세 정보를 가져오는 함수
+ * 첨부파일마다 서명 URL(signed_url)이 포함되어 이미지를 바로 로드할 수 있습니다
  * @param {string} mid - MSDS ID
  * @returns {Promise<any>} MSDS 상세 정보
  */
 export async function fetchMsdsDetail(mid: string) {
-  return apiGet(`/api/msds/${encodeURIComponent(mid)}`);
+  return apiGet(`/api/msds/${encodeURIComponent(mid)}?include=signed_urls`);
+}
+
+/**
+ * 여러 MSDS의 첨부파일 매니페스트(서명 URL 포함)를 한 번에 가져오는 함수
+ * @param {string[]} mids - MSDS ID 목록 (최대 100개)
+ * @returns {Promise<any>} MSDS ID별 첨부파일 목록
+ */
+export async function fetchAttachmentManifests(mids: string[]) {
+  const qs = new URLSearchParams({ mids: mids.join(",") });
+  return apiGet(`/api/msds/attachments?${qs.toString()}`);
 }
 
 /**
@@ -222,16 +233,132 @@ export async function deleteMsds(mid: string) {
   return apiDelete(`/api/msds/${encodeURIComponent(mid)}`);
 }
 
+/**
+ * 여러 MSDS 생성/수정/삭제를 한 번의 요청(한 트랜잭션)으로 처리하는 함수
+ * @param {any[]} operations - 작업 목록 ({ op: "create", data }, { op: "update", mid, data }, { op: "delete", mid })
+ * @param {"atomic" | "partial"} mode - atomic: 하나라도 실패하면 전체 취소, partial: 성공한 작업만 반영
+ * @returns {Promise<any>} 작업별 결과
+ */
+export async function batchMsds(operations: any[], mode: "atomic" | "partial" = "atomic") {
+  return apiPost(`/api/msds/batch`, { mode, operations });
+}
+
 /**
  * MSDS PDF를 업로드하는 함수
+ * 서버는 업로드를 작업 큐에 넣고 202 + 작업 ID를 반환하므로, 작업이 끝날 때까지 상태를 조회합니다.
  * @param {string} mid - MSDS ID
  * @param {File} file - PDF 파일
- * @returns {Promise<any>} 업로드 결과
+ * @param {(progress: any) => void} onProgress - 진행 상황 콜백 ({ done, total })
+ * @returns {Promise<any>} 업로드 결과 ({ file_path, size })
  */
-export async function uploadMsdsPdf(mid: string, file: File) {
+export async function uploadMsdsPdf(mid: string, file: File, onProgress?: (progress: any) => void) {
+  // 큰 파일은 조각 단위 이어 올리기 사용 (끊겨도 빠진 조각만 다시 전송)
+  if (file.size > RESUMABLE_UPLOAD_THRESHOLD) {
+    return uploadMsdsPdfResumable(mid, file, { onProgress });
+  }
   const formData = new FormData();
   formData.append("pdf_file", file);
-  return apiUpload(`/api/msds/${encodeURIComponent(mid)}/pdf`, formData);
+  const accepted = await apiUpload(`/api/msds/${encodeURIComponent(mid)}/pdf`, formData);
+  return accepted.job_id ? waitForJob(accepted.job_id, { onProgress }) : accepted;
+}
+
+// 이 크기보다 큰 PDF는 이어 올리기(조각 업로드)로 전송
+const RESUMABLE_UPLOAD_THRESHOLD = 8 * 1024 * 1024;
+
+/**
+ * 큰 PDF를 조각 단위로 이어 올리는 함수
+ * 세션 ID를 localStorage에 보관하므로, 연결이 끊겨 다시 호출하면 서버에 없는 조각만 전송합니다.
+ * @param {string} mid - MSDS ID
+ * @param {File} file - PDF 파일
+ * @param {Object} options - 옵션 객체
+ * @param {number} options.concurrency - 동시에 보낼 조각 수 (기본값: 3)
+ * @param {number} options.retries - 조각별 재시도 횟수 (기본값: 3)
+ * @param {(progress: any) => void} options.onProgress - 진행 상황 콜백 ({ done, total })
+ * @returns {Promise<any>} 업로드 결과 ({ file_path, size })
+ */
+export async function uploadMsdsPdfResumable(
+  mid: string,
+  file: File,
+  { concurrency = 3, retries = 3, onProgress }: { concurrency?: number; retries?: number; onProgress?: (progress: any) => void } = {}
+) {
+  const base = `/api/msds/${encodeURIComponent(mid)}/pdf/uploads`;
+  const storageKey = `msds-upload:${mid}:${file.name}:${file.size}:${file.lastModified}`;
+
+  // 이전 세션이 남아 있으면 재사용, 없거나 만료되었으면 새로 생성
+  let session: any = null;
+  const savedId = typeof window !== "undefined" ? window.localStorage.getItem(storageKey) : null;
+  if (savedId) {
+    session = await apiGet(`${base}/${savedId}`).catch(() => null);
+    if (session && session.state !== "open") session = null;
+  }
+  if (!session) {
+    session = await apiPost(base, { filename: file.name, size: file.size });
+    window.localStorage.setItem(storageKey, session.upload_id);
+  }
+
+  const partSize: number = session.part_size;
+  let done: number = session.bytes_received || 0;
+  const queue: number[] = [...session.missing];
+
+  const sendPart = async (number: number) => {
+    const blob = file.slice((number - 1) * partSize, Math.min(number * partSize, file.size));
+    const body = await blob.arrayBuffer();
+    const digest = await crypto.subtle.digest("SHA-256", body);
+    const checksum = Array.from(new Uint8Array(digest)).map((b) => b.toString(16).padStart(2, "0")).join("");
+    for (let attempt = 0; ; attempt++) {
+      try {
+        const res = await fetch(`${API_BASE}${base}/${session.upload_id}/parts/${number}`, {
+          method: "PUT",
+          body,
+          headers: { "Content-Type": "application/octet-stream", "X-Part-SHA256": checksum },
+          cache: "no-store",
+        });
+        if (!res.ok) throw new Error(`part ${number} failed: ${res.status} ${await res.text()}`);
+        done += body.byteLength;
+        onProgress && onProgress({ done, total: file.size });
+        return;
+      } catch (error) {
+        if (attempt >= retries) throw error;
+        await new Promise((resolve) => setTimeout(resolve, 1000 * 2 ** attempt));
+      }
+    }
+  };
+
+  // concurrency개의 전송 루프가 빠진 조각을 나누어 전송
+  await Promise.all(
+    Array.from({ length: Math.min(concurrency, queue.length) }, async () => {
+      while (queue.length) await sendPart(queue.shift() as number);
+    })
+  );
+
+  const accepted = await apiPost(`${base}/${session.upload_id}/complete`, {});
+  const result = await waitForJob(accepted.job_id, { onProgress });
+  window.localStorage.removeItem(storageKey);
+  return result;
+}
+
+/**
+ * 백그라운드 작업이 끝날 때까지 상태를 조회하는 함수
+ * @param {string} jobId - 작업 ID
+ * @param {Object} options - 옵션 객체
+ * @param {number} options.intervalMs - 조회 간격 (기본값: 1000)
+ * @param {number} options.timeoutMs - 최대 대기 시간 (기본값: 10분)
+ * @param {(progress: any) => void} options.onProgress - 진행 상황 콜백
+ * @returns {Promise<any>} 작업 결과 (실패 시 예외)
+ */
+export async function waitForJob(
+  jobId: string,
+  { intervalMs = 1000, timeoutMs = 600000, onProgress }: { intervalMs?: number; timeoutMs?: number; onProgress?: (progress: any) => void } = {}
+) {
+  const deadline = Date.now() + timeoutMs;
+  while (Date.now() < deadline) {
+    const job = await apiGet(`/api/msds/jobs/${encodeURIComponent(jobId)}`);
+    if (job.progress && onProgress) onProgress(job.progress);
+    if (job.status === "succeeded") return job.result;
+    if (job.status === "failed") throw new Error(job.error || "Job failed");
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+  }
+  throw new Error(`Job ${jobId} timed out`);
 }
 
 /**
@@ -316,3 +443,31 @@ export function openPdfInNewTab(mid: string) {
   const url = `${API_BASE}/api/msds/${encodeURIComponent(mid)}/download`;
   window.open(url, "_blank", "noopener,noreferrer");
 }
+
+/**
+ * 여러 MSDS의 QR 코드 라벨 시트(PDF)를 받아 다운로드하는 함수
+ * 서버는 같은 입력의 시트를 캐시해 두므로 내용이 바뀌지 않았다면 바로 응답합니다
+ * @param {{ mids?: string[], location?: string }} target - MSDS ID 목록 또는 장소 제목 중 하나
+ */
+export async function downloadLabelSheet(target: { mids?: string[]; location?: string }) {
+  const res = await fetch(`${API_BASE}/api/msds/labels`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    // QR에는 현재 프론트엔드 주소의 상세 페이지(/msds/{mid})를 넣음
+    body: JSON.stringify({ ...target, base_url: window.location.origin }),
+    cache: "no-store",
+  });
+  if (!res.ok) {
+    const text = await res.text();
+    throw new Error(`POST /api/msds/labels failed: ${res.status} ${text}`);
+  }
+  const blob = await res.blob();
+  const url = window.URL.createObjectURL(blob);
+  const link = document.createElement("a");
+  link.href = url;
+  link.download = target.location ? `labels_${target.location}.pdf` : "labels.pdf";
+  document.body.appendChild(link);
+  link.click();
+  link.remove();
+  window.URL.revokeObjectURL(url);
+}
@@ -3,128 +3,208 @@ MSDS API 라우트 모듈
 Material Safety Data Sheet 관련 API 엔드포인트들을 정의합니다.
 """
 
-from flask import Blueprint, request, jsonify, abort, current_app, redirect
-from sqlalchemy import text
-from supabase import create_client
-from extensions import db
+import csv
+import io
+import os
+import tempfile
+import time
+from contextlib import nullcontext
+from datetime import date
+
+from flask import (
+    Blueprint, request, jsonify, abort, current_app, redirect, Response, send_file, stream_with_context
+)
+from sqlalchemy.exc import SQLAlchemyError
+from extensions import (
+    db, supabase_registry, signed_url_cache, content_cache, search_index, table_versions, query_cache,
+    conditional_get, job_queue, upload_sessions, pdf_texts, content_index, image_variants, label_sheets,
+    repositories
+)
+from services.jobs import JobQueueFull
+from services.uploads import (
+    PartReader, UploadIncomplete, UploadPartError, UploadSessionNotFound, OPEN as UPLOAD_OPEN
+)
+from services.pagination import decode_cursor, slice_page, is_mid_key, is_score_key, NEXT, PREV
 
 # MSDS 블루프린트 생성 - app.py에서 /api/msds로 프리픽스 등록됨
 msds_bp = Blueprint("msds", __name__)
 
-# 데이터베이스 헬퍼 함수들: SELECT/INSERT/UPDATE/DELETE 공용 실행기
-
-def fetch_all(sql, params=None):
-    """
-    여러 행을 조회하는 헬퍼 함수
-    
-    Args:
-        sql (str): 실행할 SQL 쿼리
-        params (dict, optional): SQL 파라미터
-        
-    Returns:
-        list: 조회된 행들의 딕셔너리 리스트
-    """
-    with db.engine.connect() as con:
-        res = con.execute(text(sql), params or {})
-        rows = [dict(r._mapping) for r in res]
-    return rows
+# 데이터 접근: 요청마다 연결 하나를 쓰는 Repository (services/repository.py)
 
-def fetch_one(sql, params=None):
+def _repo():
     """
-    단일 행을 조회하는 헬퍼 함수
+    현재 요청(또는 작업)의 Repository를 반환하는 헬퍼 함수
     
-    Args:
-        sql (str): 실행할 SQL 쿼리
-        params (dict, optional): SQL 파라미터
-        
     Returns:
-        dict or None: 조회된 행의 딕셔너리 또는 None
+        Repository: 요청 단위 Repository (첫 쿼리 때 연결 체크아웃, 요청 종료 시 반환)
     """
-    with db.engine.connect() as con:
-        res = con.execute(text(sql), params or {})
-        row = res.mappings().first()
-        return dict(row) if row else None
-
-def exec_write(sql, params=None):
-    """
-    데이터를 쓰는 헬퍼 함수 (INSERT, UPDATE, DELETE)
-    
-    Args:
-        sql (str): 실행할 SQL 쿼리
-        params (dict, optional): SQL 파라미터
-    """
-    with db.engine.begin() as con:  # 트랜잭션 자동 관리
-        con.execute(text(sql), params or {})
+    return repositories.current()
 
 # 0) 전체 목록 (페이지네이션 지원)  GET /api/msds
 @msds_bp.get("")
+@conditional_get.depends_on("msds", "msds_additional_info", "msds_additional_relation")
 def list_msds():
     """
     MSDS 전체 목록을 조회하는 엔드포인트 (페이지네이션 지원)
     
     Query Parameters:
-        page (int, optional): 페이지 번호 (기본값: 1)
+        page (int, optional): 페이지 번호 (기본값: 1, cursor가 없을 때만 사용)
+        cursor (str, optional): 이전 응답의 next_cursor/prev_cursor (mid 키셋 페이지네이션)
         per_page (int, optional): 페이지당 항목 수 (기본값: 12)
         detailed (bool, optional): 상세 정보 포함 여부 (기본값: false)
+        include (str, optional): "signed_urls"이면 첨부파일별 서명 URL 포함 (detailed 자동 적용)
+        total (str, optional): 전체 개수 계산 방식 exact|estimate|none (기본값: exact)
         
     Returns:
-        JSON: MSDS 목록과 페이지네이션 정보
+        JSON: MSDS 목록과 페이지네이션 정보 (next_cursor/prev_cursor/has_more 포함)
     """
     # 쿼리 파라미터 처리
     page = max(int(request.args.get("page", 1)), 1)
     per_page = min(max(int(request.args.get("per_page", 12)), 1), 100)
     detailed = request.args.get("detailed", "false").lower() == "true"
+    with_signed_urls = "signed_urls" in _parse_include()
+    # 서명 URL은 첨부파일 정보가 있어야 하므로 상세 조회로 전환
+    detailed = detailed or with_signed_urls
+
+    total_mode = (request.args.get("total") or "exact").lower()
+    if total_mode not in TOTAL_MODES:
+        return jsonify({"message": "'total' must be one of exact, estimate, none"}), 400
+
+    # 커서가 있으면 키셋, 없으면 기존 page 방식 (OFFSET)
+    try:
+        window = _page_window("m.mid", page, per_page)
+    except ValueError:
+        return jsonify({"message": "Invalid cursor"}), 400
     
-    # 전체 개수 조회
-    total_result = fetch_one("SELECT COUNT(*) as cnt FROM msds")
-    total = total_result['cnt'] if total_result else 0
+    # 전체 개수 조회 (캐시 사용, total=none이면 생략)
+    total = _count_msds(total_mode)
     
+    # 한 페이지의 MSDS만 먼저 조회 (첨부파일은 아래에서 일괄 로딩)
+    rows = _repo().all(f"""
+        SELECT m.* FROM msds m
+        {window["where"]}
+        ORDER BY m.mid {window["order"]}
+        LIMIT :limit OFFSET :offset
+    """, window["params"])
+
+    # per_page+1개 중 한 페이지만 남기고 이전/다음 커서 생성
+    rows, next_cursor, prev_cursor = slice_page(
+        rows, per_page, window["direction"], window["has_previous"], lambda r: r["mid"], LIST_CURSOR_SCOPE
+    )
+
     if detailed:
-        # 상세 정보 포함하여 조회 (첨부파일 포함)
-        offset = (page - 1) * per_page
-        rows = fetch_all(f"""
-            SELECT m.*, 
-                   GROUP_CONCAT(DISTINCT CONCAT(ai.aid, ':', ai.title, ':', ai.type, ':', COALESCE(ai.file_loc, '')) ORDER BY ai.aid SEPARATOR '|') as attachments_str
-            FROM msds m
-            LEFT JOIN msds_additional_relation mar ON m.mid = mar.mid
-            LEFT JOIN msds_additional_info ai ON mar.aid = ai.aid
-            GROUP BY m.mid
-            ORDER BY m.mid ASC 
-            LIMIT {per_page} OFFSET {offset}
-        """)
-        
-        # 첨부파일 문자열을 파싱하여 객체 배열로 변환
+        # 페이지에 포함된 MSDS의 첨부파일을 한 번의 IN 쿼리로 조회
+        attachments = _repo().attachments_of([row["mid"] for row in rows])
         for row in rows:
-            attachments = []
-            if row.get('attachments_str'):
-                attachment_parts = row['attachments_str'].split('|')
-                for part in attachment_parts:
-                    if part:
-                        aid, title, type_val, file_loc = part.split(':', 3)
-                        attachments.append({
-                            'aid': aid,
-                            'title': title,
-                            'type': int(type_val),
-                            'file_loc': file_loc if file_loc else None
-                        })
-            row['attachments'] = attachments
-            # 임시 필드 제거
-            if 'attachments_str' in row:
-                del row['attachments_str']
-    else:
-        # 기본 정보만 조회
-        offset = (page - 1) * per_page
-        rows = fetch_all(f"SELECT * FROM msds ORDER BY mid ASC LIMIT {per_page} OFFSET {offset}")
+            row["attachments"] = attachments[row["mid"]]
+        # 페이지 전체 첨부파일의 서명 URL을 한 번에 발급
+        if with_signed_urls:
+            _attach_signed_urls([att for row in rows for att in row["attachments"]])
     
     return jsonify({
         "items": rows,
-        "page": page,
+        "page": None if window["keyset"] else page,
         "per_page": per_page,
-        "total": total
+        "total": total,
+        "has_more": next_cursor is not None,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor
     })
 
+def _page_window(key_column, page, per_page):
+    """
+    페이지 조회 조건(WHERE/정렬 방향/LIMIT/OFFSET)을 만드는 헬퍼 함수
+    cursor 파라미터가 있으면 키셋 조건(key > :cursor_key)을, 없으면 기존 OFFSET 조건을 만듭니다.
+    다음 페이지 존재 여부를 알기 위해 항상 per_page+1개를 조회합니다.
+    
+    Args:
+        key_column (str): 정렬 키 컬럼 (예: "m.mid")
+        page (int): 페이지 번호 (커서가 없을 때 사용)
+        per_page (int): 페이지당 항목 수
+        
+    Returns:
+        dict: where, order, params, direction, has_previous, keyset
+        
+    Raises:
+        ValueError: 커서 형식이 올바르지 않은 경우
+    """
+    cursor = request.args.get("cursor")
+    params = {"limit": per_page + 1, "offset": 0}
+    if cursor:
+        key, direction = decode_cursor(cursor, LIST_CURSOR_SCOPE, is_mid_key)
+        params["cursor_key"] = key
+        if direction == PREV:
+            return {"where": f"WHERE {key_column} < :cursor_key", "order": "DESC", "params": params,
+                    "direction": PREV, "has_previous": True, "keyset": True}
+        return {"where": f"WHERE {key_column} > :cursor_key", "order": "ASC", "params": params,
+                "direction": NEXT, "has_previous": True, "keyset": True}
+
+    params["offset"] = (page - 1) * per_page
+    return {"where": "", "order": "ASC", "params": params,
+            "direction": NEXT, "has_previous": page > 1, "keyset": False}
+
+# mid 키셋 커서의 범위 (목록과 검색어 없는 검색이 같은 mid 순서를 공유)
+LIST_CURSOR_SCOPE = "list"
+
+# 전체 개수 계산 방식: exact(정확한 개수, 캐시), estimate(통계 기반 추정), none(생략)
+TOTAL_MODES = ("exact", "estimate", "none")
+
+def _count_msds(mode):
+    """
+    msds 전체 개수를 반환하는 헬퍼 함수
+    결과는 msds 테이블 버전에 묶어 캐시하므로 쓰기가 없으면 COUNT(*)를 다시 실행하지 않습니다.
+    
+    Args:
+        mode (str): exact | estimate | none
+        
+    Returns:
+        int or None: 전체 개수 (none이면 None)
+    """
+    if mode == "none":
+        return None
+    if mode == "estimate":
+        estimate, _ = query_cache.get_or_load(("estimate", "msds"), ("msds",), _estimate_msds_rows)
+        if estimate is not None:
+            return estimate
+    total, _ = query_cache.get_or_load(
+        ("count", "msds"), ("msds",),
+        lambda: _repo().scalar("SELECT COUNT(*) FROM msds") or 0
+    )
+    return total
+
+def _estimate_msds_rows():
+    """
+    MySQL 테이블 통계(information_schema)로 msds 행 수를 추정하는 헬퍼 함수
+    
+    Returns:
+        int or None: 추정 행 수 (MySQL이 아니거나 통계가 없으면 None)
+    """
+    repo = _repo()
+    if repo.dialect != "mysql":
+        return None
+    count = repo.scalar(
+        """
+        SELECT TABLE_ROWS FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'msds'
+        """
+    )
+    return int(count) if count is not None else None
+
+def _bump_versions(*tables):
+    """
+    쓰기 작업 후 테이블 버전을 올려 관련 캐시(개수 등)를 무효화하는 헬퍼 함수
+    
+    Args:
+        *tables (str): 변경된 테이블명들
+
+    Returns:
+        dict: 테이블명 -> 새 버전 (search_index.advance()에 전달)
+    """
+    return table_versions.bump(*tables)
+
 # 1) 상세   GET /api/msds/<mid>
 @msds_bp.get("/<mid>")
+@conditional_get.depends_on("msds", "msds_additional_info", "msds_additional_relation")
 def get_msds(mid):
     """
     특정 MSDS의 상세 정보를 조회하는 엔드포인트
@@ -132,29 +212,72 @@ def get_msds(mid):
     Args:
         mid (str): MSDS ID
         
+    Query Parameters:
+        include (str, optional): "signed_urls"이면 첨부파일별 서명 URL 포함
+        
     Returns:
         JSON: MSDS 상세 정보와 첨부파일 목록
     """
     # MSDS 기본 정보 조회
-    row = fetch_one("SELECT * FROM msds WHERE mid=:mid", {"mid": mid})
+    repo = _repo()
+    row = repo.msds.load(mid)
     if not row:
         return jsonify({"message": "MSDS not found"}), 404
 
-    # 추가자료(첨부파일) 함께 반환
-    # 스키마상 관계 테이블(msds_additional_relation)과 조인해야 하며, 컬럼명은 createdAt/camelCase입니다.
-    attachments = fetch_all(
-        """
-        SELECT i.aid, i.title, i.type, i.file_loc, r.createdAt
-        FROM msds_additional_relation AS r
-        JOIN msds_additional_info AS i ON i.aid = r.aid
-        WHERE r.mid = :mid
-        ORDER BY r.createdAt DESC
-        """,
-        {"mid": mid}
-    )
+    # 추가자료(첨부파일) 함께 반환 (연결 시각 최신순)
+    attachments = repo.attachments_of([mid], newest_first=True)[mid]
+    if "signed_urls" in _parse_include():
+        _attach_signed_urls(attachments)
     row["attachments"] = attachments
     return jsonify(row)
 
+# 1-1) 첨부파일 매니페스트 (단건)   GET /api/msds/<mid>/attachments
+@msds_bp.get("/<mid>/attachments")
+def get_attachment_manifest(mid):
+    """
+    특정 MSDS의 모든 첨부파일과 서명 URL을 한 번에 반환하는 엔드포인트
+    이미지마다 /attachment/<aid> 리다이렉트를 거치지 않고 바로 로드할 수 있습니다.
+    
+    Args:
+        mid (str): MSDS ID
+        
+    Returns:
+        JSON: 첨부파일 목록 (signed_url 포함)과 서명 URL 최소 유효 시간(초)
+    """
+    if not _repo().msds.load(mid):
+        return jsonify({"message": "MSDS not found"}), 404
+
+    manifest = _load_attachment_manifest([mid])
+    return jsonify({
+        "mid": mid,
+        "attachments": manifest.get(mid, []),
+        "expires_in": signed_url_cache.min_validity
+    })
+
+# 1-2) 첨부파일 매니페스트 (페이지 단위)   GET /api/msds/attachments?mids=M0001,M0002
+@msds_bp.get("/attachments")
+def get_attachment_manifests():
+    """
+    여러 MSDS(카드 한 페이지)의 첨부파일과 서명 URL을 한 번에 반환하는 엔드포인트
+    
+    Query Parameters:
+        mids (str): 쉼표로 구분한 MSDS ID 목록 (최대 100개)
+        
+    Returns:
+        JSON: MSDS ID별 첨부파일 목록 (signed_url 포함)과 서명 URL 최소 유효 시간(초)
+    """
+    mids = [m.strip() for m in (request.args.get("mids") or "").split(",") if m.strip()]
+    if not mids:
+        return jsonify({"message": "'mids' is required"}), 400
+    if len(mids) > 100:
+        return jsonify({"message": "Too many mids (max 100)"}), 400
+
+    manifest = _load_attachment_manifest(mids)
+    return jsonify({
+        "items": {mid: manifest.get(mid, []) for mid in mids},
+        "expires_in": signed_url_cache.min_validity
+    })
+
 # 2) 생성   POST /api/msds
 @msds_bp.post("")
 def create_msds():
@@ -173,7 +296,7 @@ def create_msds():
             return jsonify({"message": f"'{f}' is required"}), 400
 
     # MSDS 데이터베이스에 삽입
-    exec_write(
+    _repo().write(
         """
         INSERT INTO msds (mid, title, usage, file_loc, is_osh, is_chr)
         VALUES (:mid, :title, :usage, :file_loc, :is_osh, :is_chr)
@@ -187,8 +310,333 @@ def create_msds():
             "is_chr": int(data.get("is_chr", 0)),
         }
     )
+    # 검색 색인/캐시 버전에 즉시 반영
+    versions = _bump_versions("msds")
+    search_index.upsert(data["mid"], data["title"], data.get("usage"))
+    search_index.advance(versions["msds"])
+    # PDF가 함께 지정되었으면 본문 추출 예약 (본문 검색에 반영)
+    if data.get("file_loc"):
+        pdf_texts.schedule(data["mid"], data["file_loc"])
     return jsonify({"message": "MSDS created successfully"}), 201
 
+# 2-2) 일괄 생성/수정/삭제   POST /api/msds/batch
+# 일괄 작업별 SQL (연속된 같은 종류의 작업은 executemany 한 번으로 실행)
+BATCH_SQL = {
+    "create": """
+        INSERT INTO msds (mid, title, `usage`, file_loc, is_osh, is_chr)
+        VALUES (:mid, :title, :usage, :file_loc, :is_osh, :is_chr)
+    """,
+    "update": """
+        UPDATE msds
+        SET title=:title, `usage`=:usage, file_loc=:file_loc, is_osh=:is_osh, is_chr=:is_chr
+        WHERE mid=:mid
+    """,
+    "delete": "DELETE FROM msds WHERE mid=:mid",
+}
+# 작업 성공 시 결과 상태
+BATCH_STATUS = {"create": "created", "update": "updated", "delete": "deleted"}
+
+@msds_bp.post("/batch")
+def batch_msds():
+    """
+    여러 MSDS 생성/수정/삭제 작업을 한 번의 트랜잭션으로 처리하는 엔드포인트
+    
+    Request Body:
+        mode (str, optional): atomic(기본값, 하나라도 실패하면 전체 취소) 또는 partial(성공한 작업만 반영)
+        operations (list): 작업 목록
+            - {"op": "create", "data": {mid, title, usage, file_loc, is_osh, is_chr}}
+            - {"op": "update", "mid": "...", "data": {title, usage, file_loc, is_osh, is_chr}}
+            - {"op": "delete", "mid": "..."}
+            
+    Returns:
+        JSON: 작업별 결과(index, op, mid, status, code, error)와 성공/실패 건수
+    """
+    data = request.get_json(force=True, silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"message": "Request body must be a JSON object"}), 400
+    mode = data.get("mode", "atomic")
+    operations = data.get("operations")
+    if mode not in ("atomic", "partial"):
+        return jsonify({"message": "'mode' must be atomic or partial"}), 400
+    if not isinstance(operations, list) or not operations:
+        return jsonify({"message": "'operations' must be a non-empty list"}), 400
+    max_ops = current_app.config.get("MSDS_BATCH_MAX_OPERATIONS", 500)
+    if len(operations) > max_ops:
+        return jsonify({"message": f"Too many operations (max {max_ops})"}), 400
+
+    results, planned = _plan_batch(operations)
+    failed = any(r["status"] == "error" for r in results)
+    if failed and mode == "atomic":
+        # 검증 단계에서 실패하면 DB에 접근하지 않고 전체 취소
+        return _batch_response(results, mode, applied=False)
+
+    applied = _apply_batch(planned, results, atomic=(mode == "atomic"))
+    return _batch_response(results, mode, applied)
+
+def _plan_batch(operations):
+    """
+    일괄 작업을 검증하고 실행 계획을 세우는 헬퍼 함수
+    관련 mid의 존재 여부를 한 번의 IN 쿼리로 읽은 뒤 작업 순서대로 상태를 시뮬레이션합니다.
+    (같은 배치 안에서 생성 후 수정/삭제하는 경우도 처리)
+    
+    Args:
+        operations (list): 요청의 작업 목록
+        
+    Returns:
+        tuple: (작업별 결과 리스트, [(index, op, params, 이전 file_loc), ...] 실행 계획)
+    """
+    results = []
+    parsed = []
+    for index, item in enumerate(operations):
+        result = {"index": index, "op": None, "mid": None, "status": "pending"}
+        results.append(result)
+        try:
+            op, params = _parse_batch_op(item)
+        except ValueError as e:
+            result.update(status="error", code=400, error=str(e))
+            continue
+        result.update(op=op, mid=params["mid"])
+        parsed.append((index, op, params))
+
+    # 관련 mid의 현재 상태 (mid -> file_loc)
+    mids = list({params["mid"] for _index, _op, params in parsed})
+    state = {}
+    if mids:
+        state = {row["mid"]: row["file_loc"] for row in _repo().msds_rows(mids)}
+
+    planned = []
+    for index, op, params in parsed:
+        mid = params["mid"]
+        if op == "create" and mid in state:
+            results[index].update(status="error", code=409, error="MSDS already exists")
+            continue
+        if op != "create" and mid not in state:
+            results[index].update(status="error", code=404, error="MSDS not found")
+            continue
+        planned.append((index, op, params, state.get(mid)))
+        if op == "delete":
+            del state[mid]
+        else:
+            state[mid] = params["file_loc"]
+    return results, planned
+
+def _parse_batch_op(item):
+    """
+    작업 하나를 검증하여 (작업 종류, SQL 파라미터)로 변환하는 헬퍼 함수
+    
+    Args:
+        item (dict): {"op": ..., "mid": ..., "data": {...}}
+        
+    Returns:
+        tuple: (작업 종류, SQL 파라미터 딕셔너리)
+        
+    Raises:
+        ValueError: 작업 형식이 올바르지 않은 경우
+    """
+    if not isinstance(item, dict):
+        raise ValueError("Operation must be an object")
+    op = item.get("op")
+    if op not in BATCH_SQL:
+        raise ValueError("'op' must be one of create, update, delete")
+    payload = item.get("data") or {}
+    if not isinstance(payload, dict):
+        raise ValueError("'data' must be an object")
+
+    mid = payload.get("mid") if op == "create" else item.get("mid")
+    if mid in ("", None):
+        raise ValueError("'mid' is required")
+    if op == "delete":
+        return op, {"mid": mid}
+
+    # 생성/수정 모두 title 필수 (수정은 PUT과 같이 전체 필드를 교체)
+    if payload.get("title") in ("", None):
+        raise ValueError("'title' is required")
+    try:
+        flags = {"is_osh": int(payload.get("is_osh", 0)), "is_chr": int(payload.get("is_chr", 0))}
+    except (TypeError, ValueError):
+        raise ValueError("'is_osh' and 'is_chr' must be 0 or 1") from None
+    return op, {
+        "mid": mid,
+        "title": payload["title"],
+        "usage": payload.get("usage"),
+        "file_loc": payload.get("file_loc"),
+        **flags,
+    }
+
+def _apply_batch(planned, results, atomic):
+    """
+    실행 계획을 한 번의 트랜잭션으로 적용하는 헬퍼 함수
+    연속된 같은 종류의 작업을 묶어 executemany로 실행하고, 커밋은 한 번만 합니다.
+    수정/삭제는 영향받은 행 수를 확인하여 대상 행이 없으면 실패로 처리합니다.
+    partial 모드에서는 묶음마다 SAVEPOINT를 두고, 묶음이 실패하면 되돌린 뒤 그 묶음과 이후 작업을
+    한 건씩 각자의 SAVEPOINT에서 실행합니다 (실행 계획은 앞선 작업이 모두 성공한다고 가정하므로).
+    
+    Args:
+        planned (list): _plan_batch()의 실행 계획
+        results (list): 작업별 결과 리스트 (상태가 갱신됨)
+        atomic (bool): True면 하나라도 실패 시 전체 롤백
+        
+    Returns:
+        bool: 변경 사항 커밋 여부
+    """
+    # 연속된 같은 작업끼리 묶음 (작업 순서 보존)
+    runs = []
+    for entry in planned:
+        if runs and runs[-1][0] == entry[1]:
+            runs[-1][1].append(entry)
+        else:
+            runs.append((entry[1], [entry]))
+
+    done = []
+    repo = _repo()
+    one_by_one = False
+    try:
+        with repo.transaction():
+            for op, entries in runs:
+                if not one_by_one:
+                    # partial 모드는 묶음마다 중첩 트랜잭션(SAVEPOINT)으로 실행하여 실패한 묶음만 롤백
+                    savepoint = nullcontext() if atomic else repo.transaction()
+                    try:
+                        with savepoint:
+                            _execute_batch_run(repo, op, entries)
+                    except (SQLAlchemyError, BatchRowsMissing) as e:
+                        if atomic:
+                            for index, *_rest in entries:
+                                results[index].update(status="error", **_batch_error(e))
+                            raise
+                        one_by_one = True
+                    else:
+                        done.extend(entries)
+                        continue
+                for entry in entries:
+                    try:
+                        with repo.transaction():
+                            _execute_batch_run(repo, op, [entry])
+                    except (SQLAlchemyError, BatchRowsMissing) as e:
+                        results[entry[0]].update(status="error", **_batch_error(e))
+                    else:
+                        done.append(entry)
+    except (SQLAlchemyError, BatchRowsMissing):
+        return False
+
+    for index, op, params, _old in done:
+        results[index].update(status=BATCH_STATUS[op], code=201 if op == "create" else 200)
+    if done:
+        _after_batch(_actual_old_locs(planned, done))
+    return bool(done)
+
+class BatchRowsMissing(Exception):
+    """수정/삭제 묶음의 영향받은 행 수가 작업 수보다 적은 경우 (대상 MSDS가 없음)"""
+
+def _execute_batch_run(repo, op, entries):
+    """
+    같은 종류의 작업 묶음을 executemany로 실행하는 헬퍼 함수
+    
+    Args:
+        repo (Repository): 이 요청의 저장소
+        op (str): create | update | delete
+        entries (list): 실행 계획 항목들
+        
+    Raises:
+        BatchRowsMissing: 수정/삭제 대상 행 수가 작업 수보다 적은 경우
+    """
+    result = repo.execute(BATCH_SQL[op], [params for _i, _op, params, _old in entries])
+    # 일부 드라이버(pymysql 등)는 executemany의 행 수를 합산하지 않으므로 그때는 한 건씩 실행할 때만 확인
+    if op == "create" or (len(entries) > 1 and not result.context.dialect.supports_sane_multi_rowcount):
+        return
+    if result.rowcount < len(entries):
+        raise BatchRowsMissing()
+
+def _batch_error(error):
+    """일괄 작업 실패 예외를 결과 필드(code, error)로 변환하는 헬퍼 함수"""
+    if isinstance(error, BatchRowsMissing):
+        return {"code": 404, "error": "MSDS not found"}
+    return {"code": 409, "error": str(getattr(error, "orig", error))}
+
+def _actual_old_locs(planned, done):
+    """
+    실제로 적용된 작업 기준으로 각 작업 직전의 file_loc을 다시 계산하는 헬퍼 함수
+    실행 계획의 이전 file_loc은 앞선 작업이 모두 성공했다고 가정한 값이므로, 일부가 실패했으면 달라질 수 있습니다.
+    
+    Args:
+        planned (list): 전체 실행 계획 (mid별 첫 항목의 이전 file_loc이 DB의 원래 값)
+        done (list): 적용된 실행 계획 항목들 (작업 순서)
+        
+    Returns:
+        list: 이전 file_loc을 고친 적용 항목들
+    """
+    current = {}
+    for _index, _op, params, old in planned:
+        current.setdefault(params["mid"], old)
+    actual = []
+    for index, op, params, _old in done:
+        actual.append((index, op, params, current.get(params["mid"])))
+        current[params["mid"]] = None if op == "delete" else params["file_loc"]
+    return actual
+
+def _after_batch(done):
+    """
+    커밋된 일괄 작업을 검색 색인/캐시에 반영하는 헬퍼 함수
+    
+    Args:
+        done (list): 적용된 (index, op, params, 이전 file_loc) 목록
+    """
+    ops = {op for _index, op, _params, _old in done}
+    versions = _bump_versions(*(("msds", "msds_additional_relation") if "delete" in ops else ("msds",)))
+    # mid별 최종 PDF 경로 (같은 MSDS를 여러 번 바꿨으면 마지막 값만 본문 추출/삭제에 반영)
+    pdf_changes = {}
+    for _index, op, params, old_file_loc in done:
+        if op == "delete":
+            search_index.remove(params["mid"])
+            pdf_changes[params["mid"]] = None
+            # 삭제된 MSDS의 PDF 서명 URL/로컬 캐시 제거
+            _invalidate_storage_object(old_file_loc)
+            continue
+        search_index.upsert(params["mid"], params["title"], params["usage"])
+        if old_file_loc != params["file_loc"]:
+            # PDF 경로가 바뀌었으면 이전 파일의 로컬 캐시 제거
+            if old_file_loc:
+                _invalidate_storage_object(old_file_loc)
+            pdf_changes[params["mid"]] = params["file_loc"]
+    search_index.advance(versions["msds"])
+    # 새 PDF는 본문 추출을 예약하고, PDF가 없어진 MSDS는 저장된 본문을 삭제 (update_msds와 같은 처리)
+    for mid, file_loc in pdf_changes.items():
+        if file_loc:
+            pdf_texts.schedule(mid, file_loc)
+        else:
+            pdf_texts.remove(mid)
+
+def _batch_response(results, mode, applied):
+    """
+    일괄 작업 응답을 구성하는 헬퍼 함수
+    
+    Args:
+        results (list): 작업별 결과
+        mode (str): atomic | partial
+        applied (bool): 변경 사항 커밋 여부
+        
+    Returns:
+        tuple: (JSON 응답, 상태 코드)
+    """
+    if mode == "atomic" and not applied:
+        # 전체 취소된 경우 실패하지 않은 작업도 반영되지 않았음을 표시
+        for r in results:
+            if r["status"] != "error":
+                r["status"] = "rolled_back"
+    succeeded = sum(1 for r in results if r["status"] in BATCH_STATUS.values())
+    failed = sum(1 for r in results if r["status"] == "error")
+    body = {
+        "mode": mode,
+        "applied": applied,
+        "succeeded": succeeded,
+        "failed": failed,
+        "results": results,
+    }
+    if mode == "atomic" and failed:
+        body["message"] = "Batch rejected; no changes were applied"
+        return jsonify(body), 400
+    return jsonify(body), 200
+
 # 3) 수정   PUT /api/msds/<mid>
 @msds_bp.put("/<mid>")
 def update_msds(mid):
@@ -204,12 +652,13 @@ def update_msds(mid):
     data = request.get_json(force=True)
     
     # MSDS 존재 여부 확인
-    exist = fetch_one("SELECT mid FROM msds WHERE mid=:mid", {"mid": mid})
+    repo = _repo()
+    exist = repo.msds.load(mid)
     if not exist:
         return jsonify({"message": "MSDS not found"}), 404
 
     # MSDS 데이터 업데이트
-    exec_write(
+    repo.write(
         """
         UPDATE msds
         SET title=:title, `usage`=:usage, file_loc=:file_loc, is_osh=:is_osh, is_chr=:is_chr
@@ -224,50 +673,30 @@ def update_msds(mid):
             "is_chr": int(data.get("is_chr", 0)),
         }
     )
+
+    # 검색 색인/캐시 버전에 즉시 반영
+    versions = _bump_versions("msds")
+    search_index.upsert(mid, data.get("title"), data.get("usage"))
+    search_index.advance(versions["msds"])
+
+    # PDF 경로가 바뀌었으면 이전 파일의 로컬 캐시 제거 후 새 PDF 본문 추출 예약
+    if exist.get("file_loc") != data.get("file_loc"):
+        if exist.get("file_loc"):
+            _invalidate_storage_object(exist["file_loc"])
+        if data.get("file_loc"):
+            pdf_texts.schedule(mid, data["file_loc"])
+        else:
+            pdf_texts.remove(mid)
     
-    # 수정된 MSDS 데이터 조회하여 반환
-    updated_msds = fetch_one(
-        """
-        SELECT m.*, 
-               GROUP_CONCAT(DISTINCT CONCAT(ai.aid, ':', ai.title, ':', ai.type, ':', COALESCE(ai.file_loc, '')) ORDER BY ai.aid SEPARATOR '|') as attachments_str
-        FROM msds m
-        LEFT JOIN msds_additional_relation mar ON m.mid = mar.mid
-        LEFT JOIN msds_additional_info ai ON mar.aid = ai.aid
-        WHERE m.mid = :mid
-        GROUP BY m.mid
-        """,
-        {"mid": mid}
-    )
+    # 수정된 MSDS 데이터 조회하여 반환 (같은 연결에서 커밋 후 다시 읽음)
+    updated = repo.msds.load(mid)
     
-    if updated_msds:
-        # 첨부파일 문자열을 파싱하여 객체 배열로 변환
-        attachments = []
-        if updated_msds.get('attachments_str'):
-            attachment_parts = updated_msds['attachments_str'].split('|')
-            for part in attachment_parts:
-                if part:
-                    aid, title, type_val, file_loc = part.split(':', 3)
-                    attachments.append({
-                        'aid': aid,
-                        'title': title,
-                        'type': int(type_val),
-                        'file_loc': file_loc if file_loc else None
-                    })
-        
-        # 응답 데이터 구성
-        response_data = {
-            "mid": updated_msds['mid'],
-            "title": updated_msds['title'],
-            "usage": updated_msds['usage'],
-            "file_loc": updated_msds['file_loc'],
-            "is_osh": updated_msds['is_osh'],
-            "is_chr": updated_msds['is_chr'],
-            "attachments": attachments
-        }
-        
+    if updated:
+        updated_msds = {column: updated[column] for column in EXPORT_COLUMNS}
+        updated_msds["attachments"] = repo.attachments_of([mid])[mid]
         return jsonify({
             "message": "MSDS updated successfully",
-            "data": response_data
+            "data": updated_msds
         })
     
     return jsonify({"message": "MSDS updated successfully"})
@@ -284,7 +713,17 @@ def delete_msds(mid):
     Returns:
         JSON: 삭제 결과 메시지
     """
-    exec_write("DELETE FROM msds WHERE mid=:mid", {"mid": mid})
+    repo = _repo()
+    exist = repo.msds.load(mid)
+    repo.write("DELETE FROM msds WHERE mid=:mid", {"mid": mid})
+    if exist:
+        # 삭제된 MSDS의 PDF 서명 URL/로컬 캐시 제거
+        _invalidate_storage_object(exist.get("file_loc"))
+    # 검색 색인에서 제거하고 캐시 버전 갱신 (연결된 관계 행도 함께 삭제될 수 있음)
+    versions = _bump_versions("msds", "msds_additional_relation")
+    search_index.remove(mid)
+    search_index.advance(versions["msds"])
+    pdf_texts.remove(mid)
     return jsonify({"message": "MSDS deleted successfully"})
 
 # 5) PDF 관리 API들
@@ -293,17 +732,21 @@ def delete_msds(mid):
 def upload_pdf(mid):
     """
     MSDS PDF 파일을 업로드하는 엔드포인트
+    파일은 임시 파일로 저장한 뒤 작업 큐에서 스토리지 업로드와 file_loc 갱신을 처리합니다.
     
     Args:
         mid (str): MSDS ID
         
     Returns:
-        JSON: 업로드 결과 메시지
+        JSON: 작업 ID와 상태 조회 URL (202), 큐가 가득 차면 503
     """
-    # MSDS 존재 여부 확인
-    exist = fetch_one("SELECT mid FROM msds WHERE mid=:mid", {"mid": mid})
+    # MSDS 존재 여부 확인 (기존 파일 경로는 캐시 무효화에 사용)
+    repo = _repo()
+    exist = repo.msds.load(mid)
     if not exist:
         return jsonify({"message": "MSDS not found"}), 404
+    # 업로드 본문을 받는 동안 연결을 붙잡지 않도록 풀에 반환
+    repo.release()
 
     # 파일 업로드 확인
     if 'pdf_file' not in request.files:
@@ -316,39 +759,346 @@ def upload_pdf(mid):
     if not file.filename.lower().endswith('.pdf'):
         return jsonify({"message": "Only PDF files are allowed"}), 400
 
+    # 파일명 생성 (타임스탬프 + 원본 파일명)
+    timestamp = int(time.time() * 1000)
+    file_path = f"pdfs/{timestamp}_{file.filename}"
+
+    # 요청 스레드에서는 임시 파일로 저장(spool)만 하고, 스토리지 업로드는 작업 큐에서 처리
+    spool_path = _spool_upload(file)
     try:
-        # Supabase 설정값 가져오기
-        bucket = current_app.config.get("SUPABASE_BUCKET", "msds")
+        job = job_queue.submit(
+            "pdf_upload", _run_pdf_upload, mid, spool_path, file_path, exist.get("file_loc"),
+            meta={"mid": mid, "file_path": file_path},
+            cleanup={"spool_path": spool_path},
+        )
+    except JobQueueFull:
+        _remove_quietly(spool_path)
+        return _queue_full_response()
+    return _job_accepted_response(job, file_path)
+
+def _job_accepted_response(job, file_path):
+    """
+    업로드 작업 접수 응답(202)을 구성하는 헬퍼 함수
+    
+    Args:
+        job (dict): 등록된 작업 기록
+        file_path (str): 스토리지에 저장될 경로
         
-        # Supabase 클라이언트 생성
-        sb = _get_supabase()
+    Returns:
+        tuple: (JSON 응답, 202)
+    """
+    status_url = f"{request.script_root}/api/msds/jobs/{job['id']}"
+    response = jsonify({
+        "message": "PDF upload accepted",
+        "job_id": job["id"],
+        "status": job["status"],
+        "status_url": status_url,
+        "file_path": file_path,
+    })
+    response.headers["Location"] = status_url
+    return response, 202
+
+def _queue_full_response():
+    """작업 큐가 가득 찼을 때 잠시 후 다시 시도하도록 안내하는 응답(503 + Retry-After) - backpressure"""
+    response = jsonify({"message": "Upload queue is full, retry later"})
+    response.headers["Retry-After"] = str(current_app.config.get("JOB_RETRY_AFTER", 5))
+    return response, 503
+
+@job_queue.on_interrupted("pdf_upload")
+def _cleanup_interrupted_upload(record):
+    """
+    작업 프로세스가 종료되어 끝나지 못한 PDF 업로드를 정리하는 함수 (job_queue.recover()에서 호출)
+    단일 업로드는 스풀 파일을 지우고, 이어 올리기는 세션을 다시 열어 완료를 다시 요청할 수 있게 합니다 (조각 유지).
+    
+    Args:
+        record (dict): 실패로 기록된 작업 기록
+    """
+    cleanup = record.get("_cleanup") or {}
+    if cleanup.get("upload_id"):
+        upload_sessions.reopen(cleanup["upload_id"])
+    if cleanup.get("spool_path"):
+        _remove_quietly(cleanup["spool_path"])
+
+def _spool_upload(file):
+    """
+    업로드 파일을 스풀 디렉터리의 임시 파일로 저장하는 헬퍼 함수
+    
+    Args:
+        file (FileStorage): 업로드된 파일
+        
+    Returns:
+        str: 임시 파일 경로
+    """
+    spool_dir = current_app.config.get("UPLOAD_SPOOL_DIR") or os.path.join(current_app.instance_path, "uploads")
+    os.makedirs(spool_dir, exist_ok=True)
+    fd, spool_path = tempfile.mkstemp(suffix=".pdf", dir=spool_dir)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            file.save(fh)
+    except Exception:
+        _remove_quietly(spool_path)
+        raise
+    return spool_path
+
+def _remove_quietly(path):
+    """파일을 삭제하고 실패는 무시하는 헬퍼 함수"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def _run_pdf_upload(job, mid, spool_path, file_path, old_file_loc):
+    """
+    스풀된 PDF를 스토리지에 업로드하고 file_loc을 갱신하는 작업 함수 (작업 큐 워커에서 실행)
+    
+    Args:
+        job (Job): 진행 상황 보고용 작업 핸들
+        mid (str): MSDS ID
+        spool_path (str): 스풀된 임시 파일 경로
+        file_path (str): 스토리지에 저장할 경로
+        old_file_loc (str): 교체 전 파일 경로 (캐시 무효화용)
+        
+    Returns:
+        dict: 업로드된 파일 경로와 크기
+    """
+    try:
+        with open(spool_path, "rb") as fh:
+            return _store_pdf(job, mid, fh, os.path.getsize(spool_path), file_path, old_file_loc)
+    finally:
+        _remove_quietly(spool_path)
+
+def _store_pdf(job, mid, fileobj, size, file_path, old_file_loc):
+    """
+    PDF를 스토리지에 스트리밍 업로드한 뒤 file_loc을 새 경로로 바꾸는 헬퍼 함수
+    업로드가 끝나기 전에는 DB가 이전 파일을 가리키므로, 실패해도 기존 PDF가 그대로 유지됩니다.
+    
+    Args:
+        job (Job): 진행 상황 보고용 작업 핸들
+        mid (str): MSDS ID
+        fileobj: 읽기 가능한 바이너리 파일 객체
+        size (int): 파일 크기(바이트)
+        file_path (str): 스토리지에 저장할 경로
+        old_file_loc (str): 교체 전 파일 경로 (캐시 무효화용)
+        
+    Returns:
+        dict: 업로드된 파일 경로와 크기
+    """
+    bucket = current_app.config.get("SUPABASE_BUCKET", "msds")
+    job.progress(0, size)
+    supabase_registry.upload_stream(
+        bucket, file_path, fileobj, size, progress=lambda sent: job.progress(sent, size)
+    )
+
+    # 데이터베이스에 파일 경로 업데이트 (단일 UPDATE 한 번으로 교체)
+    _repo().write(
+        "UPDATE msds SET file_loc=:file_loc WHERE mid=:mid",
+        {"file_loc": file_path, "mid": mid}
+    )
+    # file_loc만 바뀌어 검색 색인 내용은 그대로이므로 버전만 기록
+    search_index.advance(_bump_versions("msds")["msds"])
+
+    # 이전 PDF의 로컬 캐시 제거
+    if old_file_loc:
+        _invalidate_storage_object(old_file_loc)
+    # 새 PDF의 본문 추출 예약 (검색 scope=content)
+    pdf_texts.schedule(mid, file_path)
+    return {"file_path": file_path, "size": size}
+
+# 5-1-1) 작업 상태 조회   GET /api/msds/jobs/<job_id>
+@msds_bp.get("/jobs/<job_id>")
+def get_job(job_id):
+    """
+    백그라운드 작업(PDF 업로드 등)의 상태를 조회하는 엔드포인트
+    
+    Args:
+        job_id (str): 작업 ID
         
-        # 파일명 생성 (타임스탬프 + 원본 파일명)
-        import time
-        timestamp = int(time.time() * 1000)
-        filename = f"{timestamp}_{file.filename}"
-        file_path = f"pdfs/{filename}"
+    Returns:
+        JSON: 작업 상태 (status, progress, result, error)
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"message": "Job not found"}), 404
+    return jsonify(job)
+
+# 5-1-2) 이어 올리기(resumable) 업로드
+#   POST   /api/msds/<mid>/pdf/uploads                           세션 생성
+#   GET    /api/msds/<mid>/pdf/uploads/<upload_id>               받은/빠진 조각 조회 (재시도 시 빠진 조각만 전송)
+#   PUT    /api/msds/<mid>/pdf/uploads/<upload_id>/parts/<n>     조각 전송 (X-Part-SHA256 헤더 필수)
+#   POST   /api/msds/<mid>/pdf/uploads/<upload_id>/complete      스토리지 업로드 + file_loc 교체 (202 + 작업 ID)
+#   DELETE /api/msds/<mid>/pdf/uploads/<upload_id>               세션 취소
+@msds_bp.post("/<mid>/pdf/uploads")
+def create_pdf_upload(mid):
+    """
+    이어 올리기 업로드 세션을 만드는 엔드포인트
+    
+    Args:
+        mid (str): MSDS ID
         
-        # Supabase Storage에 파일 업로드
-        result = sb.storage.from_(bucket).upload(file_path, file.read())
+    Returns:
+        JSON: 세션 정보 (upload_id, part_size, parts_total, missing 등)
+    """
+    if not _repo().msds.load(mid):
+        return jsonify({"message": "MSDS not found"}), 404
+
+    payload = request.get_json(silent=True) or {}
+    if not isinstance(payload, dict):
+        return jsonify({"message": "Request body must be a JSON object"}), 400
+    filename = str(payload.get("filename") or "")
+    if not filename.lower().endswith(".pdf"):
+        return jsonify({"message": "Only PDF files are allowed"}), 400
+    try:
+        size = int(payload.get("size"))
+        part_size = int(payload["part_size"]) if payload.get("part_size") else None
+        session = upload_sessions.create(mid, filename, size, part_size)
+    except (TypeError, ValueError) as e:
+        # UploadPartError도 ValueError 하위 클래스
+        return jsonify({"message": f"Invalid upload request: {e}"}), 400
+    return jsonify(_upload_session_body(session)), 201
+
+@msds_bp.get("/<mid>/pdf/uploads/<upload_id>")
+def get_pdf_upload(mid, upload_id):
+    """
+    이어 올리기 세션 상태를 조회하는 엔드포인트 (연결이 끊긴 뒤 빠진 조각 확인용)
+    
+    Args:
+        mid (str): MSDS ID
+        upload_id (str): 세션 ID
         
-        # Supabase upload 메서드 응답 처리
-        if hasattr(result, 'error') and result.error:
-            return jsonify({"message": f"Upload failed: {result.error}"}), 500
+    Returns:
+        JSON: 세션 정보 (received, missing, bytes_received, expires_at)
+    """
+    try:
+        session = upload_sessions.status(upload_id)
+    except UploadSessionNotFound:
+        return jsonify({"message": "Upload session not found"}), 404
+    if session["mid"] != mid:
+        return jsonify({"message": "Upload session not found"}), 404
+    return jsonify(_upload_session_body(session))
+
+@msds_bp.put("/<mid>/pdf/uploads/<upload_id>/parts/<int:number>")
+def put_pdf_upload_part(mid, upload_id, number):
+    """
+    이어 올리기 조각 하나를 받는 엔드포인트
+    요청 본문은 조각 바이트 그대로이며, X-Part-SHA256 헤더의 체크섬이 일치할 때만 저장합니다.
+    같은 조각을 다시 보내면 덮어씁니다.
+    
+    Args:
+        mid (str): MSDS ID
+        upload_id (str): 세션 ID
+        number (int): 조각 번호 (1부터)
         
-        # 데이터베이스에 파일 경로 업데이트
-        exec_write(
-            "UPDATE msds SET file_loc=:file_loc WHERE mid=:mid",
-            {"file_loc": file_path, "mid": mid}
+    Returns:
+        JSON: 저장된 조각 정보 (number, size, sha256)
+    """
+    try:
+        if upload_sessions.manifest(upload_id)["mid"] != mid:
+            raise UploadSessionNotFound(upload_id)
+        part = upload_sessions.put_part(
+            upload_id, number, request.stream, request.headers.get("X-Part-SHA256")
         )
+    except UploadSessionNotFound:
+        return jsonify({"message": "Upload session not found"}), 404
+    except UploadPartError as e:
+        return jsonify({"message": str(e)}), 400
+    return jsonify(part)
+
+@msds_bp.post("/<mid>/pdf/uploads/<upload_id>/complete")
+def complete_pdf_upload(mid, upload_id):
+    """
+    모든 조각이 모인 세션을 스토리지에 올리고 file_loc을 교체하는 엔드포인트
+    조각 파일을 이어 읽으며 스트리밍 업로드하고, 업로드가 끝난 뒤에만 file_loc을 바꿉니다.
+    
+    Args:
+        mid (str): MSDS ID
+        upload_id (str): 세션 ID
         
-        return jsonify({
-            "message": "PDF uploaded successfully",
-            "file_path": file_path
-        })
+    Returns:
+        JSON: 작업 ID와 상태 조회 URL (202), 빠진 조각이 있으면 409
+    """
+    exist = _repo().msds.load(mid)
+    if not exist:
+        return jsonify({"message": "MSDS not found"}), 404
+    try:
+        if upload_sessions.manifest(upload_id)["mid"] != mid:
+            raise UploadSessionNotFound(upload_id)
+        manifest, part_paths = upload_sessions.begin_complete(upload_id)
+    except UploadSessionNotFound:
+        return jsonify({"message": "Upload session not found"}), 404
+    except UploadIncomplete as e:
+        return jsonify({"message": "Upload is incomplete", "missing": e.missing}), 409
+    except UploadPartError as e:
+        return jsonify({"message": str(e)}), 409
+
+    timestamp = int(time.time() * 1000)
+    file_path = f"pdfs/{timestamp}_{manifest['filename']}"
+    try:
+        job = job_queue.submit(
+            "pdf_upload", _run_session_upload, mid, upload_id, part_paths, manifest["size"],
+            file_path, exist.get("file_loc"),
+            meta={"mid": mid, "file_path": file_path, "upload_id": upload_id},
+            cleanup={"upload_id": upload_id},
+        )
+    except JobQueueFull:
+        upload_sessions.reopen(upload_id)
+        return _queue_full_response()
+    return _job_accepted_response(job, file_path)
+
+@msds_bp.delete("/<mid>/pdf/uploads/<upload_id>")
+def abort_pdf_upload(mid, upload_id):
+    """
+    이어 올리기 세션을 취소하고 조각 파일을 삭제하는 엔드포인트
+    
+    Args:
+        mid (str): MSDS ID
+        upload_id (str): 세션 ID
         
-    except Exception as e:
-        return jsonify({"message": f"Upload failed: {str(e)}"}), 500
+    Returns:
+        JSON: 취소 결과 메시지
+    """
+    try:
+        manifest = upload_sessions.manifest(upload_id)
+    except UploadSessionNotFound:
+        return jsonify({"message": "Upload session not found"}), 404
+    if manifest["mid"] != mid or manifest["state"] != UPLOAD_OPEN:
+        return jsonify({"message": "Upload session cannot be aborted"}), 409
+    upload_sessions.discard(upload_id)
+    return jsonify({"message": "Upload session aborted"})
+
+def _upload_session_body(session):
+    """세션 정보를 응답 형식으로 변환하는 헬퍼 함수 (조각 전송 URL 포함)"""
+    body = {k: v for k, v in session.items() if k != "id"}
+    body["upload_id"] = session["id"]
+    body["part_url"] = (
+        f"{request.script_root}/api/msds/{session['mid']}/pdf/uploads/{session['id']}/parts/{{number}}"
+    )
+    return body
+
+def _run_session_upload(job, mid, upload_id, part_paths, size, file_path, old_file_loc):
+    """
+    이어 올리기 세션의 조각들을 이어 스토리지에 올리는 작업 함수 (작업 큐 워커에서 실행)
+    성공하면 세션을 삭제하고, 실패하면 세션을 되돌려 조각을 다시 보내지 않고 완료를 재요청할 수 있게 합니다.
+    
+    Args:
+        job (Job): 진행 상황 보고용 작업 핸들
+        mid (str): MSDS ID
+        upload_id (str): 세션 ID
+        part_paths (list): 조각 파일 경로 (순서대로)
+        size (int): 전체 크기(바이트)
+        file_path (str): 스토리지에 저장할 경로
+        old_file_loc (str): 교체 전 파일 경로
+        
+    Returns:
+        dict: 업로드된 파일 경로와 크기
+    """
+    try:
+        with PartReader(part_paths) as reader:
+            result = _store_pdf(job, mid, reader, size, file_path, old_file_loc)
+    except Exception:
+        upload_sessions.reopen(upload_id)
+        raise
+    upload_sessions.discard(upload_id)
+    return result
 
 # 5-2) PDF 삭제   DELETE /api/msds/<mid>/pdf
 @msds_bp.delete("/<mid>/pdf")
@@ -363,20 +1113,26 @@ def delete_pdf(mid):
         JSON: 삭제 결과 메시지
     """
     # MSDS 존재 여부 확인
-    msds_data = fetch_one("SELECT file_loc FROM msds WHERE mid=:mid", {"mid": mid})
+    repo = _repo()
+    msds_data = repo.msds.load(mid)
     if not msds_data:
         return jsonify({"message": "MSDS not found"}), 404
     
     if not msds_data.get('file_loc'):
         return jsonify({"message": "No PDF file to delete"}), 404
+    # 스토리지 삭제 요청 동안 연결을 붙잡지 않도록 풀에 반환
+    repo.release()
 
     try:
         # Supabase 설정값 가져오기
         bucket = current_app.config.get("SUPABASE_BUCKET", "msds")
         
-        # Supabase 클라이언트 생성
+        # 공유 Supabase 클라이언트 가져오기
         sb = _get_supabase()
         
+        # 삭제될 파일의 서명 URL/로컬 캐시 제거
+        _invalidate_storage_object(msds_data['file_loc'])
+
         # Supabase Storage에서 파일 삭제 시도 (실패해도 DB 업데이트는 진행)
         try:
             result = sb.storage.from_(bucket).remove([msds_data['file_loc']])
@@ -389,10 +1145,12 @@ def delete_pdf(mid):
             pass
         
         # 데이터베이스에서 파일 경로 제거
-        exec_write(
+        repo.write(
             "UPDATE msds SET file_loc=NULL WHERE mid=:mid",
             {"mid": mid}
         )
+        search_index.advance(_bump_versions("msds")["msds"])  # 검색 대상 필드는 그대로
+        pdf_texts.remove(mid)
         
         return jsonify({"message": "PDF deleted successfully"})
         
@@ -401,6 +1159,7 @@ def delete_pdf(mid):
 
 # 5) 추가자료 목록   GET /api/msds/additional-info
 @msds_bp.get("/additional-info")
+@conditional_get.depends_on("msds_additional_info")
 def get_all_additional():
     """
     추가자료 목록을 조회하는 엔드포인트
@@ -429,7 +1188,7 @@ def get_all_additional():
 
     # WHERE 절 구성 (조건이 있으면 WHERE 추가, 없으면 빈 문자열)
     where = " WHERE " + " AND ".join(conds) if conds else ""
-    rows = fetch_all(f"SELECT * FROM msds_additional_info{where} ORDER BY createdAt DESC", params)
+    rows = _repo().all(f"SELECT * FROM msds_additional_info{where} ORDER BY createdAt DESC", params)
     return jsonify(rows)
 
 # 6) 추가자료 생성  POST /api/msds/additional-info
@@ -450,7 +1209,7 @@ def create_additional():
             return jsonify({"message": f"'{f}' is required"}), 400
 
     # 추가자료 데이터베이스에 삽입
-    exec_write(
+    _repo().write(
         """
         INSERT INTO msds_additional_info (aid, mid, title, type, file_loc)
         VALUES (:aid, :mid, :title, :type, :file_loc)
@@ -463,6 +1222,7 @@ def create_additional():
             "file_loc": data.get("file_loc"),
         }
     )
+    _bump_versions("msds_additional_info")
     return jsonify({"message": "MSDS additional info created successfully"}), 201
 
 # 7) 추가자료 수정  PUT /api/msds/additional-info/<aid>
@@ -478,9 +1238,13 @@ def update_additional(aid):
         JSON: 수정 결과 메시지
     """
     data = request.get_json(force=True)
+
+    # 기존 파일 경로 조회 (캐시 무효화용)
+    repo = _repo()
+    before = repo.one("SELECT file_loc FROM msds_additional_info WHERE aid=:aid", {"aid": aid})
     
     # 추가자료 데이터 업데이트
-    exec_write(
+    repo.write(
         """
         UPDATE msds_additional_info
         SET title=:title, type=:type, file_loc=:file_loc
@@ -493,57 +1257,61 @@ def update_additional(aid):
             "file_loc": data.get("file_loc"),
         }
     )
+
+    _bump_versions("msds_additional_info")
+
+    # 이미지 경로가 바뀌었으면 이전 파일의 캐시 제거
+    if before and before.get("file_loc") and before["file_loc"] != data.get("file_loc"):
+        _invalidate_storage_object(before["file_loc"])
     return jsonify({"message": "MSDS additional info updated successfully"})
 
 # 8) 옵션 데이터 조회   GET /api/msds/options
+# 추가자료 타입 → 옵션 키 (0: 보호장구, 1: 장소, 2: 경고표지)
+OPTION_KINDS = {-1: "usages", 0: "protective", 1: "locations", 2: "warnings"}
+# 옵션 목록이 의존하는 테이블 (쓰기 라우트가 버전을 올리면 캐시/ETag가 바뀜)
+OPTION_TABLES = ("msds", "msds_additional_info", "msds_additional_relation")
+
 @msds_bp.get("/options")
+@conditional_get.depends_on(*OPTION_TABLES)
 def get_options():
     """
     MSDS 수정에 필요한 옵션 데이터를 조회하는 엔드포인트
+    한 번의 그룹 쿼리로 읽은 결과를 테이블 버전에 묶어 캐시합니다.
+    (ETag/304 처리는 조건부 GET 미들웨어가 담당)
     
     Returns:
         JSON: 용도, 장소, 경고표지, 보호장구 옵션 목록
     """
-    # 고유한 용도 추출
-    usages = fetch_all("SELECT DISTINCT `usage` FROM msds WHERE `usage` IS NOT NULL AND `usage` != '' ORDER BY `usage`")
-    usage_list = [row['usage'] for row in usages]
-    
-    # 고유한 장소 추출 (타입 1)
-    locations = fetch_all("""
-        SELECT DISTINCT i.title 
-        FROM msds_additional_info AS i
-        JOIN msds_additional_relation AS r ON i.aid = r.aid
-        WHERE i.type = 1
-        ORDER BY i.title
-    """)
-    location_list = [row['title'] for row in locations]
-    
-    # 고유한 경고표지 추출 (타입 2)
-    warnings = fetch_all("""
-        SELECT DISTINCT i.title 
-        FROM msds_additional_info AS i
-        JOIN msds_additional_relation AS r ON i.aid = r.aid
-        WHERE i.type = 2
-        ORDER BY i.title
-    """)
-    warning_list = [row['title'] for row in warnings]
+    options, _token = query_cache.get_or_load(("options",), OPTION_TABLES, _load_options)
+    return jsonify(options)
+
+def _load_options():
+    """
+    옵션 목록을 한 번의 쿼리로 조회하는 헬퍼 함수
+    용도(kind=-1)와 추가자료 타입별 제목(kind=0,1,2)을 UNION ALL로 묶어 읽습니다.
     
-    # 고유한 보호장구 추출 (타입 0)
-    protective = fetch_all("""
-        SELECT DISTINCT i.title 
+    Returns:
+        dict: 옵션 키 -> 정렬된 고유값 목록
+    """
+    rows = _repo().all("""
+        SELECT -1 AS kind, `usage` AS value
+        FROM msds
+        WHERE `usage` IS NOT NULL AND `usage` != ''
+        GROUP BY `usage`
+        UNION ALL
+        SELECT i.type AS kind, i.title AS value
         FROM msds_additional_info AS i
         JOIN msds_additional_relation AS r ON i.aid = r.aid
-        WHERE i.type = 0
-        ORDER BY i.title
+        WHERE i.type IN (0, 1, 2)
+        GROUP BY i.type, i.title
+        ORDER BY kind, value
     """)
-    protective_list = [row['title'] for row in protective]
-    
-    return jsonify({
-        "usages": usage_list,
-        "locations": location_list,
-        "warnings": warning_list,
-        "protective": protective_list
-    })
+    options = {key: [] for key in OPTION_KINDS.values()}
+    for row in rows:
+        key = OPTION_KINDS.get(int(row["kind"]))
+        if key and row["value"] is not None:
+            options[key].append(row["value"])
+    return options
 
 # 9) 추가자료 삭제  DELETE /api/msds/additional-info/<aid>
 @msds_bp.delete("/additional-info/<aid>")
@@ -557,7 +1325,14 @@ def delete_additional(aid):
     Returns:
         JSON: 삭제 결과 메시지
     """
-    exec_write("DELETE FROM msds_additional_info WHERE aid=:aid", {"aid": aid})
+    repo = _repo()
+    before = repo.one("SELECT file_loc FROM msds_additional_info WHERE aid=:aid", {"aid": aid})
+    repo.write("DELETE FROM msds_additional_info WHERE aid=:aid", {"aid": aid})
+    _bump_versions("msds_additional_info", "msds_additional_relation")
+
+    # 삭제된 추가자료 이미지의 캐시 제거
+    if before and before.get("file_loc"):
+        _invalidate_storage_object(before["file_loc"])
     return jsonify({"message": "MSDS additional info deleted successfully"})
 
 
@@ -565,25 +1340,301 @@ def delete_additional(aid):
 
 def _get_supabase():
     """
-    Supabase 클라이언트를 생성하는 헬퍼 함수
+    공유 Supabase 클라이언트를 반환하는 헬퍼 함수
+    앱 팩토리에서 초기화한 레지스트리의 클라이언트를 재사용합니다 (요청마다 생성하지 않음).
     
     Returns:
         SupabaseClient: Supabase 클라이언트 인스턴스
     """
-    url = current_app.config["SUPABASE_URL"]
-    key = current_app.config["SUPABASE_SERVICE_ROLE_KEY"]  # 서버 전용 키 권장
-    return create_client(url, key)
+    return supabase_registry.get_client()
+
+def _invalidate_storage_object(file_path):
+    """
+    스토리지 객체의 서명 URL 캐시, 로컬 콘텐츠 캐시, 이미지 변형을 함께 제거하는 헬퍼 함수
+    file_loc이 바뀌거나 파일이 삭제될 때 호출합니다.
+    
+    Args:
+        file_path (str): 버킷 내 파일 경로
+    """
+    if not file_path or file_path == "None":
+        return
+    bucket = current_app.config.get("SUPABASE_BUCKET", "msds")
+    signed_url_cache.invalidate(bucket, file_path)
+    content_cache.invalidate(bucket, file_path)
+    image_variants.invalidate(bucket, file_path)
 
-# 2) 검색 + 페이지네이션: GET /api/msds/search?q=...&page=&per_page=
+def _send_cached(entry, download_name=None, as_attachment=False):
+    """
+    로컬 캐시 파일을 응답으로 보내는 헬퍼 함수
+    send_file은 wsgi.file_wrapper(sendfile)로 전송하며 If-None-Match(304)와 Range(206)를 처리합니다.
+    
+    Args:
+        entry (CacheEntry): 캐시 항목
+        download_name (str, optional): 다운로드 파일명
+        as_attachment (bool): 첨부 파일로 다운로드할지 여부
+        
+    Returns:
+        Response: 파일 응답
+    """
+    return send_file(
+        entry.file_path,
+        mimetype=entry.content_type or "application/octet-stream",
+        as_attachment=as_attachment,
+        download_name=download_name,
+        conditional=True,
+        etag=entry.etag
+    )
+
+def _parse_include():
+    """
+    include 쿼리 파라미터를 집합으로 변환하는 헬퍼 함수 (예: include=signed_urls)
+    
+    Returns:
+        set: 요청된 include 항목들
+    """
+    return {v.strip() for v in (request.args.get("include") or "").split(",") if v.strip()}
+
+def _attach_signed_urls(attachments):
+    """
+    첨부파일 목록에 서명 URL(signed_url)을 채워 넣는 헬퍼 함수
+    캐시에 없는 경로들은 한 번의 일괄 서명 요청으로 처리합니다.
+    
+    Args:
+        attachments (list): 첨부파일 딕셔너리 리스트 (file_loc 필드 필요)
+        
+    Returns:
+        list: signed_url 필드가 추가된 첨부파일 리스트
+    """
+    bucket = current_app.config.get("SUPABASE_BUCKET", "msds")
+    paths = [a.get("file_loc") for a in attachments if a.get("file_loc") and a.get("file_loc") != "None"]
+    signed = signed_url_cache.get_many(bucket, paths) if paths else {}
+    for a in attachments:
+        a["signed_url"] = signed.get(a.get("file_loc"))
+    return attachments
+
+def _load_attachment_manifest(mids):
+    """
+    여러 MSDS의 첨부파일을 한 번의 쿼리로 조회하고 서명 URL을 붙이는 헬퍼 함수
+    
+    Args:
+        mids (list): MSDS ID 목록
+        
+    Returns:
+        dict: MSDS ID -> 첨부파일 리스트 (signed_url 포함)
+    """
+    manifest = _repo().attachments_of(mids)
+    _attach_signed_urls([att for atts in manifest.values() for att in atts])
+    return manifest
+
+# 2-1) 전체 내보내기 (스트리밍)   GET /api/msds/export?format=ndjson|csv&include=attachments
+# 내보내기 컬럼 순서 (CSV 헤더)
+EXPORT_COLUMNS = ("mid", "title", "usage", "file_loc", "is_osh", "is_chr")
+
+@msds_bp.get("/export")
+@conditional_get.depends_on("msds", "msds_additional_info", "msds_additional_relation")
+def export_msds():
+    """
+    전체 MSDS 목록을 한 번의 요청으로 내보내는 엔드포인트
+    서버 측(비버퍼) 커서에서 청크 단위로 읽어 바로 전송하므로 목록 크기와 관계없이 메모리 사용량이 일정합니다.
+    
+    Query Parameters:
+        format (str, optional): ndjson(기본값) 또는 csv
+        include (str, optional): "attachments"이면 MSDS마다 첨부파일 목록 포함
+        
+    Returns:
+        Response: NDJSON 또는 CSV 스트리밍 응답 (첨부 파일로 다운로드)
+    """
+    fmt = (request.args.get("format") or "ndjson").lower()
+    if fmt not in ("ndjson", "csv"):
+        return jsonify({"message": "'format' must be ndjson or csv"}), 400
+    with_attachments = "attachments" in _parse_include()
+    chunk_size = current_app.config.get("EXPORT_CHUNK_SIZE", 1000)
+
+    chunks = _iter_export_chunks(with_attachments, chunk_size)
+    if fmt == "csv":
+        body, mimetype = _export_csv(chunks, with_attachments), "text/csv; charset=utf-8"
+    else:
+        body, mimetype = _export_ndjson(chunks), "application/x-ndjson"
+
+    filename = f"msds_export_{date.today():%Y%m%d}.{fmt}"
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+def _iter_export_chunks(with_attachments, chunk_size):
+    """
+    MSDS를 mid 순으로 청크 단위로 읽는 제너레이터
+    stream_results로 서버 측 커서(MySQL SSCursor)를 별도 연결에서 사용하고,
+    첨부파일은 청크마다 요청 연결에서 한 번의 IN 쿼리로 읽습니다 (스트리밍 중인 연결은 다른 쿼리 불가).
+    
+    Args:
+        with_attachments (bool): 첨부파일 포함 여부
+        chunk_size (int): 한 번에 가져올 행 수
+        
+    Yields:
+        list: MSDS 딕셔너리 리스트 (최대 chunk_size개)
+    """
+    repo = _repo()
+    for rows in repo.stream("SELECT mid, title, `usage`, file_loc, is_osh, is_chr FROM msds ORDER BY mid", chunk_size):
+        if with_attachments:
+            # 전체 목록을 한 번만 읽으므로 Loader에 기억하지 않음 (메모리 사용량 일정)
+            attachments = repo.attachments_of([row["mid"] for row in rows], remember=False)
+            for row in rows:
+                row["attachments"] = attachments[row["mid"]]
+        yield rows
+
+def _export_ndjson(chunks):
+    """청크를 NDJSON(한 줄에 MSDS 하나) 바이트로 변환하는 제너레이터"""
+    dumps = current_app.json.dumps
+    for rows in chunks:
+        yield "".join(dumps(row) + "\n" for row in rows).encode("utf-8")
+
+def _export_csv(chunks, with_attachments):
+    """청크를 CSV 바이트로 변환하는 제너레이터 (첨부파일은 JSON 배열 문자열 컬럼)"""
+    dumps = current_app.json.dumps
+    header = list(EXPORT_COLUMNS) + (["attachments"] if with_attachments else [])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # 엑셀에서 한글이 깨지지 않도록 UTF-8 BOM을 앞에 붙임
+    buffer.write("\ufeff")
+    writer.writerow(header)
+    for rows in chunks:
+        for row in rows:
+            values = [row.get(column) for column in EXPORT_COLUMNS]
+            if with_attachments:
+                values.append(dumps(row["attachments"]))
+            writer.writerow(values)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    # 데이터가 없으면 헤더만 전송
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+# 2-2) 라벨 시트 (QR 코드 + 제목 + 경고 표지 PDF)   POST /api/msds/labels
+@msds_bp.post("/labels")
+def create_label_sheet():
+    """
+    여러 MSDS의 QR 코드 라벨을 인쇄용 PDF 한 장으로 만드는 엔드포인트
+    입력이 같으면 캐시된 시트를 다시 그리지 않고 디스크에서 스트리밍합니다.
+    
+    Request Body:
+        mids (list, optional): MSDS ID 목록 (이 순서대로 배치)
+        location (str, optional): 장소 추가자료 제목 (해당 장소에 연결된 MSDS 전체, mid 순)
+        base_url (str, optional): QR에 넣을 프론트엔드 주소 (기본값: LABEL_BASE_URL 또는 요청 Origin)
+        
+    Returns:
+        Response: PDF (application/pdf), 라벨 수는 X-Label-Count 헤더
+    """
+    data = request.get_json(force=True, silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"message": "Request body must be a JSON object"}), 400
+    mids, location = data.get("mids"), data.get("location")
+    if (mids is None) == (location is None):
+        return jsonify({"message": "Provide exactly one of 'mids' or 'location'"}), 400
+    if mids is not None and (not isinstance(mids, list) or not all(isinstance(m, str) and m for m in mids)):
+        return jsonify({"message": "'mids' must be a list of MSDS IDs"}), 400
+    if location is not None and (not isinstance(location, str) or not location.strip()):
+        return jsonify({"message": "'location' must be a non-empty string"}), 400
+    if not label_sheets.available:
+        return jsonify({"message": "Label generation is not available (reportlab is not installed)"}), 503
+
+    base_url = data.get("base_url") or label_sheets.base_url or request.headers.get("Origin") or request.host_url
+    if not isinstance(base_url, str) or not base_url.startswith(("http://", "https://")):
+        return jsonify({"message": "'base_url' must be an http(s) URL"}), 400
+
+    if location is not None:
+        mids = _location_mids(location.strip())
+    mids = list(dict.fromkeys(mids))  # 중복 제거 (순서 유지)
+    if len(mids) > label_sheets.max_count:
+        return jsonify({"message": f"Too many labels (max {label_sheets.max_count})"}), 400
+    labels = _label_rows(mids)
+    if not labels:
+        return jsonify({"message": "No MSDS found"}), 404
+    # PDF 생성 동안 연결을 붙잡지 않도록 풀에 반환
+    _repo().release()
+
+    try:
+        entry, body = label_sheets.get(labels, base_url)
+    except TimeoutError:
+        return jsonify({"message": "Label sheet rendering timed out"}), 503
+
+    filename = f"msds_labels_{date.today():%Y%m%d}.pdf"
+    if entry is not None:
+        response = _send_cached(entry, download_name=filename)
+    else:
+        response = send_file(io.BytesIO(body), mimetype="application/pdf", download_name=filename)
+    response.headers["X-Label-Count"] = str(len(labels))
+    return response
+
+def _location_mids(title):
+    """
+    장소 추가자료(type=1) 제목에 연결된 MSDS ID 목록을 조회하는 헬퍼 함수
+    
+    Args:
+        title (str): 장소 제목 (예: "창고A")
+        
+    Returns:
+        list: MSDS ID 목록 (mid 순)
+    """
+    rows = _repo().all(
+        """
+        SELECT DISTINCT r.mid
+        FROM msds_additional_relation r
+        JOIN msds_additional_info i ON i.aid = r.aid
+        WHERE i.type = 1 AND i.title = :title
+        ORDER BY r.mid
+        """,
+        {"title": title}
+    )
+    return [row["mid"] for row in rows]
+
+def _label_rows(mids):
+    """
+    라벨에 들어갈 MSDS 제목과 경고 표지(type=2) 이미지 경로를 일괄 조회하는 헬퍼 함수
+    
+    Args:
+        mids (list): MSDS ID 목록 (정렬 순서 유지)
+        
+    Returns:
+        list: [{mid, title, pictograms: [file_loc, ...]}, ...] (없는 mid는 제외)
+    """
+    repo = _repo()
+    rows = repo.msds_rows(mids)
+    attachments = repo.attachments_of([row["mid"] for row in rows])
+    return [
+        {
+            "mid": row["mid"],
+            "title": row["title"] or "",
+            "pictograms": [
+                att["file_loc"] for att in attachments[row["mid"]]
+                if att["type"] == 2 and att["file_loc"] and att["file_loc"] != "None"
+            ],
+        }
+        for row in rows
+    ]
+
+# 검색 대상 (meta: title/usage/mid 역색인, content: PDF 본문)
+SEARCH_SCOPES = ("meta", "content")
+
+# 2) 검색 + 페이지네이션: GET /api/msds/search?q=...&page=&per_page=&scope=
 @msds_bp.get("/search")
+@conditional_get.depends_on("msds", "msds_content")
 def search_msds():
     """
     MSDS 검색 및 페이지네이션 엔드포인트
+    검색어가 있으면 프로세스 내 바이그램 역색인으로 찾고 BM25 관련도 순으로 정렬합니다.
+    scope=content이면 PDF에서 추출한 본문(CAS 번호, 유해·위험 문구 등)을 검색합니다.
     
     Query Parameters:
         q (str, optional): 검색어
-        page (int, optional): 페이지 번호 (기본값: 1)
+        scope (str, optional): 검색 대상 meta(title/usage/mid)|content(PDF 본문) (기본값: meta)
+        page (int, optional): 페이지 번호 (기본값: 1, cursor가 없을 때만 사용)
+        cursor (str, optional): 이전 응답의 next_cursor/prev_cursor
         per_page (int, optional): 페이지당 항목 수 (기본값: 20, 최대: 100)
+        total (str, optional): 전체 개수 계산 방식 exact|estimate|none (기본값: exact)
         
     Returns:
         JSON: 검색 결과와 페이지네이션 정보
@@ -592,39 +1643,88 @@ def search_msds():
     q = (request.args.get("q") or "").strip()
     page = max(int(request.args.get("page", 1)), 1)  # 최소 1페이지
     per_page = min(max(int(request.args.get("per_page", 12)), 1), 100)  # 1~100개 제한 (기본값: 12개)
+    cursor = request.args.get("cursor")
+    total_mode = (request.args.get("total") or "exact").lower()
+    if total_mode not in TOTAL_MODES:
+        return jsonify({"message": "'total' must be one of exact, estimate, none"}), 400
+    scope = (request.args.get("scope") or "meta").lower()
+    if scope not in SEARCH_SCOPES:
+        return jsonify({"message": "'scope' must be one of meta, content"}), 400
 
-    # LIKE 검색 대상: title, usage, mid
-    like = f"%{q}%"
-    base_sql = """
-        FROM msds
-        WHERE (:q = '' OR title LIKE :like OR `usage` LIKE :like OR mid LIKE :like)
-    """
-
-    # 전체 검색 결과 개수 조회
-    cnt_sql = text(f"SELECT COUNT(*) AS cnt {base_sql}")
-    total = db.session.execute(cnt_sql, {"q": q, "like": like}).scalar() or 0
-
-    # 페이지네이션된 결과 조회
-    off = (page - 1) * per_page  # 오프셋 계산
-    rows_sql = text(f"""
-        SELECT mid, title, `usage`, file_loc, is_osh, is_chr
-        {base_sql}
-        ORDER BY mid
-        LIMIT :limit OFFSET :offset
-    """)
-    rows = db.session.execute(
-        rows_sql,
-        {"q": q, "like": like, "limit": per_page, "offset": off}
-    ).mappings().all()
+    if q:
+        # 검색 색인 조회 (meta: title/usage/mid, content: PDF 본문 - 관련도 순)
+        # 커서는 마지막 항목의 (관련도, mid) 키이므로 뒤 페이지도 앞 페이지와 같은 비용으로 조회
+        index = content_index if scope == "content" else search_index
+        index.ensure_fresh(db.engine)
+        try:
+            # 검색 커서는 [관련도, mid] 키이며 검색 범위(meta/content)마다 따로 발급됨
+            key, direction = decode_cursor(cursor, scope, is_score_key) if cursor else (None, NEXT)
+        except ValueError:
+            return jsonify({"message": "Invalid cursor"}), 400
+        total, hits = index.search(
+            q,
+            offset=0 if cursor else (page - 1) * per_page,
+            limit=per_page + 1,
+            after=key if direction == NEXT else None,
+            before=key if direction == PREV else None
+        )
+        if direction == PREV:
+            hits.reverse()  # slice_page는 이전 방향 결과를 역순으로 받음
+        hits, next_cursor, prev_cursor = slice_page(
+            hits, per_page, direction, bool(cursor) or page > 1, lambda h: h[1], scope
+        )
+        items = _fetch_msds_by_mids([mid for mid, _key in hits])
+        if scope == "content":
+            # 본문 검색은 일치 위치 주변 문구를 함께 반환
+            for item in items:
+                item["snippet"] = content_index.snippet(item["mid"], q)
+        # 색인 검색은 전체 일치 수를 함께 계산하므로 추가 비용이 없음
+        if total_mode == "none":
+            total = None
+    else:
+        # 검색어가 없으면 전체 목록을 mid 순으로 반환 (mid 키셋 페이지네이션)
+        try:
+            window = _page_window("mid", page, per_page)
+        except ValueError:
+            return jsonify({"message": "Invalid cursor"}), 400
+        total = _count_msds(total_mode)
+        rows = _repo().all(
+            f"""
+                SELECT mid, title, `usage`, file_loc, is_osh, is_chr
+                FROM msds
+                {window["where"]}
+                ORDER BY mid {window["order"]}
+                LIMIT :limit OFFSET :offset
+            """,
+            window["params"]
+        )
+        items, next_cursor, prev_cursor = slice_page(
+            rows, per_page, window["direction"], window["has_previous"], lambda r: r["mid"], LIST_CURSOR_SCOPE
+        )
 
     # 검색 결과와 페이지네이션 정보 반환
     return jsonify({
-        "items": [dict(r) for r in rows],  # 검색 결과 항목들
-        "page": page,                       # 현재 페이지 번호
-        "per_page": per_page,               # 페이지당 항목 수
-        "total": total                      # 전체 검색 결과 개수
+        "items": items,                         # 검색 결과 항목들
+        "page": None if cursor else page,       # 현재 페이지 번호 (커서 조회 시 null)
+        "per_page": per_page,                   # 페이지당 항목 수
+        "total": total,                         # 전체 검색 결과 개수 (total=none이면 null)
+        "has_more": next_cursor is not None,    # 다음 페이지 존재 여부
+        "next_cursor": next_cursor,             # 다음 페이지 커서
+        "prev_cursor": prev_cursor              # 이전 페이지 커서
     })
 
+def _fetch_msds_by_mids(mids):
+    """
+    여러 MSDS를 한 번의 IN 쿼리로 조회하여 주어진 mid 순서대로 반환하는 헬퍼 함수 (응답 컬럼만 포함)
+    
+    Args:
+        mids (list): MSDS ID 목록 (정렬 순서 유지)
+        
+    Returns:
+        list: MSDS 딕셔너리 리스트
+    """
+    return [{column: row[column] for column in EXPORT_COLUMNS} for row in _repo().msds_rows(mids)]
+
 # 3) PDF 다운로드 (Supabase Storage 서명 URL 발급 후 리다이렉트)
 # GET /api/msds/<mid>/download
 @msds_bp.get("/<mid>/download")
@@ -642,11 +1742,10 @@ def download_msds(mid):
     Returns:
         Redirect: Supabase 서명된 URL로 리다이렉트
     """
-    # 데이터베이스에서 파일 경로 조회
-    row = db.session.execute(
-        text("SELECT file_loc FROM msds WHERE mid = :mid"),
-        {"mid": mid}
-    ).mappings().first()
+    # 데이터베이스에서 파일 경로 조회 (이후 스토리지 요청 동안 연결을 붙잡지 않도록 반환)
+    repo = _repo()
+    row = repo.msds.load(mid)
+    repo.release()
 
     # MSDS 또는 파일이 존재하지 않는 경우 404 에러
     if not row or not row["file_loc"]:
@@ -656,14 +1755,9 @@ def download_msds(mid):
 
     # Supabase 설정값 가져오기
     bucket = current_app.config.get("SUPABASE_BUCKET", "msds")
-    expires_in = int(current_app.config.get("SUPABASE_SIGNED_URL_EXPIRES", 300))
-
-    # Supabase 클라이언트 생성
-    sb = _get_supabase()
 
-    # 서명된 URL 생성
-    signed = sb.storage.from_(bucket).create_signed_url(file_path, expires_in)
-    signed_url = signed.get("signed_url") or signed.get("signedURL")
+    # 서명된 URL 조회 (캐시에 없을 때만 Supabase에 서명 요청)
+    signed_url = signed_url_cache.get(bucket, file_path)
 
     # 서명된 URL 생성 실패 시 404 에러
     if not signed_url:
@@ -677,23 +1771,24 @@ def download_msds(mid):
     # 302 리다이렉트 (클라이언트가 Supabase 서명 URL로 직접 다운로드)
     return redirect(signed_url, code=302)
 
-# 3-2) PDF 다운로드 (직접 파일 반환)   GET /api/msds/<mid>/pdf
+# 3-2) PDF 다운로드 (직접 파일 반환, 스트리밍 + Range 지원)   GET /api/msds/<mid>/pdf
 @msds_bp.get("/<mid>/pdf")
 def download_pdf_direct(mid):
     """
     MSDS PDF 파일을 직접 다운로드하는 엔드포인트
+    스토리지에서 청크 단위로 읽어 바로 전달하므로 파일 크기와 관계없이 워커 메모리가 일정합니다.
+    Range 요청(206)을 지원하여 브라우저 PDF 뷰어가 필요한 부분만 가져갈 수 있습니다.
     
     Args:
         mid (str): MSDS ID
         
     Returns:
-        File: PDF 파일 직접 반환
+        File: PDF 파일 스트림 (200/206/304/416)
     """
-    # 데이터베이스에서 파일 경로 조회
-    row = db.session.execute(
-        text("SELECT file_loc, title FROM msds WHERE mid = :mid"),
-        {"mid": mid}
-    ).mappings().first()
+    # 데이터베이스에서 파일 경로 조회 (이후 스토리지 요청 동안 연결을 붙잡지 않도록 반환)
+    repo = _repo()
+    row = repo.msds.load(mid)
+    repo.release()
 
     # MSDS 또는 파일이 존재하지 않는 경우 404 에러
     if not row or not row["file_loc"]:
@@ -703,31 +1798,78 @@ def download_pdf_direct(mid):
 
     # Supabase 설정값 가져오기
     bucket = current_app.config.get("SUPABASE_BUCKET", "msds")
+    chunk_size = int(current_app.config.get("STORAGE_STREAM_CHUNK_SIZE", 64 * 1024))
+
+    # 파일명 생성
+    filename = f"{row['title']}_MSDS.pdf"
 
-    # Supabase 클라이언트 생성
-    sb = _get_supabase()
+    # 로컬 캐시에 있으면 스토리지에 접근하지 않고 디스크에서 바로 전송
+    cached = content_cache.lookup(bucket, file_path)
+    if cached:
+        cached.content_type = "application/pdf"
+        return _send_cached(cached, download_name=filename, as_attachment=True)
+
+    # 브라우저의 Range/조건부 요청 헤더를 스토리지로 그대로 전달
+    # (압축 없이 받아야 Content-Length/Content-Range가 실제 바이트와 일치)
+    forward_headers = {"Accept-Encoding": "identity"}
+    for name in ("Range", "If-Range", "If-None-Match", "If-Modified-Since"):
+        if name in request.headers:
+            forward_headers[name] = request.headers[name]
 
     try:
-        # Supabase에서 파일 내용을 직접 가져와서 반환
-        file_response = sb.storage.from_(bucket).download(file_path)
-        
-        # 파일명 생성
-        filename = f"{row['title']}_MSDS.pdf"
-        
-        # 파일을 직접 반환 (다운로드)
-        from flask import Response
-        return Response(
-            file_response,
-            mimetype='application/pdf',
-            headers={
-                'Content-Disposition': f'attachment; filename="{filename}"',
-                'Content-Type': 'application/pdf'
-            }
-        )
-    except Exception as e:
-        # 직접 다운로드 실패 시 기존 방식으로 대체
+        # 본문을 메모리에 올리지 않고 스트리밍 응답으로 열기
+        upstream = supabase_registry.open_stream(bucket, file_path, forward_headers)
+    except Exception:
+        # 스토리지 연결 실패 시 기존 방식(서명 URL 리다이렉트)으로 대체
         return download_msds(mid)
 
+    if upstream.status_code >= 400 and upstream.status_code != 416:
+        # 스토리지 오류 시 기존 방식으로 대체
+        upstream.close()
+        return download_msds(mid)
+
+    # 전체 파일 응답이면 전송하면서 로컬 캐시에도 기록 (Range 응답은 캐시하지 않음)
+    writer = None
+    if upstream.status_code == 200 and "Range" not in request.headers:
+        writer = content_cache.writer(bucket, file_path, "application/pdf")
+
+    # 스토리지 응답 헤더 중 캐시/범위 관련 헤더만 전달
+    headers = {
+        'Content-Disposition': f'attachment; filename="{filename}"',
+        'Accept-Ranges': 'bytes'
+    }
+    for name in ("Content-Length", "Content-Range", "ETag", "Last-Modified"):
+        if name in upstream.headers:
+            headers[name] = upstream.headers[name]
+
+    def generate():
+        """스토리지 응답을 청크 단위로 전달하는 제너레이터 (끝까지 전송된 경우에만 캐시 반영)"""
+        completed = False
+        try:
+            for chunk in upstream.iter_raw(chunk_size):
+                if writer:
+                    writer.write(chunk)
+                yield chunk
+            completed = True
+        finally:
+            upstream.close()
+            if writer:
+                if completed:
+                    writer.commit()
+                else:
+                    writer.discard()
+
+    response = Response(
+        generate(),
+        status=upstream.status_code,
+        mimetype='application/pdf',
+        headers=headers,
+        direct_passthrough=True
+    )
+    # 클라이언트가 중간에 연결을 끊어도 스토리지 연결이 풀로 반환되도록 처리
+    response.call_on_close(upstream.close)
+    return response
+
 # 4) 추가자료 이미지 다운로드 (Supabase Storage 서명 URL 발급 후 리다이렉트)
 # GET /api/msds/<mid>/attachment/<aid>
 @msds_bp.get("/<mid>/attachment/<int:aid>")
@@ -735,24 +1877,22 @@ def download_attachment(mid, aid):
     """
     MSDS 추가자료(이미지)를 다운로드하는 엔드포인트
     Supabase Storage에서 서명된 URL을 생성하여 리다이렉트합니다.
+    w를 주면 축소한 변형을 Accept 헤더에 따라 WebP 또는 PNG로 반환합니다.
     
     Args:
         mid (str): MSDS ID
         aid (int): 추가자료 ID
         
+    Query Parameters:
+        w (int, optional): 최대 너비(px) - IMAGE_VARIANT_WIDTHS 중 같거나 큰 가장 작은 값으로 맞춤
+        
     Returns:
         Redirect: Supabase 서명된 URL로 리다이렉트
     """
-    # 데이터베이스에서 추가자료 정보 조회
-    row = db.session.execute(
-        text("""
-            SELECT i.file_loc, i.title 
-            FROM msds_additional_info i
-            JOIN msds_additional_relation r ON i.aid = r.aid
-            WHERE r.mid = :mid AND i.aid = :aid
-        """),
-        {"mid": mid, "aid": aid}
-    ).mappings().first()
+    # 데이터베이스에서 추가자료 정보 조회 (이후 스토리지 요청 동안 연결을 붙잡지 않도록 반환)
+    repo = _repo()
+    row = next((att for att in repo.attachments_of([mid])[mid] if att["aid"] == aid), None)
+    repo.release()
 
     # 추가자료가 존재하지 않는 경우 404 에러
     if not row or not row["file_loc"] or row["file_loc"] == "None":
@@ -762,18 +1902,40 @@ def download_attachment(mid, aid):
 
     # Supabase 설정값 가져오기
     bucket = current_app.config.get("SUPABASE_BUCKET", "msds")
-    expires_in = int(current_app.config.get("SUPABASE_SIGNED_URL_EXPIRES", 300))
 
-    # Supabase 클라이언트 생성
-    sb = _get_supabase()
+    # 축소 변형 요청 (한 번 만든 변형은 로컬 캐시에서 제공, 만들 수 없으면 원본 제공)
+    width = request.args.get("w", type=int)
+    if "w" in request.args and (width is None or width < 1):
+        return jsonify({"message": "'w' must be a positive integer"}), 400
+    response = None
+    if width and image_variants.available:
+        fmt = image_variants.choose_format(request.accept_mimetypes)
+        variant = image_variants.get(bucket, file_path, image_variants.snap_width(width), fmt)
+        if variant:
+            response = _send_cached(variant)
 
-    # 서명된 URL 생성
-    signed = sb.storage.from_(bucket).create_signed_url(file_path, expires_in)
-    signed_url = signed.get("signed_url") or signed.get("signedURL")
+    # 로컬 캐시에서 이미지 제공 (없으면 스토리지에서 한 번만 내려받아 저장)
+    if response is None and content_cache.enabled:
+        try:
+            cached = content_cache.fetch(bucket, file_path)
+        except Exception:
+            cached = None
+        if cached:
+            response = _send_cached(cached)
 
-    # 서명된 URL 생성 실패 시 404 에러
-    if not signed_url:
-        abort(404, description="Failed to create signed URL")
+    if response is None:
+        # 서명된 URL 조회 (캐시에 없을 때만 Supabase에 서명 요청)
+        signed_url = signed_url_cache.get(bucket, file_path)
+
+        # 서명된 URL 생성 실패 시 404 에러
+        if not signed_url:
+            abort(404, description="Failed to create signed URL")
+
+        # 302 리다이렉트 (클라이언트가 Supabase 서명 URL로 직접 이미지 로드)
+        response = redirect(signed_url, code=302)
 
-    # 302 리다이렉트 (클라이언트가 Supabase 서명 URL로 직접 이미지 로드)
-    return redirect(signed_url, code=302)
\ No newline at end of file
+    if width:
+        # 같은 ?w= URL도 Accept(WebP/PNG)와 변형 생성 성공 여부에 따라 응답이 달라지므로
+        # 원본/리다이렉트로 대체한 응답도 공유 캐시가 모든 클라이언트에 재사용하지 않도록 표시
+        response.vary.add("Accept")
+    return response
\ No newline at end of file
@@ -1,5 +1,5 @@
-from msds_flask_test import app
+from app import create_app
 
 if __name__ == "__main__":
+    app = create_app()
     app.run(host="0.0.0.0", port=5001, debug=True)
-
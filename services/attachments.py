@@ -0,0 +1,89 @@
+"""
+첨부파일(추가자료) 로더 모듈
+여러 MSDS의 첨부파일을 한 번의 IN 쿼리로 읽어 타입이 있는 객체로 반환합니다.
+
+기존 GROUP_CONCAT 문자열 결합 방식은 group_concat_max_len에서 잘리고, 제목에 ':'나 '|'가 있으면
+파싱이 깨지며, LIMIT 전에 전체 조인을 GROUP BY 했습니다.
+이 모듈은 먼저 한 페이지의 MSDS를 조회한 뒤, 그 mid들의 첨부파일만 관계형으로 읽습니다.
+"""
+
+from sqlalchemy import bindparam, text
+
+# IN 절 하나에 넣을 최대 mid 수 (너무 긴 쿼리 방지)
+IN_CHUNK_SIZE = 500
+
+# 첨부파일 조회 SQL (aid 순 - 최신순이 필요한 호출 측은 Repository.attachments_of(newest_first=True)에서 정렬)
+ATTACHMENTS_SQL = text("""
+    SELECT r.mid, i.aid, i.title, i.type, i.file_loc, r.createdAt
+    FROM msds_additional_relation AS r
+    JOIN msds_additional_info AS i ON i.aid = r.aid
+    WHERE r.mid IN :mids
+    ORDER BY r.mid, i.aid
+""").bindparams(bindparam("mids", expanding=True))
+
+
+class Attachment:
+    """
+    첨부파일 클래스
+    msds_additional_info 한 행과 연결 시각을 나타냅니다.
+    """
+
+    __slots__ = ("aid", "title", "type", "file_loc", "created_at")
+
+    def __init__(self, aid, title, type, file_loc, created_at=None):
+        self.aid = aid                  # 추가자료 ID
+        self.title = title              # 제목 (예: 보호장구명, 장소명)
+        self.type = type                # 타입 (0: 보호장구, 1: 장소, 2: 경고표지)
+        self.file_loc = file_loc        # 이미지 파일 경로 (없으면 None)
+        self.created_at = created_at    # MSDS와 연결된 시각
+
+    def to_dict(self):
+        """
+        첨부파일 객체를 딕셔너리로 변환하는 메서드
+
+        Returns:
+            dict: 첨부파일 데이터를 담은 딕셔너리 (createdAt은 API 응답 컬럼명 그대로 유지)
+        """
+        return {
+            "aid": self.aid,
+            "title": self.title,
+            "type": self.type,
+            "file_loc": self.file_loc,
+            "createdAt": self.created_at,
+        }
+
+
+def load_attachments(con, mids):
+    """
+    여러 MSDS의 첨부파일을 일괄 조회하는 함수
+
+    Args:
+        con: SQLAlchemy 연결 또는 세션
+        mids (list): MSDS ID 목록
+
+    Returns:
+        dict: MSDS ID -> Attachment 리스트 (첨부파일이 없는 mid는 빈 리스트, aid 순)
+    """
+    result = {mid: [] for mid in mids}
+    if not result:
+        return result
+
+    unique = list(result)
+    for start in range(0, len(unique), IN_CHUNK_SIZE):
+        chunk = unique[start:start + IN_CHUNK_SIZE]
+        # 확장 IN 파라미터를 사용하므로 mid 개수와 관계없이 같은 SQL 문을 재사용
+        rows = con.execute(ATTACHMENTS_SQL, {"mids": chunk})
+        seen = set()
+        for mid, aid, title, type_val, file_loc, created_at in rows:
+            # 관계 테이블에 같은 연결이 중복되어 있어도 한 번만 반환 (기존 DISTINCT와 동일)
+            if (mid, aid) in seen:
+                continue
+            seen.add((mid, aid))
+            result[mid].append(Attachment(
+                aid,
+                title,
+                int(type_val) if type_val is not None else None,
+                file_loc or None,
+                created_at
+            ))
+    return result
@@ -0,0 +1,130 @@
+"""
+응답 압축 모듈
+Accept-Encoding 협상에 따라 큰 응답 본문을 brotli 또는 gzip으로 압축하는 미들웨어를 정의합니다.
+
+한글이 많은 JSON 목록은 압축률이 높아 느린 현장 Wi-Fi에서 전송 시간을 크게 줄일 수 있습니다.
+brotli 패키지는 선택 의존성이며, 없으면 gzip만 사용합니다.
+"""
+
+import gzip
+
+from flask import request
+
+try:
+    import brotli  # 선택 의존성 (pip install brotli)
+except ImportError:  # pragma: no cover
+    brotli = None
+
+# 압축 대상 MIME 타입 (PDF/이미지는 이미 압축되어 있으므로 제외)
+DEFAULT_MIMETYPES = ("application/json", "text/html", "text/plain", "text/csv", "text/yaml",
+                     "application/x-ndjson", "application/javascript", "text/css")
+
+
+class Compressor:
+    """
+    응답 압축 클래스
+
+    - after_request에서 크기가 임계값 이상이고 압축 가능한 MIME 타입인 응답만 압축합니다.
+    - 클라이언트가 br을 허용하고 brotli가 설치되어 있으면 br, 아니면 gzip을 사용합니다.
+    - 스트리밍/파일 응답(direct_passthrough)과 이미 인코딩된 응답은 건드리지 않습니다.
+    """
+
+    def __init__(self, app=None):
+        self.min_size = 1024
+        self.gzip_level = 6
+        self.brotli_level = 4
+        self.mimetypes = DEFAULT_MIMETYPES
+        self._stats = {"compressed": 0, "bytes_in": 0, "bytes_out": 0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Flask 애플리케이션에 응답 압축 훅을 등록하는 함수
+
+        Args:
+            app (Flask): Flask 애플리케이션 인스턴스
+        """
+        self.min_size = int(app.config.get("COMPRESS_MIN_SIZE", 1024))
+        self.gzip_level = int(app.config.get("COMPRESS_LEVEL", 6))
+        self.brotli_level = int(app.config.get("COMPRESS_BR_LEVEL", 4))
+        app.extensions["compressor"] = self
+        # 0 이하이면 압축 비활성화
+        if self.gzip_level > 0:
+            app.after_request(self._after_request)
+
+    def choose_encoding(self, accept_encodings):
+        """
+        Accept-Encoding 헤더에서 사용할 인코딩을 고르는 함수
+
+        Args:
+            accept_encodings: werkzeug Accept 객체 (request.accept_encodings)
+
+        Returns:
+            str or None: "br", "gzip" 또는 None (압축하지 않음)
+        """
+        if brotli is not None and accept_encodings["br"] > 0:
+            return "br"
+        if accept_encodings["gzip"] > 0:
+            return "gzip"
+        return None
+
+    def compress(self, data, encoding):
+        """
+        바이트를 지정한 인코딩으로 압축하는 함수
+
+        Args:
+            data (bytes): 원본 바이트
+            encoding (str): "br" 또는 "gzip"
+
+        Returns:
+            bytes: 압축된 바이트
+        """
+        if encoding == "br":
+            return brotli.compress(data, quality=self.brotli_level)
+        # mtime=0: 같은 본문은 항상 같은 압축 결과 (캐시/비교에 유리)
+        return gzip.compress(data, compresslevel=self.gzip_level, mtime=0)
+
+    def _after_request(self, response):
+        """조건에 맞는 응답 본문을 압축하는 훅"""
+        if (
+            response.status_code < 200 or response.status_code >= 300 or response.status_code == 204
+            or response.direct_passthrough or response.is_streamed
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in self.mimetypes
+        ):
+            return response
+
+        # 같은 URL도 Accept-Encoding에 따라 본문이 달라지므로 캐시에 알림
+        response.vary.add("Accept-Encoding")
+        if (response.content_length or 0) < self.min_size:
+            return response
+        encoding = self.choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        data = response.get_data()
+        compressed = self.compress(data, encoding)
+        if len(compressed) >= len(data):
+            return response
+        response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+        # 압축된 표현은 바이트가 달라지므로 강한 ETag는 약한 ETag로 변경
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        self._stats["compressed"] += 1
+        self._stats["bytes_in"] += len(data)
+        self._stats["bytes_out"] += len(compressed)
+        return response
+
+    def stats(self):
+        """
+        압축 통계를 반환하는 함수
+
+        Returns:
+            dict: 압축한 응답 수, 원본/압축 바이트 합계, brotli 사용 가능 여부
+        """
+        stats = dict(self._stats)
+        stats["brotli"] = brotli is not None
+        return stats
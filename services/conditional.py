@@ -0,0 +1,136 @@
+"""
+조건부 GET 미들웨어 모듈
+테이블 버전 카운터로 읽기 응답에 약한 ETag와 Last-Modified를 붙이고,
+클라이언트의 검증자가 일치하면 SQL을 실행하기 전에 304를 반환합니다.
+
+ETag는 응답 본문이 아니라 (의존 테이블 버전 + 요청 URL)에서 계산하므로
+검증에 파일 몇 개를 읽는 비용만 듭니다.
+"""
+
+import hashlib
+import time
+from email.utils import formatdate
+
+from flask import current_app, g, request
+
+# include에 이 항목이 있으면 검증자를 붙이지 않음
+# (include=signed_urls 응답의 서명 URL은 테이블이 바뀌지 않아도 만료되므로 304로 재사용하면 안 됨)
+BYPASS_INCLUDES = ("signed_urls",)
+
+
+class ConditionalGet:
+    """
+    조건부 GET 미들웨어 클래스
+
+    - depends_on(*tables) 데코레이터로 뷰가 의존하는 테이블을 선언합니다.
+    - before_request에서 현재 버전으로 ETag를 계산하고 If-None-Match/If-Modified-Since가
+      일치하면 뷰를 실행하지 않고 304를 반환합니다.
+    - after_request에서 200 응답에 ETag, Last-Modified, Cache-Control: no-cache를 붙입니다.
+    - 버전은 뷰 실행 전에 읽으므로, 그 사이에 쓰기가 일어나도 ETag가 본문보다 새로울 수는 없습니다
+      (다음 요청에서 버전이 달라져 200으로 다시 받음).
+    - Last-Modified는 초 단위이므로 마지막 쓰기와 같은 초에는 보내지 않습니다. 그 초가 지난 뒤에 받은
+      Last-Modified만 If-Modified-Since로 돌아오므로, 같은 초 안의 이후 쓰기를 304로 놓치지 않습니다.
+    """
+
+    def __init__(self, versions, app=None):
+        self._versions = versions
+        self._stats = {"not_modified": 0, "tagged": 0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Flask 애플리케이션에 조건부 GET 훅을 등록하는 함수
+
+        Args:
+            app (Flask): Flask 애플리케이션 인스턴스
+        """
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.extensions["conditional_get"] = self
+
+    @staticmethod
+    def depends_on(*tables):
+        """
+        뷰 함수가 의존하는 테이블을 선언하는 데코레이터
+
+        Args:
+            *tables (str): 응답 내용이 의존하는 테이블명들
+
+        Returns:
+            callable: 테이블 정보가 기록된 원래 뷰 함수
+        """
+        def decorator(view):
+            view._conditional_tables = tables
+            return view
+        return decorator
+
+    def _validators(self, app):
+        """
+        현재 요청의 (ETag 값, Last-Modified 시각)을 계산하는 함수 (대상이 아니면 None)
+        마지막 쓰기와 같은 초이면 그 초에 쓰기가 더 있을 수 있으므로 Last-Modified는 None입니다.
+        """
+        if request.method not in ("GET", "HEAD"):
+            return None
+        view = app.view_functions.get(request.endpoint)
+        tables = getattr(view, "_conditional_tables", None)
+        if not tables:
+            return None
+        includes = {v.strip() for v in request.args.get("include", "").split(",")}
+        if any(name in includes for name in BYPASS_INCLUDES):
+            return None
+        token = self._versions.token(*tables)
+        digest = hashlib.sha1(f"{token}|{request.full_path}".encode("utf-8")).hexdigest()[:20]
+        last_modified = self._versions.last_modified(*tables)
+        if int(time.time()) <= int(last_modified):
+            last_modified = None
+        return digest, last_modified
+
+    def _before_request(self):
+        """검증자가 일치하면 뷰 실행 전에 304 응답을 반환하는 훅"""
+        validators = self._validators(current_app)
+        if validators is None:
+            return None
+        g.conditional_validators = validators
+        etag, last_modified = validators
+
+        # If-None-Match가 있으면 If-Modified-Since보다 우선 (RFC 9110)
+        if request.if_none_match:
+            matched = request.if_none_match.contains_weak(etag)
+        elif request.if_modified_since:
+            # 이번 초에 바뀌었으면(None) 초 단위 비교로는 알 수 없으므로 200
+            matched = last_modified is not None and int(last_modified) <= request.if_modified_since.timestamp()
+        else:
+            matched = False
+        if not matched:
+            return None
+
+        self._stats["not_modified"] += 1
+        response = current_app.response_class(status=304)
+        self._set_headers(response, etag, last_modified)
+        return response
+
+    def _after_request(self, response):
+        """200 응답에 검증자 헤더를 붙이는 훅"""
+        validators = g.pop("conditional_validators", None)
+        if validators is not None and response.status_code == 200 and "ETag" not in response.headers:
+            self._stats["tagged"] += 1
+            self._set_headers(response, *validators)
+        return response
+
+    @staticmethod
+    def _set_headers(response, etag, last_modified):
+        response.set_etag(etag, weak=True)
+        if last_modified is not None:
+            response.headers["Last-Modified"] = formatdate(int(last_modified), usegmt=True)
+        # 브라우저가 저장은 하되 매번 검증자로 재검증하도록 설정
+        response.headers["Cache-Control"] = "no-cache"
+
+    def stats(self):
+        """
+        미들웨어 통계를 반환하는 함수
+
+        Returns:
+            dict: 304 응답 수와 검증자를 붙인 200 응답 수
+        """
+        return dict(self._stats)
@@ -0,0 +1,365 @@
+"""
+로컬 콘텐츠 캐시 모듈
+Supabase 스토리지 객체(PDF, 첨부 이미지)를 로컬 디스크에 보관하는 읽기 관통(read-through) 캐시를 정의합니다.
+
+MSDS PDF와 픽토그램은 거의 바뀌지 않으므로 한 번 내려받은 파일은 디스크에서 바로 제공하고
+(send_file → wsgi.file_wrapper/sendfile), 스토리지에는 캐시 미스일 때만 접근합니다.
+
+- 본문 파일은 "<키>-<콘텐츠 해시>" 이름으로 저장하고, 메타데이터(<키>.json)가 현재 본문 파일을 가리킵니다.
+  교체는 새 본문 기록 → 메타데이터 교체(os.replace) 순서이므로 읽는 쪽은 항상 서로 맞는 본문/메타데이터를 봅니다.
+- 크기 제한(CONTENT_CACHE_MAX_BYTES)은 모든 워커가 공유하는 디렉토리 전체에 적용됩니다. 각 워커는 채울 때
+  RESCAN_SECONDS마다 디렉토리를 다시 스캔하여 다른 워커가 채운 파일까지 합친 크기로 LRU 제거를 하므로,
+  스캔 사이에 다른 워커가 채운 양만큼 잠시 넘을 수 있습니다.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+# 채울 때 캐시 디렉토리를 다시 스캔하는 최소 간격(초) - 다른 워커가 채운/지운 파일을 크기 합계에 반영
+RESCAN_SECONDS = 60
+
+
+class CacheEntry:
+    """
+    캐시 항목 클래스
+    디스크에 저장된 객체 파일과 메타데이터를 나타냅니다.
+    """
+
+    __slots__ = ("file_path", "size", "etag", "content_type")
+
+    def __init__(self, file_path, size, etag, content_type):
+        self.file_path = file_path        # 캐시된 객체 파일 경로
+        self.size = size                  # 파일 크기 (바이트)
+        self.etag = etag                  # 콘텐츠 해시 기반 ETag
+        self.content_type = content_type  # 원본 Content-Type
+
+
+class CacheWriter:
+    """
+    캐시 쓰기 클래스
+    임시 파일에 청크 단위로 기록한 뒤 commit() 시 os.replace로 원자적으로 교체합니다.
+    중간에 실패하거나 discard()되면 임시 파일만 삭제되어 깨진 파일이 캐시에 남지 않습니다.
+    """
+
+    def __init__(self, cache, key, content_type):
+        self._cache = cache
+        self._key = key
+        self._content_type = content_type
+        self._hash = hashlib.sha1()
+        self._size = 0
+        fd, self._tmp_path = tempfile.mkstemp(dir=cache.directory, prefix=".tmp-")
+        self._fh = os.fdopen(fd, "wb")
+        self._closed = False
+
+    def write(self, chunk):
+        """청크를 임시 파일에 기록하는 함수"""
+        self._fh.write(chunk)
+        self._hash.update(chunk)
+        self._size += len(chunk)
+
+    def commit(self):
+        """
+        임시 파일을 캐시 파일로 원자적으로 교체하는 함수
+
+        Returns:
+            CacheEntry: 저장된 캐시 항목
+        """
+        if self._closed:
+            return None
+        self._fh.close()
+        self._closed = True
+        return self._cache._commit(self._key, self._tmp_path, self._size,
+                                   self._hash.hexdigest(), self._content_type)
+
+    def discard(self):
+        """기록 중인 임시 파일을 버리는 함수"""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._fh.close()
+        finally:
+            try:
+                os.remove(self._tmp_path)
+            except OSError:
+                pass
+
+
+class ContentCache:
+    """
+    스토리지 객체 로컬 디스크 캐시 클래스
+
+    - 전체 크기를 바이트 단위로 제한하고, 초과 시 가장 오래 사용되지 않은 파일부터 제거합니다 (LRU).
+    - 쓰기는 임시 파일 + os.replace로 원자적으로 처리합니다.
+    - 파일 경로(file_loc)가 바뀌거나 삭제되면 invalidate()로 항목을 제거합니다.
+    """
+
+    def __init__(self, registry, app=None):
+        self._registry = registry
+        self._lock = threading.Lock()
+        self._index = OrderedDict()  # 키 -> 파일 크기 (LRU 순서)
+        self._total = 0
+        self._loaded = False
+        self._scanned_at = 0.0
+        self.directory = None
+        self.max_bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "fills": 0, "invalidations": 0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Flask 애플리케이션에 콘텐츠 캐시를 등록하는 함수
+
+        Args:
+            app (Flask): Flask 애플리케이션 인스턴스
+        """
+        self.directory = os.path.abspath(app.config.get("CONTENT_CACHE_DIR") or
+                                         os.path.join(app.instance_path, "content_cache"))
+        self.max_bytes = int(app.config.get("CONTENT_CACHE_MAX_BYTES", 1024 * 1024 * 1024))
+        self._loaded = False
+        app.extensions["content_cache"] = self
+
+    @property
+    def enabled(self):
+        """캐시 사용 여부 (최대 크기가 0이면 비활성화)"""
+        return bool(self.directory) and self.max_bytes > 0
+
+    @staticmethod
+    def _key(bucket, path):
+        """(bucket, path)를 파일명으로 쓸 수 있는 해시 키로 변환하는 함수"""
+        return hashlib.sha256(f"{bucket}/{path}".encode("utf-8")).hexdigest()
+
+    def _data_path(self, key, name=None):
+        """본문 파일 경로 (name은 메타데이터의 "file" 값, 이전 형식은 키 그대로)"""
+        return os.path.join(self.directory, key[:2], name or key)
+
+    def _meta_path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def _ensure_loaded(self):
+        """
+        최초 사용 시 캐시 디렉토리를 스캔하여 LRU 인덱스를 복원하는 함수
+        (재시작 후에도 기존 캐시 파일을 그대로 사용)
+        """
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            self._scan()
+            self._loaded = True
+
+    def _scan(self):
+        """
+        캐시 디렉토리의 본문 파일을 스캔하여 LRU 인덱스와 크기 합계를 다시 만드는 함수 (호출 측에서 잠금 보유)
+        다른 워커가 채운 파일도 포함되므로 크기 제한이 디렉토리 전체 기준으로 적용됩니다.
+        """
+        found = {}
+        for root, _dirs, files in os.walk(self.directory):
+            for name in files:
+                if name.startswith(".tmp-") or name.endswith(".json"):
+                    continue
+                try:
+                    st = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                # 키별로 본문 파일 크기를 합산 (교체 직후 남은 이전 본문 포함), 접근 시각은 가장 최근 값
+                key = name.split("-", 1)[0]
+                atime, size = found.get(key, (0.0, 0))
+                found[key] = (max(atime, st.st_atime), size + st.st_size)
+        # 최근 접근 순서대로 인덱스 구성 (오래된 항목이 앞쪽)
+        self._index.clear()
+        self._total = 0
+        for key, (_atime, size) in sorted(found.items(), key=lambda item: item[1][0]):
+            self._index[key] = size
+            self._total += size
+        self._scanned_at = time.monotonic()
+
+    def lookup(self, bucket, path):
+        """
+        캐시된 객체를 조회하는 함수
+
+        Args:
+            bucket (str): 스토리지 버킷명
+            path (str): 버킷 내 파일 경로
+
+        Returns:
+            CacheEntry or None: 캐시 항목 (없으면 None)
+        """
+        if not self.enabled:
+            return None
+        self._ensure_loaded()
+        key = self._key(bucket, path)
+        try:
+            with open(self._meta_path(key), "r", encoding="utf-8") as fh:
+                meta = json.load(fh)
+            data_path = self._data_path(key, meta.get("file"))
+            size = os.path.getsize(data_path)
+        except (OSError, ValueError):
+            # 다른 워커가 제거했거나 아직 기록 중인 경우 미스로 처리
+            with self._lock:
+                self._stats["misses"] += 1
+                self._drop_index(key)
+            return None
+
+        with self._lock:
+            self._stats["hits"] += 1
+            if key not in self._index:
+                self._index[key] = size
+                self._total += size
+            self._index.move_to_end(key)
+        # 다른 워커의 스캔에서도 LRU 순서가 유지되도록 접근 시각 갱신
+        now = time.time()
+        try:
+            os.utime(data_path, (now, os.stat(data_path).st_mtime))
+        except OSError:
+            pass
+        return CacheEntry(data_path, size, meta.get("etag"), meta.get("content_type"))
+
+    def writer(self, bucket, path, content_type=None):
+        """
+        캐시 쓰기 객체를 생성하는 함수 (스트리밍 응답을 캐시에 동시에 기록할 때 사용)
+
+        Args:
+            bucket (str): 스토리지 버킷명
+            path (str): 버킷 내 파일 경로
+            content_type (str, optional): 원본 Content-Type
+
+        Returns:
+            CacheWriter or None: 쓰기 객체 (캐시 비활성화 시 None)
+        """
+        if not self.enabled:
+            return None
+        self._ensure_loaded()
+        return CacheWriter(self, self._key(bucket, path), content_type)
+
+    def fetch(self, bucket, path):
+        """
+        읽기 관통 조회 함수 - 캐시에 없으면 스토리지에서 청크 단위로 내려받아 저장합니다.
+
+        Args:
+            bucket (str): 스토리지 버킷명
+            path (str): 버킷 내 파일 경로
+
+        Returns:
+            CacheEntry or None: 캐시 항목 (캐시 비활성화 또는 스토리지 오류 시 None)
+        """
+        entry = self.lookup(bucket, path)
+        if entry or not self.enabled:
+            return entry
+
+        upstream = self._registry.open_stream(bucket, path, {"Accept-Encoding": "identity"})
+        try:
+            if upstream.status_code != 200:
+                return None
+            writer = self.writer(bucket, path, upstream.headers.get("Content-Type"))
+            try:
+                for chunk in upstream.iter_raw(64 * 1024):
+                    writer.write(chunk)
+            except Exception:
+                writer.discard()
+                raise
+            return writer.commit()
+        finally:
+            upstream.close()
+
+    def _commit(self, key, tmp_path, size, digest, content_type):
+        """
+        임시 파일을 캐시에 반영하고 크기 제한에 맞게 오래된 항목을 제거하는 함수
+        본문을 콘텐츠 해시가 붙은 새 이름으로 옮긴 뒤 메타데이터를 교체하여 두 파일이 항상 같은 버전을 가리키게 합니다.
+        """
+        name = f"{key}-{digest}"
+        data_path = self._data_path(key, name)
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+        meta = {"etag": digest, "content_type": content_type, "size": size, "file": name}
+
+        fd, meta_tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(meta, fh)
+        os.replace(tmp_path, data_path)
+        os.replace(meta_tmp, self._meta_path(key))
+        # 이전 버전 본문 삭제 (이미 열어 전송 중인 응답은 열린 파일로 계속 읽음)
+        self._remove_data_files(key, keep=name)
+
+        with self._lock:
+            if time.monotonic() - self._scanned_at > RESCAN_SECONDS:
+                self._scan()  # 다른 워커가 채운 파일까지 합친 크기로 제한 적용
+            self._drop_index(key)
+            self._index[key] = size
+            self._total += size
+            self._stats["fills"] += 1
+            victims = []
+            while self._total > self.max_bytes and len(self._index) > 1:
+                victim, victim_size = self._index.popitem(last=False)
+                self._total -= victim_size
+                self._stats["evictions"] += 1
+                victims.append(victim)
+        for victim in victims:
+            self._remove_files(victim)
+        return CacheEntry(data_path, size, digest, content_type)
+
+    def _drop_index(self, key):
+        """인덱스에서 항목을 제거하는 함수 (호출 측에서 잠금 보유)"""
+        size = self._index.pop(key, None)
+        if size is not None:
+            self._total -= size
+
+    def _remove_files(self, key):
+        """캐시 파일과 메타데이터를 삭제하는 함수 (메타데이터를 먼저 지워 읽는 쪽은 미스로 처리)"""
+        try:
+            os.remove(self._meta_path(key))
+        except OSError:
+            pass
+        self._remove_data_files(key)
+
+    def _remove_data_files(self, key, keep=None):
+        """키의 본문 파일(모든 버전)을 삭제하는 함수"""
+        shard = os.path.join(self.directory, key[:2])
+        try:
+            names = os.listdir(shard)
+        except OSError:
+            return
+        for name in names:
+            if name != keep and (name == key or name.startswith(key + "-")):
+                try:
+                    os.remove(os.path.join(shard, name))
+                except OSError:
+                    pass
+
+    def invalidate(self, bucket, path):
+        """
+        특정 객체의 캐시를 제거하는 함수 (file_loc 변경/삭제 시 호출)
+
+        Args:
+            bucket (str): 스토리지 버킷명
+            path (str): 버킷 내 파일 경로
+        """
+        if not self.enabled or not path:
+            return
+        key = self._key(bucket, path)
+        with self._lock:
+            self._drop_index(key)
+            self._stats["invalidations"] += 1
+        self._remove_files(key)
+
+    def stats(self):
+        """
+        캐시 통계를 반환하는 함수
+
+        Returns:
+            dict: 적중·미스·채움·제거 횟수와 현재 사용량
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._index)
+            stats["bytes"] = self._total
+        stats["max_bytes"] = self.max_bytes
+        stats["enabled"] = self.enabled
+        return stats
@@ -0,0 +1,182 @@
+"""
+데이터베이스 연결 풀 모듈
+SQLAlchemy 엔진의 연결 풀 사용 현황을 계측합니다. 풀 설정 자체는 Config.SQLALCHEMY_ENGINE_OPTIONS(DB_POOL_*)에 있습니다.
+
+- pool_pre_ping/pool_recycle로 MySQL wait_timeout 이후 끊긴 연결을 재사용하지 않습니다.
+- 체크아웃 대기 시간과 타임아웃(풀 고갈)을 기록하는 QueuePool을 사용하여,
+  부하 시 풀이 모자라는 상황이 "원인 모를 느린 요청"이 아니라 /debug/pool 수치로 드러나게 합니다.
+"""
+
+import os
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    체크아웃 대기 시간을 기록하는 QueuePool
+    모니터는 PoolMonitor.watch()에서 연결되며, 풀을 다시 만들 때(dispose) 새 풀로 넘겨집니다.
+    """
+
+    monitor = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            if self.monitor is not None:
+                self.monitor.record_timeout(time.perf_counter() - start)
+            raise
+        if self.monitor is not None:
+            self.monitor.record_wait(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.monitor = self.monitor
+        return pool
+
+
+class PoolMonitor:
+    """
+    연결 풀 모니터 클래스
+
+    - init_app()은 db.init_app() 전에 호출하여 SQLALCHEMY_ENGINE_OPTIONS에 계측 풀 클래스를 지정합니다.
+    - watch(engine)은 엔진의 풀 이벤트(연결 생성/체크아웃/반환/무효화)를 구독합니다.
+    - 통계는 프로세스(gunicorn 워커)별입니다.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._engine = None
+        self.slow_wait = 0.1
+        self.settings = {}
+        self._reset()
+        if app is not None:
+            self.init_app(app)
+
+    def _reset(self):
+        """통계를 초기화하는 함수"""
+        self._pid = os.getpid()
+        self._stats = {
+            "connections_created": 0, "connections_closed": 0, "invalidated": 0,
+            "checkouts": 0, "checkins": 0, "timeouts": 0, "slow_waits": 0,
+        }
+        self._peak = 0
+        self._wait_count = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def init_app(self, app):
+        """
+        Flask 애플리케이션에 계측 풀 클래스를 등록하는 함수 (db.init_app() 전에 호출)
+
+        Args:
+            app (Flask): Flask 애플리케이션 인스턴스
+        """
+        uri = app.config.get("SQLALCHEMY_DATABASE_URI") or ""
+        options = dict(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+        if uri.startswith("sqlite") and (":memory:" in uri or uri.rstrip("/") == "sqlite:"):
+            # 메모리 SQLite는 단일 연결 풀(SingletonThreadPool)만 쓸 수 있으므로 풀 크기 설정 제외
+            options = {k: v for k, v in options.items() if k not in ("pool_size", "max_overflow", "pool_timeout")}
+        else:
+            options.setdefault("poolclass", InstrumentedQueuePool)
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+        self.settings = {k: v for k, v in options.items() if k.startswith("pool_") or k == "max_overflow"}
+        self.slow_wait = float(app.config.get("DB_POOL_SLOW_WAIT_MS", 100)) / 1000
+        app.extensions["pool_monitor"] = self
+
+    def watch(self, engine):
+        """
+        엔진의 연결 풀 이벤트를 구독하는 함수 (db.init_app() 후 앱 컨텍스트 안에서 호출)
+
+        Args:
+            engine: SQLAlchemy 엔진
+        """
+        self._engine = engine
+        if isinstance(engine.pool, InstrumentedQueuePool):
+            engine.pool.monitor = self
+        # 엔진에 등록한 풀 이벤트는 dispose()로 풀을 다시 만들어도 유지됨
+        event.listen(engine, "connect", lambda *_: self._count("connections_created"))
+        event.listen(engine, "close", lambda *_: self._count("connections_closed"))
+        event.listen(engine, "invalidate", lambda *_: self._count("invalidated"))
+        event.listen(engine, "soft_invalidate", lambda *_: self._count("invalidated"))
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", lambda *_: self._count("checkins"))
+
+    def _check_fork(self):
+        """fork된 워커에서는 부모 프로세스의 통계를 버리는 함수 (호출 측에서 잠금 보유)"""
+        if self._pid != os.getpid():
+            self._reset()
+
+    def _count(self, name):
+        with self._lock:
+            self._check_fork()
+            self._stats[name] += 1
+
+    def _on_checkout(self, *_):
+        checked_out = self._pool_call("checkedout")
+        with self._lock:
+            self._check_fork()
+            self._stats["checkouts"] += 1
+            if checked_out is not None and checked_out > self._peak:
+                self._peak = checked_out
+
+    def record_wait(self, seconds):
+        """체크아웃 대기 시간을 기록하는 함수 (InstrumentedQueuePool에서 호출)"""
+        with self._lock:
+            self._check_fork()
+            self._wait_count += 1
+            self._wait_total += seconds
+            if seconds > self._wait_max:
+                self._wait_max = seconds
+            if seconds >= self.slow_wait:
+                self._stats["slow_waits"] += 1
+
+    def record_timeout(self, seconds):
+        """풀 고갈로 체크아웃이 타임아웃된 경우를 기록하는 함수 (InstrumentedQueuePool에서 호출)"""
+        with self._lock:
+            self._check_fork()
+            self._stats["timeouts"] += 1
+            if seconds > self._wait_max:
+                self._wait_max = seconds
+
+    def _pool_call(self, name):
+        """QueuePool 상태 메서드를 호출하는 함수 (다른 풀 종류면 None)"""
+        method = getattr(self._engine.pool, name, None) if self._engine is not None else None
+        return method() if callable(method) else None
+
+    def stats(self):
+        """
+        연결 풀 통계를 반환하는 함수
+
+        Returns:
+            dict: 현재 상태(크기/사용 중/유휴/오버플로), 누적 카운터, 체크아웃 대기 시간, 설정값
+        """
+        with self._lock:
+            self._check_fork()
+            counters = dict(self._stats)
+            wait = {
+                "count": self._wait_count,
+                "avg_ms": round(self._wait_total / self._wait_count * 1000, 3) if self._wait_count else 0.0,
+                "max_ms": round(self._wait_max * 1000, 3),
+                "slow_threshold_ms": round(self.slow_wait * 1000, 3),
+            }
+            peak = self._peak
+        overflow = self._pool_call("overflow")  # QueuePool은 pool_size보다 적게 열렸으면 음수를 반환
+        return {
+            "pid": os.getpid(),
+            "pool_class": type(self._engine.pool).__name__ if self._engine is not None else None,
+            "size": self._pool_call("size"),
+            "checked_out": self._pool_call("checkedout"),
+            "checked_in": self._pool_call("checkedin"),
+            "overflow": max(overflow, 0) if overflow is not None else None,  # pool_size를 넘어 연 연결 수
+            "peak_checked_out": peak,
+            "counters": counters,
+            "wait": wait,
+            "settings": self.settings,
+        }
@@ -0,0 +1,360 @@
+"""
+대량 가져오기 모듈
+MSDS/추가자료 스프레드시트(xlsx, csv)를 스트리밍으로 읽어 검증한 뒤 배치 단위로 업서트합니다.
+
+- xlsx는 openpyxl 읽기 전용 모드로 한 행씩 읽으므로 파일 크기와 관계없이 메모리 사용량이 일정합니다.
+- 각 배치는 파라미터 바인딩된 executemany 한 번으로 기록합니다 (문자열 결합 SQL 없음).
+  배치가 DB 오류로 실패하면 그 배치만 롤백하고, 배치의 행을 DB 오류 사유로 거부 처리한 뒤 계속 진행합니다.
+- 키(mid/aid)가 이미 있으면 갱신, 없으면 삽입합니다 (MySQL: ON DUPLICATE KEY UPDATE, 그 외: ON CONFLICT).
+"""
+
+import csv
+import os
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+# 헤더 별칭 (한글 헤더도 인식)
+HEADER_ALIASES = {
+    "제목": "title", "물질명": "title", "용도": "usage", "파일경로": "file_loc", "파일": "file_loc",
+    "산안법": "is_osh", "화관법": "is_chr", "타입": "type", "유형": "type",
+}
+
+# 참/거짓으로 인식하는 값
+TRUE_VALUES = {"1", "true", "t", "y", "yes", "o", "예", "해당"}
+FALSE_VALUES = {"0", "false", "f", "n", "no", "x", "", "아니오", "미해당"}
+
+
+class RowError(ValueError):
+    """행 검증 실패 예외 (메시지가 거부 사유로 집계됨)"""
+
+
+def _text(max_len, required=False):
+    """최대 길이가 있는 문자열 필드 변환기를 만드는 함수"""
+    def convert(value):
+        if value is None or str(value).strip() == "":
+            if required:
+                raise RowError("required")
+            return None
+        value = str(value).strip()
+        if len(value) > max_len:
+            raise RowError(f"too long (max {max_len})")
+        return value
+    return convert
+
+
+def _int(choices=None, required=False):
+    """정수 필드 변환기를 만드는 함수 (엑셀의 1.0 같은 실수 표기도 허용)"""
+    def convert(value):
+        if value is None or str(value).strip() == "":
+            if required:
+                raise RowError("required")
+            return None
+        try:
+            number = float(str(value).strip())
+        except ValueError:
+            raise RowError("not an integer") from None
+        if not number.is_integer():
+            raise RowError("not an integer")
+        number = int(number)
+        if choices is not None and number not in choices:
+            raise RowError(f"must be one of {sorted(choices)}")
+        return number
+    return convert
+
+
+def _flag(value):
+    """참/거짓 필드 변환기 (1/0, Y/N, O/X 등)"""
+    if isinstance(value, bool):
+        return int(value)
+    normalized = "" if value is None else str(value).strip().lower()
+    if normalized.endswith(".0"):
+        normalized = normalized[:-2]
+    if normalized in TRUE_VALUES:
+        return 1
+    if normalized in FALSE_VALUES:
+        return 0
+    raise RowError("not a boolean")
+
+
+class ImportSpec:
+    """
+    가져오기 대상 테이블 정의 클래스
+
+    Args:
+        table (str): 테이블명
+        key (str): 업서트 기준 키 컬럼
+        fields (dict): 컬럼명 -> 변환/검증 함수
+        version_tables (tuple): 가져온 뒤 버전을 올릴 테이블들
+    """
+
+    def __init__(self, table, key, fields, version_tables):
+        self.table = table
+        self.key = key
+        self.fields = fields
+        self.version_tables = version_tables
+
+
+# 가져오기 대상별 정의 (컬럼 길이는 models/msds.py와 동일)
+SPECS = {
+    "msds": ImportSpec(
+        table="msds",
+        key="mid",
+        fields={
+            "mid": _text(20, required=True),
+            "title": _text(255, required=True),
+            "usage": _text(255),
+            "file_loc": _text(1024),
+            "is_osh": _flag,
+            "is_chr": _flag,
+        },
+        version_tables=("msds",),
+    ),
+    "additional": ImportSpec(
+        table="msds_additional_info",
+        key="aid",
+        fields={
+            "aid": _int(required=True),
+            "mid": _text(20),
+            "title": _text(255, required=True),
+            "type": _int(choices={0, 1, 2}),
+            "file_loc": _text(1024),
+        },
+        version_tables=("msds_additional_info",),
+    ),
+}
+
+
+def iter_rows(path, sheet=None):
+    """
+    스프레드시트를 한 행씩 읽는 제너레이터
+
+    Args:
+        path (str): .xlsx 또는 .csv 파일 경로
+        sheet (str, optional): xlsx 시트명 (없으면 첫 시트)
+
+    Yields:
+        tuple: (행 번호, 값 튜플) - 첫 항목은 헤더 행(1행)
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        with open(path, "r", encoding="utf-8-sig", newline="") as fh:
+            for number, values in enumerate(csv.reader(fh), start=1):
+                yield number, values
+        return
+    if ext not in (".xlsx", ".xlsm"):
+        raise ValueError(f"Unsupported file type: {ext} (xlsx/csv only)")
+
+    import openpyxl  # 선택 의존성 (xlsx 가져오기에만 필요)
+
+    # read_only=True: 셀을 한 행씩 읽어 전체 시트를 메모리에 올리지 않음
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+        for number, values in enumerate(worksheet.iter_rows(values_only=True), start=1):
+            yield number, values
+    finally:
+        workbook.close()
+
+
+def map_header(header, spec):
+    """
+    헤더 행을 컬럼 인덱스로 변환하는 함수
+
+    Args:
+        header (tuple): 헤더 값들
+        spec (ImportSpec): 가져오기 정의
+
+    Returns:
+        dict: 컬럼명 -> 열 인덱스
+
+    Raises:
+        ValueError: 필수 컬럼(키)이 헤더에 없는 경우
+    """
+    columns = {}
+    for index, name in enumerate(header or ()):
+        if name is None:
+            continue
+        name = str(name).strip()
+        column = HEADER_ALIASES.get(name, name.lower())
+        if column in spec.fields and column not in columns:
+            columns[column] = index
+    if spec.key not in columns:
+        raise ValueError(f"Header must include '{spec.key}' (found: {list(header or ())})")
+    return columns
+
+
+def validate_row(values, columns, spec):
+    """
+    한 행을 검증하여 DB 파라미터 딕셔너리로 변환하는 함수
+
+    Args:
+        values (tuple): 행 값들
+        columns (dict): 컬럼명 -> 열 인덱스
+        spec (ImportSpec): 가져오기 정의
+
+    Returns:
+        dict: 컬럼명 -> 변환된 값 (헤더에 없는 컬럼은 제외)
+
+    Raises:
+        RowError: 검증 실패 시 ("컬럼: 사유" 메시지)
+    """
+    row = {}
+    for column, index in columns.items():
+        value = values[index] if index < len(values) else None
+        try:
+            row[column] = spec.fields[column](value)
+        except RowError as e:
+            raise RowError(f"{column}: {e}") from None
+    # 헤더에 없는 필수 컬럼 확인 (예: title 열이 없는 파일)
+    for column, convert in spec.fields.items():
+        if column not in row:
+            try:
+                convert(None)
+            except RowError as e:
+                raise RowError(f"{column}: {e}") from None
+    return row
+
+
+def upsert_sql(dialect, spec, columns):
+    """
+    방언별 업서트 SQL을 만드는 함수
+
+    Args:
+        dialect (str): SQLAlchemy 방언명 (mysql, sqlite, postgresql 등)
+        spec (ImportSpec): 가져오기 정의
+        columns (list): 기록할 컬럼명들
+
+    Returns:
+        str: 파라미터 바인딩(:col) 형식의 INSERT ... 업서트 SQL
+    """
+    quote = (lambda c: f"`{c}`") if dialect == "mysql" else (lambda c: f'"{c}"')
+    names = ", ".join(quote(c) for c in columns)
+    values = ", ".join(f":{c}" for c in columns)
+    updates = [c for c in columns if c != spec.key]
+    sql = f"INSERT INTO {spec.table} ({names}) VALUES ({values})"
+    if dialect == "mysql":
+        if not updates:
+            return sql.replace("INSERT", "INSERT IGNORE", 1)
+        return sql + " ON DUPLICATE KEY UPDATE " + ", ".join(f"{quote(c)}=VALUES({quote(c)})" for c in updates)
+    if not updates:
+        return sql + f" ON CONFLICT ({quote(spec.key)}) DO NOTHING"
+    return sql + f" ON CONFLICT ({quote(spec.key)}) DO UPDATE SET " + ", ".join(
+        f"{quote(c)}=excluded.{quote(c)}" for c in updates)
+
+
+class ImportResult:
+    """
+    가져오기 결과 클래스
+    처리/기록/거부 행 수와 거부 사유별 집계를 담습니다.
+    """
+
+    def __init__(self, max_samples=20):
+        self.processed = 0          # 읽은 데이터 행 수
+        self.written = 0            # 기록(또는 dry-run에서 기록 예정)한 행 수
+        self.batches = 0            # 실행한 배치 수
+        self.failed_batches = 0     # DB 오류로 롤백된 배치 수
+        self.rejected = []          # (행 번호, 사유) - 최대 max_samples개 보관
+        self.rejected_count = 0     # 전체 거부 행 수
+        self.reasons = {}           # 사유 -> 건수
+        self.elapsed = 0.0          # 소요 시간(초)
+        self._max_samples = max_samples
+
+    def reject(self, number, reason):
+        """거부된 행을 기록하는 함수"""
+        self.rejected_count += 1
+        self.reasons[reason] = self.reasons.get(reason, 0) + 1
+        if len(self.rejected) < self._max_samples:
+            self.rejected.append((number, reason))
+
+
+def run_import(engine, kind, path, batch_size=1000, dry_run=False, sheet=None,
+               progress=None, reject_writer=None):
+    """
+    스프레드시트를 검증하고 배치 단위로 업서트하는 함수
+
+    Args:
+        engine: SQLAlchemy 엔진
+        kind (str): 가져오기 대상 ("msds" 또는 "additional")
+        path (str): 파일 경로
+        batch_size (int): executemany 한 번에 기록할 행 수
+        dry_run (bool): True면 검증만 하고 기록하지 않음
+        sheet (str, optional): xlsx 시트명
+        progress (callable, optional): 배치마다 호출되는 콜백 (ImportResult를 인자로 받음)
+        reject_writer (callable, optional): 거부 행마다 (행 번호, 사유, 원본 값) 로 호출되는 콜백
+
+    Returns:
+        ImportResult: 가져오기 결과
+
+    Raises:
+        ValueError: 지원하지 않는 대상/파일 형식이거나 헤더에 키 컬럼이 없는 경우
+    """
+    if kind not in SPECS:
+        raise ValueError(f"Unknown import kind: {kind}")
+    spec = SPECS[kind]
+    result = ImportResult()
+    started = time.perf_counter()
+
+    rows = iter_rows(path, sheet)
+    _number, header = next(rows, (None, None))
+    if header is None:
+        raise ValueError("File is empty (no header row)")
+    columns = map_header(header, spec)
+    sql = upsert_sql(engine.dialect.name, spec, list(columns))
+
+    batch = []
+    sources = []  # 배치 행별 (행 번호, 원본 값) - 배치가 실패하면 거부 행으로 기록
+    seen = {}  # 키 -> 배치 내 위치 (같은 배치에 같은 키가 여러 번 나오면 마지막 행만 기록)
+
+    def reject(number, reason, values):
+        result.reject(number, reason)
+        if reject_writer:
+            reject_writer(number, reason, values)
+
+    def flush():
+        if not batch:
+            return
+        try:
+            if not dry_run:
+                # 배치마다 트랜잭션 하나 (실패한 배치만 롤백되고 앞선 배치는 유지)
+                with engine.begin() as con:
+                    con.execute(text(sql), batch)
+        except SQLAlchemyError as e:
+            reason = "database error: " + (str(getattr(e, "orig", e)).splitlines() or [""])[0][:200]
+            for number, values in sources:
+                reject(number, reason, values)
+            result.failed_batches += 1
+        else:
+            result.written += len(batch)
+            result.batches += 1
+        batch.clear()
+        sources.clear()
+        seen.clear()
+        if progress:
+            progress(result)
+
+    for number, values in rows:
+        if values is None or all(v is None or str(v).strip() == "" for v in values):
+            continue  # 빈 행은 건너뜀
+        result.processed += 1
+        try:
+            row = validate_row(values, columns, spec)
+        except RowError as e:
+            reject(number, str(e), values)
+            continue
+
+        key = row[spec.key]
+        if key in seen:
+            batch[seen[key]] = row
+            sources[seen[key]] = (number, values)
+        else:
+            seen[key] = len(batch)
+            batch.append(row)
+            sources.append((number, values))
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+
+    result.elapsed = time.perf_counter() - started
+    return result
@@ -0,0 +1,391 @@
+"""
+백그라운드 작업 모듈
+오래 걸리는 작업(스토리지 업로드 등)을 요청 스레드 밖에서 처리하는 작업 큐와 워커 풀을 정의합니다.
+
+- 큐 길이에 상한이 있어 가득 차면 JobQueueFull을 발생시킵니다 (호출 측은 503 + Retry-After로 응답).
+- 작업 상태는 작업마다 작은 JSON 파일로 기록하므로 gunicorn 워커 어느 쪽에서도 조회할 수 있습니다.
+- 워커 스레드는 프로세스별로 첫 작업 제출 시 시작합니다 (fork 이후에도 안전).
+- 작업을 넣은 프로세스는 owners/<id>.lock에 flock을 잡고 있습니다. recover()는 잠금이 풀린(프로세스가 종료된)
+  queued/running 작업을 실패로 기록하고, 작업 종류별로 등록된 정리 함수(스풀 파일 삭제 등)를 호출합니다.
+- add_lane()으로 등록한 작업 종류는 별도 큐와 워커로 처리하여 다른 작업의 큐 자리와 워커를 차지하지 않습니다.
+"""
+
+import json
+import os
+import queue
+import re
+import threading
+import time
+import uuid
+
+try:
+    import fcntl  # POSIX 파일 잠금 (Windows에서는 사용 불가 - 중단 작업 복구 비활성화)
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+# 작업 ID 형식 (uuid4 hex) - 경로 조작 방지를 위해 조회 시 검증
+JOB_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class JobQueueFull(Exception):
+    """작업 큐가 가득 차서 작업을 받을 수 없을 때 발생하는 예외"""
+
+
+class Job:
+    """
+    작업 핸들 클래스
+    워커에서 실행되는 함수가 진행 상황을 보고할 때 사용합니다.
+    """
+
+    def __init__(self, queue_, record):
+        self._queue = queue_
+        self.record = record
+        self._saved_at = 0.0
+
+    @property
+    def id(self):
+        return self.record["id"]
+
+    def progress(self, done, total=None):
+        """
+        진행 상황을 기록하는 함수 (너무 자주 기록하지 않도록 0.5초 간격으로 저장)
+
+        Args:
+            done (int): 처리한 양 (예: 업로드한 바이트)
+            total (int, optional): 전체 양
+        """
+        self.record["progress"] = {"done": done, "total": total}
+        now = time.monotonic()
+        if now - self._saved_at >= 0.5 or (total is not None and done >= total):
+            self._saved_at = now
+            self._queue._save(self.record)
+
+
+class JobQueue:
+    """
+    작업 큐 클래스
+
+    - submit(kind, func, *args)로 작업을 등록하면 즉시 작업 ID를 돌려주고, 워커가 func(job, *args)를 실행합니다.
+    - func의 반환값은 result, 예외 메시지는 error로 기록됩니다.
+    - 보관 기간이 지난 작업 기록은 주기적으로 삭제합니다.
+    - "_"로 시작하는 기록 필드(소유 프로세스, 정리 정보)는 get()에서 제외됩니다.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._queue = None
+        self._queues = {}       # add_lane()으로 분리한 작업 종류 -> queue.Queue
+        self._lanes = {}        # 작업 종류 -> (워커 수, 큐 크기)
+        self._interrupted = {}  # 작업 종류 -> 중단된 작업 정리 함수
+        self._pid = None
+        self._owner = None
+        self._owner_fd = None
+        self._threads = []
+        self._app = None
+        self._logger = None
+        self._last_purge = 0.0
+        self.directory = None
+        self.workers = 2
+        self.maxsize = 16
+        self.retention = 86400
+        self._stats = {"submitted": 0, "rejected": 0, "succeeded": 0, "failed": 0, "interrupted": 0}
+        self._lane_rejected = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Flask 애플리케이션에 작업 큐를 등록하는 함수
+
+        Args:
+            app (Flask): Flask 애플리케이션 인스턴스
+        """
+        self.directory = os.path.abspath(app.config.get("JOB_DIR") or os.path.join(app.instance_path, "jobs"))
+        self.workers = max(int(app.config.get("JOB_WORKERS", 2)), 1)
+        self.maxsize = max(int(app.config.get("JOB_QUEUE_SIZE", 16)), 1)
+        self.retention = int(app.config.get("JOB_RETENTION_SECONDS", 86400))
+        os.makedirs(os.path.join(self.directory, "owners"), exist_ok=True)
+        self._app = app
+        self._logger = app.logger
+        app.extensions["job_queue"] = self
+
+    def add_lane(self, kind, workers=1, maxsize=None):
+        """
+        작업 종류 하나를 별도 큐와 워커 스레드로 처리하도록 등록하는 함수 (init_app 단계에서 호출)
+
+        Args:
+            kind (str): 작업 종류 (예: "pdf_text")
+            workers (int): 이 종류 전용 워커 스레드 수
+            maxsize (int, optional): 이 종류 전용 큐 크기 (기본값: JOB_QUEUE_SIZE)
+        """
+        self._lanes[kind] = (max(int(workers), 1), max(int(maxsize or self.maxsize), 1))
+
+    def on_interrupted(self, kind):
+        """
+        중단된 작업의 정리 함수를 등록하는 데코레이터 (recover()가 실패로 기록한 작업 기록으로 호출)
+
+        Args:
+            kind (str): 작업 종류
+        """
+        def decorator(func):
+            self._interrupted[kind] = func
+            return func
+        return decorator
+
+    def _ensure_workers(self):
+        """현재 프로세스의 소유 잠금과 워커 스레드를 시작하는 함수 (호출 측에서 잠금 보유)"""
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        self._pid = pid
+        self._acquire_owner()
+        self._queue = queue.Queue(maxsize=self.maxsize)
+        self._queues = {kind: queue.Queue(maxsize=maxsize) for kind, (_workers, maxsize) in self._lanes.items()}
+        self._threads = []
+        lanes = [("job-worker", self._queue, self.workers)]
+        lanes += [(f"job-{kind}", self._queues[kind], workers) for kind, (workers, _maxsize) in self._lanes.items()]
+        for name, lane_queue, workers in lanes:
+            for i in range(workers):
+                thread = threading.Thread(target=self._worker, args=(lane_queue,), name=f"{name}-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _acquire_owner(self):
+        """이 프로세스의 소유 잠금 파일을 만들고 flock을 잡는 함수 (프로세스가 끝나면 커널이 잠금을 해제)"""
+        if self._owner_fd is not None:
+            # fork로 물려받은 부모의 잠금 파일 디스크립터는 닫음 (부모가 닫지 않는 한 부모 잠금은 유지됨)
+            os.close(self._owner_fd)
+            self._owner_fd = None
+        self._owner = f"{os.getpid()}-{uuid.uuid4().hex[:12]}"
+        if fcntl is None:
+            return
+        fd = os.open(self._owner_path(self._owner), os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        self._owner_fd = fd
+
+    def _owner_path(self, owner):
+        return os.path.join(self.directory, "owners", f"{owner}.lock")
+
+    def _owner_alive(self, owner):
+        """
+        작업을 넣은 프로세스가 아직 실행 중인지 확인하는 함수
+
+        Returns:
+            bool: 소유 잠금이 잡혀 있으면 True (잠금 파일이 없거나 잠금을 얻을 수 있으면 종료된 프로세스)
+        """
+        if owner == self._owner and self._pid == os.getpid():
+            return True
+        if not owner or not re.match(r"^\d+-[0-9a-f]{12}$", owner):
+            return False
+        try:
+            fd = os.open(self._owner_path(owner), os.O_RDWR)
+        except OSError:
+            return False
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+        finally:
+            os.close(fd)
+        try:
+            os.remove(self._owner_path(owner))
+        except OSError:
+            pass
+        return False
+
+    def recover(self):
+        """
+        실행하던 프로세스가 종료되어 끝나지 못한 queued/running 작업을 실패로 기록하는 함수
+        (앱 시작 시와 보관 기간 정리 때 호출) 기록마다 등록된 정리 함수를 호출하여 스풀 파일 등을 정리합니다.
+
+        Returns:
+            int: 실패로 기록한 작업 수
+        """
+        if fcntl is None or self.directory is None:
+            return 0
+        recovered = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            record = self._read(name[:-5])
+            if record is None or record.get("status") not in (QUEUED, RUNNING):
+                continue
+            if self._owner_alive(record.get("_owner")):
+                continue
+            record["status"] = FAILED
+            record["error"] = "Interrupted: the worker process exited before the job finished"
+            self._save(record)
+            handler = self._interrupted.get(record.get("kind"))
+            if handler is not None:
+                try:
+                    handler(record)
+                except Exception as e:  # 정리 실패는 기록만 하고 다음 작업 계속
+                    if self._logger is not None:
+                        self._logger.warning("cleanup of interrupted job %s failed: %s", record["id"], e)
+            recovered += 1
+        # 작업 없이 종료된 프로세스의 소유 잠금 파일 정리
+        for name in os.listdir(os.path.join(self.directory, "owners")):
+            if name.endswith(".lock"):
+                self._owner_alive(name[:-5])
+        if recovered:
+            with self._lock:
+                self._stats["interrupted"] += recovered
+            if self._logger is not None:
+                self._logger.warning("marked %d interrupted job(s) as failed", recovered)
+        return recovered
+
+    def submit(self, kind, func, *args, meta=None, cleanup=None):
+        """
+        작업을 큐에 등록하는 함수
+
+        Args:
+            kind (str): 작업 종류 (예: "pdf_upload")
+            func (callable): 워커에서 실행할 함수 - func(job, *args)
+            *args: 함수 인자
+            meta (dict, optional): 상태 조회 시 함께 보여줄 정보 (예: mid)
+            cleanup (dict, optional): 작업이 중단되었을 때 정리 함수에 전달할 정보 (조회 응답에는 포함되지 않음)
+
+        Returns:
+            dict: 등록된 작업 기록
+
+        Raises:
+            JobQueueFull: 큐가 가득 찬 경우
+        """
+        now = time.time()
+        record = {
+            "id": uuid.uuid4().hex,
+            "kind": kind,
+            "status": QUEUED,
+            "meta": meta or {},
+            "progress": None,
+            "result": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+            "_cleanup": cleanup or {},
+        }
+        with self._lock:
+            self._ensure_workers()
+            record["_owner"] = self._owner
+            self._save(record)
+            target = self._queues.get(kind, self._queue)
+            try:
+                target.put_nowait((record, func, args))
+            except queue.Full:
+                self._stats["rejected"] += 1
+                if kind in self._queues:
+                    self._lane_rejected[kind] = self._lane_rejected.get(kind, 0) + 1
+                self._delete(record["id"])
+                raise JobQueueFull(f"Job queue is full ({target.maxsize})") from None
+            self._stats["submitted"] += 1
+        self._purge_expired()
+        return record
+
+    def _worker(self, lane_queue):
+        """큐에서 작업을 꺼내 실행하는 워커 루프"""
+        while True:
+            record, func, args = lane_queue.get()
+            job = Job(self, record)
+            record["status"] = RUNNING
+            self._save(record)
+            try:
+                with self._app.app_context():
+                    record["result"] = func(job, *args)
+                record["status"] = SUCCEEDED
+            except Exception as e:  # 작업 실패는 기록만 하고 워커는 계속 동작
+                record["status"] = FAILED
+                record["error"] = str(e) or e.__class__.__name__
+            finally:
+                with self._lock:
+                    self._stats["succeeded" if record["status"] == SUCCEEDED else "failed"] += 1
+                self._save(record)
+                lane_queue.task_done()
+
+    def get(self, job_id):
+        """
+        작업 기록을 조회하는 함수
+
+        Args:
+            job_id (str): 작업 ID
+
+        Returns:
+            dict or None: 작업 기록 (없으면 None)
+        """
+        if not JOB_ID_PATTERN.match(job_id or ""):
+            return None
+        record = self._read(job_id)
+        if record is None:
+            return None
+        return {key: value for key, value in record.items() if not key.startswith("_")}
+
+    def _read(self, job_id):
+        """작업 기록 파일 전체를 읽는 함수 (없거나 쓰는 중이면 None)"""
+        try:
+            with open(self._path(job_id), "r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+    def _path(self, job_id):
+        return os.path.join(self.directory, f"{job_id}.json")
+
+    def _save(self, record):
+        """작업 기록을 임시 파일에 쓴 뒤 교체하는 함수 (읽는 쪽이 중간 상태를 보지 않음)"""
+        record["updated_at"] = time.time()
+        path = self._path(record["id"])
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(record, fh, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+
+    def _delete(self, job_id):
+        try:
+            os.remove(self._path(job_id))
+        except OSError:
+            pass
+
+    def _purge_expired(self):
+        """보관 기간이 지난 작업 기록을 삭제하는 함수 (최대 10분에 한 번)"""
+        now = time.time()
+        if self.retention <= 0 or now - self._last_purge < 600:
+            return
+        self._last_purge = now
+        # 다른 워커 프로세스가 비정상 종료한 경우도 주기적으로 정리
+        self.recover()
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.isfile(path) and now - os.stat(path).st_mtime > self.retention:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self):
+        """
+        작업 큐 통계를 반환하는 함수
+
+        Returns:
+            dict: 제출/거부/성공/실패/중단 수, 현재 큐 길이, 분리된 작업 종류별 큐 상태
+        """
+        started = self._pid == os.getpid()
+        with self._lock:
+            stats = dict(self._stats)
+            stats["queued"] = self._queue.qsize() if self._queue is not None and started else 0
+            stats["lanes"] = {
+                kind: {
+                    "workers": workers,
+                    "queue_size": maxsize,
+                    "queued": self._queues[kind].qsize() if started and kind in self._queues else 0,
+                    "rejected": self._lane_rejected.get(kind, 0),
+                }
+                for kind, (workers, maxsize) in self._lanes.items()
+            }
+        stats["workers"] = self.workers
+        stats["queue_size"] = self.maxsize
+        return stats
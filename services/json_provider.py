@@ -0,0 +1,87 @@
+"""
+JSON 직렬화 모듈
+orjson 기반의 Flask JSON 제공자(JSON provider)를 정의합니다.
+
+상세 목록(per_page=100, 첨부파일 포함)처럼 큰 응답은 표준 json 모듈로 직렬화하는 시간이 커지므로
+orjson이 설치되어 있으면 이를 사용하고, 없으면 표준 json 모듈(ensure_ascii=False)로 동작합니다.
+어느 쪽이든 한글은 \\uXXXX 이스케이프 없이 UTF-8 그대로 내보냅니다.
+"""
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson  # 선택 의존성 (C 확장 기반 고속 직렬화)
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    고속 JSON 제공자 클래스
+
+    - orjson이 있으면 dumps/loads/response를 orjson으로 처리하고, 없으면 기본 제공자와 같게 동작합니다.
+    - datetime/date는 기본 제공자와 같은 HTTP 날짜 형식으로, UUID/dataclass/Decimal 등은
+      기본 제공자의 default()로 변환하여 응답 형식을 바꾸지 않습니다.
+    - 키 정렬(sort_keys)과 디버그 모드 들여쓰기도 기본 제공자와 동일합니다.
+    """
+
+    ensure_ascii = False  # 한글을 이스케이프하지 않음 (응답 크기 감소)
+
+    @property
+    def backend(self):
+        """사용 중인 직렬화 엔진 이름 ("orjson" 또는 "json")"""
+        return "orjson" if orjson is not None else "json"
+
+    def _options(self, indent=False):
+        """orjson 옵션 비트를 구성하는 함수"""
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        """
+        객체를 JSON 문자열로 직렬화하는 함수
+
+        Args:
+            obj: 직렬화할 객체
+            **kwargs: json.dumps 인자 (orjson이 지원하지 않는 인자가 있으면 표준 json 모듈 사용)
+
+        Returns:
+            str: JSON 문자열
+        """
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        """
+        JSON 문자열(또는 UTF-8 바이트)을 객체로 역직렬화하는 함수
+
+        Args:
+            s (str | bytes): JSON 데이터
+            **kwargs: json.loads 인자 (있으면 표준 json 모듈 사용)
+
+        Returns:
+            object: 역직렬화된 객체
+        """
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """
+        인자를 JSON으로 직렬화하여 응답 객체를 만드는 함수 (jsonify가 호출)
+        orjson 사용 시 문자열 변환 없이 바이트를 바로 응답 본문으로 사용합니다.
+
+        Returns:
+            Response: application/json 응답
+        """
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=self.default, option=self._options(indent)) + b"\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
@@ -0,0 +1,385 @@
+"""
+라벨 시트 모듈
+여러 MSDS의 QR 코드 라벨(상세 페이지 URL QR + 제목 + GHS 경고 표지)을 인쇄용 PDF 한 장으로 만듭니다.
+
+- QR 인코딩(마스크 패턴 선택)과 PDF 그리기는 CPU를 많이 쓰므로 프로세스 풀에서 실행합니다.
+  QR은 여러 워커에 나눠 인코딩하고(결과는 URL별로 메모리에 보관), 그리기는 워커 하나가 모아서 처리합니다.
+- 완성된 시트는 입력(상세 URL, 제목, 경고 표지 file_loc, 레이아웃 버전)의 해시를 키로 콘텐츠 캐시에 저장되므로
+  내용이 바뀌지 않았다면 다시 그리지 않고 디스크에서 바로 스트리밍합니다.
+- reportlab은 선택 의존성이며, 없으면 라벨 생성만 비활성화됩니다 (pip install reportlab rl_accel).
+  rl_accel(C 확장)이 없으면 좌표 문자열 변환이 느려 그리기 시간이 몇 배로 늘어납니다.
+"""
+
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import quote
+
+try:
+    from reportlab.graphics.barcode import qrencoder  # 선택 의존성 (QR 인코딩 + PDF 생성)
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+    from reportlab.pdfbase.ttfonts import TTFont
+    from reportlab.pdfgen import canvas
+except ImportError:  # pragma: no cover
+    qrencoder = None
+
+# 레이아웃 버전 - 그리는 방식이 바뀌면 올려서 기존 캐시를 무효화
+LAYOUT_VERSION = 1
+
+# 콘텐츠 캐시에서 라벨 시트를 보관할 네임스페이스 (스토리지 버킷과 겹치지 않도록)
+CACHE_BUCKET = "_labels"
+
+# A4 3열 x 7행 라벨 용지 (63.5 x 38.1mm, Avery L7160 호환) - 단위: mm
+MM = 72 / 25.4
+COLUMNS, ROWS = 3, 7
+LABEL_WIDTH, LABEL_HEIGHT = 63.5, 38.1
+MARGIN_LEFT, MARGIN_TOP = 7.2, 15.15
+COLUMN_GAP = 2.5
+PADDING = 2.5
+QR_SIZE = 26.0
+PICTOGRAM_SIZE = 7.0
+PICTOGRAM_GAP = 0.8
+
+# 프로세스 내에 보관할 QR 행렬 수 (같은 MSDS는 URL이 같으므로 시트가 바뀌어도 다시 인코딩하지 않음)
+QR_CACHE_SIZE = 5000
+
+# 한글 글꼴 (LABEL_FONT_PATH가 없으면 PDF 뷰어 내장 CID 글꼴 사용)
+CID_FONT = "HYGothic-Medium"
+_font_name = None
+
+
+def qr_matrices(urls):
+    """
+    URL 목록을 QR 모듈 행렬로 인코딩하는 함수 (프로세스 풀 워커에서 실행)
+
+    Args:
+        urls (list): 인코딩할 URL 목록
+
+    Returns:
+        list: URL별 행 문자열 리스트 ("1"이 검은 모듈)
+    """
+    matrices = []
+    for url in urls:
+        qr = qrencoder.QRCode(None, qrencoder.QRErrorCorrectLevel.M)
+        qr.addData(url)
+        qr.make()
+        n = qr.getModuleCount()
+        matrices.append(["".join("1" if qr.isDark(r, c) else "0" for c in range(n)) for r in range(n)])
+    return matrices
+
+
+def _register_font(font_path):
+    """워커 프로세스에 한글 글꼴을 한 번만 등록하는 함수"""
+    global _font_name
+    if _font_name is None:
+        if font_path:
+            pdfmetrics.registerFont(TTFont("LabelFont", font_path))
+            _font_name = "LabelFont"
+        else:
+            pdfmetrics.registerFont(UnicodeCIDFont(CID_FONT))
+            _font_name = CID_FONT
+    return _font_name
+
+
+def _wrap(value, font, size, width, max_lines):
+    """글자 단위로 줄바꿈하고 넘치는 부분은 말줄임표로 자르는 함수 (한글은 띄어쓰기가 적어 글자 단위 사용)"""
+    lines, line = [], ""
+    for char in value:
+        if pdfmetrics.stringWidth(line + char, font, size) > width:
+            lines.append(line)
+            line = char.lstrip()
+            if len(lines) == max_lines:
+                break
+        else:
+            line += char
+    else:
+        if line:
+            lines.append(line)
+        return lines
+    last = lines[-1]
+    while last and pdfmetrics.stringWidth(last + "…", font, size) > width:
+        last = last[:-1]
+    lines[-1] = last + "…"
+    return lines
+
+
+def _draw_qr(pdf, matrix, x, y, size):
+    """QR 행렬을 벡터 사각형으로 그리는 함수 (같은 행의 연속된 모듈은 한 사각형으로 합침)"""
+    n = len(matrix)
+    cell = size / n
+    path = pdf.beginPath()
+    for r, row in enumerate(matrix):
+        top = y + (n - 1 - r) * cell
+        c = 0
+        while c < n:
+            if row[c] == "1":
+                start = c
+                while c < n and row[c] == "1":
+                    c += 1
+                path.rect(x + start * cell, top, (c - start) * cell, cell)
+            else:
+                c += 1
+    pdf.drawPath(path, stroke=0, fill=1)
+
+
+def render_sheet(labels, matrices, pictograms, font_path=None):
+    """
+    라벨 시트 PDF를 그리는 함수 (프로세스 풀 워커에서 실행)
+
+    Args:
+        labels (list): [{mid, title, pictograms: [file_loc, ...]}, ...]
+        matrices (list): 라벨별 QR 행렬 (qr_matrices 결과)
+        pictograms (dict): 경고 표지 file_loc -> 로컬 이미지 경로
+        font_path (str, optional): 한글 TTF 글꼴 경로
+
+    Returns:
+        bytes: PDF 데이터
+    """
+    font = _register_font(font_path)
+    output = io.BytesIO()
+    pdf = canvas.Canvas(output, pagesize=A4, pageCompression=1)
+    pdf.setTitle("MSDS labels")
+    page_height = A4[1]
+    broken = set()  # 그릴 수 없는 이미지 (SVG 등) - 라벨마다 다시 시도하지 않음
+    per_page = COLUMNS * ROWS
+    text_width = (LABEL_WIDTH - PADDING * 2 - QR_SIZE - 2) * MM
+
+    for index, (label, matrix) in enumerate(zip(labels, matrices)):
+        if index and index % per_page == 0:
+            pdf.showPage()
+        slot = index % per_page
+        left = (MARGIN_LEFT + (slot % COLUMNS) * (LABEL_WIDTH + COLUMN_GAP)) * MM
+        top = page_height - (MARGIN_TOP + (slot // COLUMNS) * LABEL_HEIGHT) * MM
+
+        # 왼쪽: 상세 페이지 QR (세로 가운데)
+        qr_y = top - (LABEL_HEIGHT + QR_SIZE) / 2 * MM
+        _draw_qr(pdf, matrix, left + PADDING * MM, qr_y, QR_SIZE * MM)
+
+        # 오른쪽 위: 제목(최대 3줄)과 MSDS ID
+        text_x = left + (PADDING + QR_SIZE + 2) * MM
+        y = top - PADDING * MM - 8
+        pdf.setFont(font, 8)
+        for line in _wrap(label["title"] or label["mid"], font, 8, text_width, 3):
+            pdf.drawString(text_x, y, line)
+            y -= 9.5
+        pdf.setFont(font, 6)
+        pdf.drawString(text_x, y, label["mid"])
+
+        # 오른쪽 아래: 경고 표지 (한 줄에 4개, 최대 2줄 - 마지막 줄이 라벨 아래쪽에 오도록 배치)
+        per_row = int((text_width + PICTOGRAM_GAP * MM) // ((PICTOGRAM_SIZE + PICTOGRAM_GAP) * MM))
+        images = [f for f in label["pictograms"] if pictograms.get(f) and f not in broken][:per_row * 2]
+        rows = -(-len(images) // per_row)
+        bottom = top - (LABEL_HEIGHT - PADDING) * MM
+        for i, file_loc in enumerate(images):
+            row, col = divmod(i, per_row)
+            x = text_x + col * (PICTOGRAM_SIZE + PICTOGRAM_GAP) * MM
+            y = bottom + (rows - 1 - row) * (PICTOGRAM_SIZE + PICTOGRAM_GAP) * MM
+            try:
+                # 같은 이미지는 PDF 안에 한 번만 저장됨 (reportlab 이미지 캐시)
+                pdf.drawImage(pictograms[file_loc], x, y, PICTOGRAM_SIZE * MM, PICTOGRAM_SIZE * MM,
+                              preserveAspectRatio=True, mask="auto")
+            except Exception:
+                broken.add(file_loc)
+
+    pdf.save()
+    return output.getvalue()
+
+
+class LabelSheets:
+    """
+    라벨 시트 생성/캐시 클래스
+
+    - get(labels, base_url)은 입력 해시로 캐시를 조회하고, 없으면 프로세스 풀에서 시트를 그려 저장합니다.
+    - 같은 시트를 동시에 요청하면 한 번만 그리고 나머지는 결과를 기다립니다.
+    - 경고 표지 이미지는 이미지 변형(PNG 축소판)이 있으면 그것을, 없으면 원본을 콘텐츠 캐시에서 가져옵니다.
+    """
+
+    def __init__(self, content_cache, image_variants, app=None):
+        self._content_cache = content_cache
+        self._image_variants = image_variants
+        self._lock = threading.Lock()
+        self._inflight = {}  # 캐시 키 -> 그리는 중인 Event (동시 요청 합치기)
+        self._matrices = OrderedDict()  # URL -> QR 행렬 (LRU)
+        self._executor = None
+        self._pid = None
+        self.bucket = "msds"
+        self.workers = 2
+        self.timeout = 120
+        self.max_count = 1000
+        self.font_path = None
+        self.base_url = None
+        self._stats = {"hits": 0, "renders": 0, "joined": 0, "labels": 0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Flask 애플리케이션에 라벨 시트 생성기를 등록하는 함수
+
+        Args:
+            app (Flask): Flask 애플리케이션 인스턴스
+        """
+        self.bucket = app.config.get("SUPABASE_BUCKET", "msds")
+        self.workers = max(int(app.config.get("LABEL_WORKERS", 2)), 1)
+        self.timeout = float(app.config.get("LABEL_TIMEOUT", 120))
+        self.max_count = int(app.config.get("LABEL_MAX_COUNT", 1000))
+        self.font_path = app.config.get("LABEL_FONT_PATH") or None
+        self.base_url = app.config.get("LABEL_BASE_URL") or None
+        app.extensions["label_sheets"] = self
+
+    @property
+    def available(self):
+        """라벨 생성 가능 여부 (reportlab 설치 여부)"""
+        return qrencoder is not None
+
+    def detail_url(self, base_url, mid):
+        """MSDS 상세 페이지 URL (QR 내용) - 프론트엔드 /msds/{mid} 경로"""
+        return f"{base_url.rstrip('/')}/msds/{quote(mid, safe='')}"
+
+    def cache_key(self, labels, base_url):
+        """
+        시트 입력으로 캐시 키(콘텐츠 해시)를 만드는 함수
+
+        Args:
+            labels (list): [{mid, title, pictograms}, ...]
+            base_url (str): 상세 페이지 URL 앞부분
+
+        Returns:
+            str: SHA-256 16진 문자열
+        """
+        payload = {
+            "layout": LAYOUT_VERSION,
+            "font": self.font_path,
+            "base_url": base_url,
+            "labels": [[label["mid"], label["title"], label["pictograms"]] for label in labels],
+        }
+        return hashlib.sha256(json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _pool(self):
+        """현재 프로세스의 라벨 프로세스 풀을 반환하는 함수 (fork 이후에는 새로 생성)"""
+        with self._lock:
+            if self._pid != os.getpid():
+                # spawn: 스레드가 있는 프로세스를 fork하지 않도록 새 인터프리터로 시작
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+    def get(self, labels, base_url):
+        """
+        라벨 시트를 반환하는 함수 (캐시에 없으면 그려서 저장)
+
+        Args:
+            labels (list): [{mid, title, pictograms: [file_loc, ...]}, ...]
+            base_url (str): 상세 페이지 URL 앞부분 (예: https://msds.example.com)
+
+        Returns:
+            tuple: (CacheEntry 또는 None, PDF bytes 또는 None) - 캐시 비활성화 시 bytes로 반환
+
+        Raises:
+            RuntimeError: reportlab이 설치되지 않은 경우
+            TimeoutError: LABEL_TIMEOUT 안에 그리지 못한 경우
+        """
+        if qrencoder is None:
+            raise RuntimeError("reportlab is not installed (pip install reportlab)")
+        if not self._content_cache.enabled:
+            with self._lock:
+                self._stats["renders"] += 1
+                self._stats["labels"] += len(labels)
+            return None, self._render(labels, base_url)
+
+        key = self.cache_key(labels, base_url)
+        path = f"{key}.pdf"
+        while True:
+            entry = self._content_cache.lookup(CACHE_BUCKET, path)
+            if entry is not None:
+                with self._lock:
+                    self._stats["hits"] += 1
+                return entry, None
+            with self._lock:
+                event = self._inflight.get(key)
+                if event is None:
+                    event = self._inflight[key] = threading.Event()
+                    self._stats["renders"] += 1
+                    break
+                self._stats["joined"] += 1
+            # 다른 요청이 그리는 중이면 끝날 때까지 기다린 뒤 캐시를 다시 조회 (실패했으면 직접 그림)
+            if not event.wait(self.timeout):
+                raise TimeoutError("Label sheet rendering timed out")
+
+        try:
+            data = self._render(labels, base_url)
+            with self._lock:
+                self._stats["labels"] += len(labels)
+            writer = self._content_cache.writer(CACHE_BUCKET, path, "application/pdf")
+            try:
+                writer.write(data)
+            except Exception:
+                writer.discard()
+                raise
+            return writer.commit(), None
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            event.set()
+
+    def _render(self, labels, base_url):
+        """QR을 여러 워커에서 나눠 인코딩한 뒤 워커 하나에서 시트를 그리는 함수"""
+        pool = self._pool()
+        urls = [self.detail_url(base_url, label["mid"]) for label in labels]
+        with self._lock:
+            known = {url: self._matrices[url] for url in urls if url in self._matrices}
+        missing = [url for url in dict.fromkeys(urls) if url not in known]
+        chunk = max(-(-len(missing) // self.workers), 50)
+        futures = [(missing[i:i + chunk], pool.submit(qr_matrices, missing[i:i + chunk]))
+                   for i in range(0, len(missing), chunk)]
+        for batch, future in futures:
+            known.update(zip(batch, future.result(timeout=self.timeout)))
+        matrices = [known[url] for url in urls]
+        with self._lock:
+            for url, matrix in known.items():
+                self._matrices[url] = matrix
+                self._matrices.move_to_end(url)
+            while len(self._matrices) > QR_CACHE_SIZE:
+                self._matrices.popitem(last=False)
+        pictograms = self._pictogram_paths({f for label in labels for f in label["pictograms"]})
+        future = pool.submit(render_sheet, labels, matrices, pictograms, self.font_path)
+        return future.result(timeout=self.timeout)
+
+    def _pictogram_paths(self, file_locs):
+        """경고 표지 이미지의 로컬 경로를 모으는 함수 (가져올 수 없는 이미지는 제외)"""
+        paths = {}
+        for file_loc in file_locs:
+            entry = None
+            try:
+                if self._image_variants.available:
+                    width = self._image_variants.snap_width(128)
+                    entry = self._image_variants.get(self.bucket, file_loc, width, "png")
+                if entry is None:
+                    entry = self._content_cache.fetch(self.bucket, file_loc)
+            except Exception:
+                entry = None  # 스토리지 오류 시 해당 표지만 생략
+            if entry is not None:
+                paths[file_loc] = entry.file_path
+        return paths
+
+    def stats(self):
+        """
+        라벨 시트 통계를 반환하는 함수
+
+        Returns:
+            dict: 캐시 적중/생성/합류 수, 생성한 라벨 수, reportlab 사용 가능 여부
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats["available"] = self.available
+        stats["workers"] = self.workers
+        return stats
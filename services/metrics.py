@@ -0,0 +1,529 @@
+"""
+메트릭 모듈
+라우트 지연 시간/상태 코드, 처리 중 요청 수, Supabase 스토리지 호출 지연 시간을 수집하여
+/metrics에서 Prometheus 텍스트 형식으로 내보냅니다.
+
+- 기록은 스레드별 샤드(딕셔너리)에 하므로 요청 경로에서 잠금을 잡지 않습니다.
+  라벨 조합이 처음 나올 때만 리스트를 하나 만들고, 이후에는 숫자만 더합니다.
+- gunicorn 워커(프로세스)마다 METRICS_FLUSH_SECONDS 간격으로 스냅샷을 METRICS_DIR/<pid>-<토큰>.json에 기록하고,
+  /metrics는 디렉터리의 모든 스냅샷을 합산합니다 (요청을 받은 워커는 자기 값을 먼저 기록).
+- 워커는 owners/<pid>-<토큰>.lock에 flock을 잡고 있습니다. 잠금을 얻을 수 있는(종료된) 워커의 카운터/히스토그램은
+  archive.json에 합쳐 유지하고, 게이지(처리 중 요청 수)는 버립니다. 컨테이너 재시작으로 pid가 재사용되어도
+  토큰이 달라 새 워커가 종료된 워커의 스냅샷을 덮어쓰지 않습니다.
+- 라우트 계측은 WSGI 미들웨어로 하므로 스트리밍 응답도 본문 전송이 끝날 때까지의 시간을 기록합니다.
+  스토리지 호출은 공유 httpx 클라이언트의 전송 계층에서 응답 헤더를 받을 때까지의 시간을 기록합니다.
+"""
+
+import atexit
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from bisect import bisect_left
+
+from werkzeug.wsgi import ClosingIterator
+
+try:
+    import fcntl  # POSIX 파일 잠금 (Windows에서는 사용 불가)
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+# 지연 시간 히스토그램 구간(초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# 메트릭 정의: 이름 -> (종류, 설명, 라벨 이름들)
+FAMILIES = {
+    "msds_http_requests_total": (
+        "counter", "HTTP requests by route, method and status code", ("endpoint", "method", "status")),
+    "msds_http_request_duration_seconds": (
+        "histogram", "HTTP request latency including streamed bodies", ("endpoint", "method")),
+    "msds_http_requests_in_flight": (
+        "gauge", "HTTP requests currently being processed", ()),
+    "msds_storage_request_duration_seconds": (
+        "histogram", "Supabase storage call latency until response headers", ("operation", "outcome")),
+}
+
+# 아카이브(종료된 워커 합계) 파일명
+ARCHIVE_FILE = "archive.json"
+
+# 워커 식별자 형식 (<pid>-<토큰>)
+OWNER_PATTERN = re.compile(r"^\d+-[0-9a-f]{12}$")
+
+
+def storage_operation(method, path):
+    """
+    Supabase 스토리지 요청을 작업 종류로 분류하는 함수
+
+    Args:
+        method (str): HTTP 메서드
+        path (str): URL 경로 (예: /storage/v1/object/sign/msds/a.png)
+
+    Returns:
+        str: upload | remove | create_signed_url | download | other
+    """
+    marker = "/object/"
+    index = path.find(marker)
+    if index < 0:
+        return "other"
+    rest = path[index + len(marker):]
+    if rest.startswith("sign/"):
+        return "create_signed_url"
+    if method == "DELETE":
+        return "remove"
+    if method in ("POST", "PUT"):
+        return "upload"
+    if method in ("GET", "HEAD"):
+        return "download"
+    return "other"
+
+
+class Metrics:
+    """
+    메트릭 수집/내보내기 클래스
+
+    - inc/observe/add는 현재 스레드의 샤드에만 기록합니다 (잠금 없음).
+    - wrap_wsgi(app)은 라우트 계측 미들웨어를 씌우고, timed_transport(transport)는 httpx 전송 계층을 감쌉니다.
+    - render()는 모든 워커의 스냅샷을 합산하여 Prometheus 텍스트 형식으로 반환합니다.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()  # 샤드 목록/파일 기록 보호 (요청 경로에서는 사용하지 않음)
+        self._local = threading.local()
+        self._shards = []
+        self._flusher = None
+        self._pid = os.getpid()
+        self._owner = None
+        self._owner_fd = None
+        self.enabled = True
+        self.directory = None
+        self.flush_seconds = 5.0
+        self._atexit_registered = False
+        if hasattr(os, "register_at_fork"):
+            # fork된 워커는 부모의 샤드/기록 스레드를 물려받지 않음
+            os.register_at_fork(after_in_child=self._after_fork)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Flask 애플리케이션에 메트릭 수집을 등록하는 함수
+
+        Args:
+            app (Flask): Flask 애플리케이션 인스턴스
+        """
+        self.enabled = bool(app.config.get("METRICS_ENABLED", True))
+        self.directory = os.path.abspath(app.config.get("METRICS_DIR") or os.path.join(app.instance_path, "metrics"))
+        self.flush_seconds = max(float(app.config.get("METRICS_FLUSH_SECONDS", 5)), 0.5)
+        os.makedirs(os.path.join(self.directory, "owners"), exist_ok=True)
+        if self.enabled:
+            app.url_value_preprocessor(self._remember_endpoint)
+            app.wsgi_app = self.wrap_wsgi(app.wsgi_app)
+        if not self._atexit_registered:
+            atexit.register(self.flush)
+            self._atexit_registered = True
+        app.extensions["metrics"] = self
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shards = []
+        self._flusher = None
+        self._pid = os.getpid()
+        if self._owner_fd is not None:
+            # fork로 물려받은 부모의 잠금 파일 디스크립터는 닫음 (부모 잠금은 부모가 유지)
+            os.close(self._owner_fd)
+            self._owner_fd = None
+        self._owner = None
+
+    # --- 기록 (요청 경로) ---
+
+    def _shard(self):
+        """현재 스레드의 샤드를 반환하는 함수 (스레드마다 처음 한 번만 생성)"""
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+                if self._flusher is None and self.directory:
+                    self._flusher = threading.Thread(target=self._flush_loop, name="metrics-flush", daemon=True)
+                    self._flusher.start()
+        return shard
+
+    def inc(self, name, labels=(), amount=1):
+        """카운터를 증가시키는 함수 (labels는 FAMILIES의 라벨 순서대로의 값 튜플)"""
+        shard = self._shard()
+        key = (name, labels)
+        series = shard.get(key)
+        if series is None:
+            series = shard[key] = [0]
+        series[0] += amount
+
+    def add(self, name, amount, labels=()):
+        """게이지에 값을 더하는 함수 (감소는 음수)"""
+        self.inc(name, labels, amount)
+
+    def observe(self, name, labels, value):
+        """
+        히스토그램에 관측값을 기록하는 함수
+
+        Args:
+            name (str): 메트릭 이름
+            labels (tuple): 라벨 값들
+            value (float): 관측값(초)
+        """
+        shard = self._shard()
+        key = (name, labels)
+        series = shard.get(key)
+        if series is None:
+            # [구간별 개수..., +Inf 구간 개수, 합계, 개수] (구간 개수는 누적이 아니며 내보낼 때 누적)
+            series = shard[key] = [0] * (len(LATENCY_BUCKETS) + 1) + [0.0, 0]
+        series[bisect_left(LATENCY_BUCKETS, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    # --- 라우트 계측 ---
+
+    @staticmethod
+    def _remember_endpoint(endpoint, _values):
+        """라우팅된 엔드포인트 이름을 WSGI environ에 기록하는 함수 (미들웨어에서 라벨로 사용)"""
+        from flask import request
+        request.environ["msds.endpoint"] = endpoint
+
+    def wrap_wsgi(self, wsgi_app):
+        """
+        라우트 지연 시간/상태 코드/처리 중 요청 수를 기록하는 WSGI 미들웨어를 씌우는 함수
+
+        Args:
+            wsgi_app: 원래 WSGI 애플리케이션 (app.wsgi_app)
+
+        Returns:
+            callable: 계측 WSGI 애플리케이션
+        """
+        def middleware(environ, start_response):
+            started = time.perf_counter()
+            status = ["500"]
+
+            def recording_start_response(status_line, headers, exc_info=None):
+                status[0] = status_line[:3]
+                return start_response(status_line, headers, exc_info)
+
+            def done():
+                endpoint = environ.get("msds.endpoint") or "none"
+                method = environ.get("REQUEST_METHOD", "")
+                self.observe("msds_http_request_duration_seconds", (endpoint, method), time.perf_counter() - started)
+                self.inc("msds_http_requests_total", (endpoint, method, status[0]))
+                self.add("msds_http_requests_in_flight", -1)
+
+            self.add("msds_http_requests_in_flight", 1)
+            try:
+                body = wsgi_app(environ, recording_start_response)
+            except BaseException:
+                done()
+                raise
+            file_wrapper = environ.get("wsgi.file_wrapper")
+            if isinstance(file_wrapper, type) and isinstance(body, file_wrapper):
+                # sendfile 전송(wsgi.file_wrapper)은 감싸면 서버가 알아보지 못하므로 close만 연결
+                close = getattr(body, "close", None)
+
+                def closing():
+                    try:
+                        if close is not None:
+                            close()
+                    finally:
+                        done()
+                body.close = closing
+                return body
+            return ClosingIterator(body, done)
+        return middleware
+
+    # --- 스토리지 계측 ---
+
+    def timed_transport(self, transport):
+        """
+        httpx 전송 계층을 감싸 스토리지 호출 지연 시간을 기록하는 함수
+
+        Args:
+            transport (httpx.BaseTransport): 실제 전송 계층 (httpx.HTTPTransport)
+
+        Returns:
+            httpx.BaseTransport: 계측 전송 계층
+        """
+        import httpx
+
+        metrics = self
+
+        class TimedTransport(httpx.BaseTransport):
+            """요청마다 작업 종류/결과별 지연 시간을 기록하는 httpx 전송 계층"""
+
+            def handle_request(self, request):
+                operation = storage_operation(request.method, request.url.path)
+                started = time.perf_counter()
+                try:
+                    response = transport.handle_request(request)
+                except Exception:
+                    metrics.observe("msds_storage_request_duration_seconds", (operation, "error"),
+                                    time.perf_counter() - started)
+                    raise
+                outcome = "ok" if response.status_code < 400 else str(response.status_code)
+                metrics.observe("msds_storage_request_duration_seconds", (operation, outcome),
+                                time.perf_counter() - started)
+                return response
+
+            def close(self):
+                transport.close()
+
+        return TimedTransport()
+
+    # --- 스냅샷/합산 ---
+
+    def _local_series(self):
+        """현재 프로세스의 모든 샤드를 합친 값을 반환하는 함수"""
+        with self._lock:
+            shards = list(self._shards)
+        merged = {}
+        for shard in shards:
+            for key, values in list(shard.items()):  # 다른 스레드가 새 라벨을 추가해도 안전하도록 복사
+                _merge(merged, key, values)
+        return merged
+
+    def _acquire_owner(self):
+        """
+        이 프로세스의 소유 잠금 파일을 만들고 flock을 잡는 함수 (처음 기록할 때 한 번, 프로세스가 끝나면 커널이 잠금을 해제)
+
+        Returns:
+            str: 워커 식별자 (<pid>-<토큰>)
+        """
+        with self._lock:
+            if self._owner is None:
+                owner = f"{os.getpid()}-{uuid.uuid4().hex[:12]}"
+                if fcntl is not None:
+                    fd = os.open(self._owner_path(owner), os.O_RDWR | os.O_CREAT, 0o644)
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                    self._owner_fd = fd
+                self._owner = owner
+            return self._owner
+
+    def _owner_path(self, owner):
+        return os.path.join(self.directory, "owners", f"{owner}.lock")
+
+    def _owner_alive(self, owner):
+        """
+        스냅샷을 쓴 워커가 아직 실행 중인지 확인하는 함수
+
+        Returns:
+            bool: 소유 잠금이 잡혀 있으면 True (잠금 파일이 없거나 잠금을 얻을 수 있으면 종료된 워커)
+        """
+        if owner == self._owner:
+            return True
+        if not OWNER_PATTERN.match(owner):
+            return False  # 이전 형식(<pid>.json)의 스냅샷은 종료된 워커로 보고 아카이브
+        if fcntl is None:
+            return _pid_alive(int(owner.split("-", 1)[0]))
+        try:
+            fd = os.open(self._owner_path(owner), os.O_RDWR)
+        except OSError:
+            return False
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+        finally:
+            os.close(fd)
+        return False
+
+    def flush(self):
+        """현재 프로세스의 스냅샷을 METRICS_DIR/<pid>-<토큰>.json에 기록하는 함수"""
+        if not self.directory:
+            return
+        series = self._local_series()
+        if not series:
+            return
+        owner = self._acquire_owner()
+        payload = {
+            "pid": os.getpid(),
+            "owner": owner,
+            "series": [[name, list(labels), values] for (name, labels), values in series.items()],
+        }
+        path = os.path.join(self.directory, f"{owner}.json")
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh)
+        os.replace(tmp_path, path)
+
+    def _flush_loop(self):
+        """주기적으로 스냅샷을 기록하는 백그라운드 루프"""
+        while True:
+            time.sleep(self.flush_seconds)
+            try:
+                self.flush()
+            except OSError:
+                pass
+
+    def collect(self):
+        """
+        모든 워커의 스냅샷을 합산하는 함수 (종료된 워커 파일은 아카이브에 합친 뒤 삭제)
+
+        Returns:
+            dict: (메트릭 이름, 라벨 튜플) -> 값 리스트
+        """
+        self.flush()
+        merged = {}
+        with self._archive_lock():
+            archive = _read_json(os.path.join(self.directory, ARCHIVE_FILE)) or {"series": []}
+            archived = False
+            for name in os.listdir(self.directory):
+                if not name.endswith(".json") or name == ARCHIVE_FILE:
+                    continue
+                path = os.path.join(self.directory, name)
+                data = _read_json(path)
+                if data is None:
+                    continue
+                owner = name[:-5]
+                alive = self._owner_alive(owner)
+                for metric, labels, values in data.get("series", []):
+                    if not alive and FAMILIES.get(metric, ("gauge",))[0] == "gauge":
+                        continue  # 종료된 워커의 처리 중 요청 수는 의미 없음
+                    if alive:
+                        _merge(merged, (metric, tuple(labels)), values)
+                    else:
+                        archive["series"].append([metric, labels, values])
+                if not alive:
+                    archived = True
+                    os.remove(path)
+                    try:
+                        os.remove(self._owner_path(owner))
+                    except OSError:
+                        pass
+            # 스냅샷 없이 종료된 워커의 소유 잠금 파일 정리
+            for name in os.listdir(os.path.join(self.directory, "owners")):
+                owner = name[:-5]
+                if name.endswith(".lock") and not os.path.exists(os.path.join(self.directory, f"{owner}.json")) \
+                        and not self._owner_alive(owner):
+                    try:
+                        os.remove(self._owner_path(owner))
+                    except OSError:
+                        pass
+            if archived:
+                compacted = {}
+                for metric, labels, values in archive["series"]:
+                    _merge(compacted, (metric, tuple(labels)), values)
+                archive = {"series": [[m, list(l), v] for (m, l), v in compacted.items()]}
+                tmp_path = os.path.join(self.directory, f"{ARCHIVE_FILE}.{os.getpid()}.tmp")
+                with open(tmp_path, "w", encoding="utf-8") as fh:
+                    json.dump(archive, fh)
+                os.replace(tmp_path, os.path.join(self.directory, ARCHIVE_FILE))
+        for metric, labels, values in archive["series"]:
+            _merge(merged, (metric, tuple(labels)), values)
+        return merged
+
+    def _archive_lock(self):
+        """아카이브 합치기를 워커 간에 직렬화하는 파일 잠금 컨텍스트"""
+        return _FileLock(os.path.join(self.directory, ".lock"))
+
+    def render(self):
+        """
+        Prometheus 텍스트 형식(0.0.4)으로 메트릭을 내보내는 함수
+
+        Returns:
+            str: 노출 형식 텍스트
+        """
+        merged = self.collect()
+        lines = []
+        for name, (kind, help_text, label_names) in FAMILIES.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            entries = sorted((labels, values) for (metric, labels), values in merged.items() if metric == name)
+            if not entries and kind == "gauge":
+                entries = [((), [0])]
+            for labels, values in entries:
+                pairs = list(zip(label_names, labels))
+                if kind != "histogram":
+                    lines.append(f"{name}{_format_labels(pairs)} {_format_value(values[0])}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), values):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{name}_bucket{_format_labels(pairs + [('le', le)])} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(pairs)} {_format_value(values[-2])}")
+                lines.append(f"{name}_count{_format_labels(pairs)} {values[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+class _FileLock:
+    """fcntl 파일 잠금 컨텍스트 (fcntl이 없으면 프로세스 내 잠금만 적용)"""
+
+    _thread_lock = threading.Lock()
+
+    def __init__(self, path):
+        self._path = path
+        self._fh = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if fcntl is not None:
+            self._fh = open(self._path, "a")
+            fcntl.flock(self._fh.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc_info):
+        try:
+            if self._fh is not None:
+                fcntl.flock(self._fh.fileno(), fcntl.LOCK_UN)
+                self._fh.close()
+        finally:
+            self._thread_lock.release()
+
+
+def _merge(merged, key, values):
+    """값 리스트를 합산 딕셔너리에 더하는 함수"""
+    current = merged.get(key)
+    if current is None:
+        merged[key] = list(values)
+    else:
+        for i, value in enumerate(values):
+            current[i] += value
+
+
+def _read_json(path):
+    """JSON 파일을 읽는 함수 (없거나 손상되면 None)"""
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def _pid_alive(pid):
+    """프로세스가 살아 있는지 확인하는 함수"""
+    if pid <= 0:
+        return False
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _format_labels(pairs):
+    """라벨을 {name="value",...} 형식으로 변환하는 함수 (\\, ", 줄바꿈 이스케이프)"""
+    if not pairs:
+        return ""
+    escaped = (
+        f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34)).replace(chr(10), chr(92) + "n")}"'
+        for name, value in pairs
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value):
+    """숫자를 노출 형식 문자열로 변환하는 함수"""
+    if isinstance(value, float):
+        return repr(round(value, 9))
+    return str(value)
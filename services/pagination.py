@@ -0,0 +1,128 @@
+"""
+페이지네이션 헬퍼 모듈
+키셋(커서) 기반 페이지네이션에 사용하는 불투명 커서 인코딩/디코딩 함수들을 정의합니다.
+
+OFFSET 방식은 앞 페이지의 행을 모두 읽고 버리므로 뒤 페이지일수록 느려집니다.
+커서는 마지막(또는 첫) 행의 정렬 키를 담고 있어 WHERE key > :cursor 조건으로 바로 이어서 조회합니다.
+"""
+
+import base64
+import json
+
+# 커서 진행 방향
+NEXT = "next"
+PREV = "prev"
+
+
+def encode_cursor(key, direction=NEXT, scope=None):
+    """
+    정렬 키를 불투명 커서 문자열로 인코딩하는 함수
+
+    Args:
+        key: 정렬 키 (mid 문자열 또는 [점수, mid] 등 JSON 직렬화 가능한 값)
+        direction (str): 진행 방향 ("next" 또는 "prev")
+        scope (str, optional): 커서를 발급한 조회 범위 (예: "list", "meta", "content")
+
+    Returns:
+        str: URL에 그대로 쓸 수 있는 base64url 커서
+    """
+    payload = {"k": key, "d": direction}
+    if scope is not None:
+        payload["s"] = scope
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token, scope=None, key_check=None):
+    """
+    커서 문자열을 정렬 키와 방향으로 디코딩하는 함수
+
+    다른 엔드포인트(또는 다른 검색 범위)에서 발급한 커서는 정렬 키 형태가 달라
+    그대로 쓰면 SQL 바인딩이나 키 비교에서 실패하므로, 범위와 키 형태를 함께 검증합니다.
+
+    Args:
+        token (str): encode_cursor()로 만든 커서
+        scope (str, optional): 기대하는 조회 범위 (지정하면 커서의 범위와 일치해야 함)
+        key_check (callable, optional): 정렬 키 형태를 검사하는 함수 (예: is_mid_key, is_score_key)
+
+    Returns:
+        tuple: (정렬 키, 진행 방향)
+
+    Raises:
+        ValueError: 커서 형식이 올바르지 않거나 범위/키 형태가 맞지 않는 경우
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+        key, direction = data["k"], data.get("d", NEXT)
+        cursor_scope = data.get("s")
+    except (ValueError, KeyError, TypeError, AttributeError, UnicodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if direction not in (NEXT, PREV) or key is None:
+        raise ValueError("Invalid cursor")
+    if scope is not None and cursor_scope != scope:
+        raise ValueError("Invalid cursor")
+    if key_check is not None and not key_check(key):
+        raise ValueError("Invalid cursor")
+    return key, direction
+
+
+def is_mid_key(key):
+    """
+    mid 키셋 커서의 정렬 키(mid 문자열)인지 확인하는 함수
+
+    Args:
+        key: 커서에서 꺼낸 정렬 키
+
+    Returns:
+        bool: mid 문자열이면 True
+    """
+    return isinstance(key, str)
+
+
+def is_score_key(key):
+    """
+    검색 커서의 정렬 키([점수, mid] 쌍)인지 확인하는 함수
+
+    Args:
+        key: 커서에서 꺼낸 정렬 키
+
+    Returns:
+        bool: [숫자, 문자열] 쌍이면 True
+    """
+    return (
+        isinstance(key, list) and len(key) == 2
+        and isinstance(key[0], (int, float)) and not isinstance(key[0], bool)
+        and isinstance(key[1], str)
+    )
+
+
+def slice_page(rows, per_page, direction, has_previous, key_fn, scope=None):
+    """
+    per_page+1개로 조회한 결과에서 한 페이지를 잘라내고 이전/다음 커서를 만드는 함수
+
+    Args:
+        rows (list): 조회 결과 (이전 방향이면 역순으로 조회된 상태)
+        per_page (int): 페이지당 항목 수
+        direction (str): 조회 방향 ("next" 또는 "prev")
+        has_previous (bool): 다음 방향 조회에서 앞쪽에 항목이 있는지 여부
+        key_fn (callable): 행에서 정렬 키를 꺼내는 함수
+        scope (str, optional): 커서에 기록할 조회 범위
+
+    Returns:
+        tuple: (페이지 행 목록, next_cursor, prev_cursor)
+    """
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if direction == PREV:
+        # 역순으로 조회했으므로 원래 정렬 순서로 되돌림
+        rows.reverse()
+        more_before, more_after = has_more, True
+    else:
+        more_before, more_after = has_previous, has_more
+
+    if not rows:
+        return rows, None, None
+    next_cursor = encode_cursor(key_fn(rows[-1]), NEXT, scope) if more_after else None
+    prev_cursor = encode_cursor(key_fn(rows[0]), PREV, scope) if more_before else None
+    return rows, next_cursor, prev_cursor
@@ -0,0 +1,418 @@
+"""
+PDF 본문 추출 모듈
+msds.file_loc이 가리키는 PDF에서 텍스트를 뽑아 MSDS별로 정규화된 본문을 보관합니다.
+
+- 텍스트 추출(pypdf)은 CPU를 많이 쓰므로 프로세스 풀에서 실행하여 요청/작업 스레드의 GIL을 점유하지 않습니다.
+- 본문은 MSDS마다 작은 JSON 파일(PDF_TEXT_DIR)로 저장하고, 추출 당시의 file_loc을 함께 기록합니다.
+  file_loc이 같으면 다시 추출하지 않고(파일당 한 번), 바뀐 MSDS만 다시 추출합니다.
+- 저장할 때마다 바뀐 mid를 변경 기록(changes.log)에 덧붙인 뒤 "msds_content" 버전을 올려
+  본문 검색 색인(바뀐 MSDS만 다시 색인)과 검색 응답 ETag를 무효화합니다.
+- pypdf는 선택 의존성이며, 없으면 추출 단계만 비활성화됩니다 (pip install pypdf).
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import signal
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from sqlalchemy import text
+
+from services.jobs import JobQueueFull
+from services.search_index import normalize
+
+try:
+    import pypdf  # 선택 의존성 (PDF 텍스트 추출)
+except ImportError:  # pragma: no cover
+    pypdf = None
+
+
+def normalize_text(value):
+    """
+    추출한 본문을 검색용으로 정규화하는 함수 (NFKC + 소문자 + 공백 정리)
+
+    Args:
+        value (str): 원본 텍스트
+
+    Returns:
+        str: 정규화된 텍스트
+    """
+    return " ".join(normalize(value).split())
+
+
+# 워커 안에서 추출 시간만 잴 수 있는지 여부 (POSIX 타이머 시그널, 없으면 호출 측에서 전체 대기 시간으로 제한)
+WORKER_TIMER = hasattr(signal, "setitimer")
+
+
+def _parse_timed_out(signum, frame):
+    """추출 시간 제한 타이머 시그널 핸들러"""
+    raise TimeoutError("PDF text extraction timed out")
+
+
+def extract_text(path, max_chars, timeout=None):
+    """
+    PDF 파일에서 텍스트를 추출하는 함수 (프로세스 풀 워커에서 실행)
+
+    Args:
+        path (str): 로컬 PDF 파일 경로
+        max_chars (int): 보관할 최대 글자 수
+        timeout (float, optional): 추출 시간 제한(초) - 큐 대기 시간은 포함하지 않음
+
+    Returns:
+        tuple: (정규화된 본문, 페이지 수)
+
+    Raises:
+        TimeoutError: 추출이 시간 제한을 넘긴 경우
+    """
+    if not timeout or not WORKER_TIMER:
+        return _extract_text(path, max_chars)
+    # 풀 워커는 작업을 메인 스레드에서 실행하므로 타이머 시그널로 파싱을 중단할 수 있음
+    previous = signal.signal(signal.SIGALRM, _parse_timed_out)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return _extract_text(path, max_chars)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _extract_text(path, max_chars):
+    """PDF를 읽어 (정규화된 본문, 페이지 수)를 반환하는 함수"""
+    reader = pypdf.PdfReader(path)
+    parts = []
+    length = 0
+    for page in reader.pages:
+        page_text = page.extract_text() or ""
+        parts.append(page_text)
+        length += len(page_text)
+        if length >= max_chars * 2:  # 정규화로 줄어드는 분량을 고려해 여유 있게 읽고 중단
+            break
+    return normalize_text(" ".join(parts))[:max_chars], len(reader.pages)
+
+
+# 변경 기록 파일 최대 크기 (넘으면 새 파일로 시작하며, 읽던 색인은 전체를 다시 구성)
+CHANGE_LOG_MAX_BYTES = 1024 * 1024
+
+
+class PdfTextStore:
+    """
+    PDF 본문 저장소 클래스
+
+    - extract(mid, file_loc)는 저장된 본문이 같은 file_loc에서 추출된 것이면 건너뛰고,
+      아니면 PDF를 로컬 콘텐츠 캐시로 내려받아 프로세스 풀에서 추출한 뒤 저장합니다.
+    - schedule(mid, file_loc)은 업로드 직후 추출을 작업 큐에 등록합니다.
+    - backfill(engine)은 file_loc이 있는 전체 MSDS 중 본문이 없거나 file_loc이 바뀐 항목만 추출합니다.
+    """
+
+    def __init__(self, registry, content_cache, versions, jobs, app=None):
+        self._registry = registry
+        self._content_cache = content_cache
+        self._versions = versions
+        self._jobs = jobs
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self.directory = None
+        self.bucket = "msds"
+        self.workers = 2
+        self.max_chars = 200000
+        self.timeout = 120
+        self._logger = None
+        self._stats = {"extracted": 0, "skipped": 0, "failed": 0, "dropped": 0, "timeouts": 0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Flask 애플리케이션에 본문 저장소를 등록하는 함수
+
+        Args:
+            app (Flask): Flask 애플리케이션 인스턴스
+        """
+        self.directory = os.path.abspath(app.config.get("PDF_TEXT_DIR") or os.path.join(app.instance_path, "pdf_text"))
+        self.bucket = app.config.get("SUPABASE_BUCKET", "msds")
+        self.workers = max(int(app.config.get("PDF_TEXT_WORKERS", 2)), 1)
+        self.max_chars = int(app.config.get("PDF_TEXT_MAX_CHARS", 200000))
+        self.timeout = float(app.config.get("PDF_TEXT_TIMEOUT", 120))
+        os.makedirs(self.directory, exist_ok=True)
+        self._logger = app.logger
+        # 추출 작업은 전용 큐/워커로 처리 (업로드 작업의 큐 자리와 워커를 차지하지 않도록)
+        self._jobs.add_lane("pdf_text", workers=self.workers, maxsize=app.config.get("PDF_TEXT_QUEUE_SIZE", 256))
+        app.extensions["pdf_texts"] = self
+
+    @property
+    def available(self):
+        """텍스트 추출 가능 여부 (pypdf 설치 여부)"""
+        return pypdf is not None
+
+    # --- 저장 ---
+
+    def record_path(self, mid):
+        """MSDS 본문 파일 경로 (mid를 해시하여 파일명으로 사용)"""
+        return os.path.join(self.directory, hashlib.sha1(mid.encode("utf-8")).hexdigest() + ".json")
+
+    @property
+    def changes_path(self):
+        """본문 변경 기록 파일 경로 (한 줄에 mid 하나)"""
+        return os.path.join(self.directory, "changes.log")
+
+    def _log_change(self, mid):
+        """
+        본문이 바뀐 mid를 변경 기록에 덧붙이는 함수 (버전을 올리기 전에 호출)
+        O_APPEND로 한 줄씩 쓰므로 여러 프로세스가 동시에 기록해도 줄이 섞이지 않습니다.
+        """
+        path = self.changes_path
+        try:
+            if os.path.getsize(path) > CHANGE_LOG_MAX_BYTES:
+                os.remove(path)
+        except OSError:
+            pass
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, (mid.replace("\n", " ") + "\n").encode("utf-8"))
+        finally:
+            os.close(fd)
+
+    def get(self, mid):
+        """
+        저장된 본문 기록을 반환하는 함수
+
+        Args:
+            mid (str): MSDS ID
+
+        Returns:
+            dict or None: {mid, file_loc, text, pages, error, extracted_at}
+        """
+        try:
+            with open(self.record_path(mid), "r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, record):
+        """본문 기록을 임시 파일에 쓴 뒤 교체하고 본문 버전을 올리는 함수"""
+        path = self.record_path(record["mid"])
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(record, fh, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self._log_change(record["mid"])
+        self._versions.bump("msds_content")
+
+    def remove(self, mid):
+        """
+        본문 기록을 삭제하는 함수 (MSDS/PDF 삭제 시 호출)
+
+        Args:
+            mid (str): MSDS ID
+        """
+        try:
+            os.remove(self.record_path(mid))
+        except OSError:
+            return
+        self._log_change(mid)
+        self._versions.bump("msds_content")
+
+    def is_current(self, mid, file_loc):
+        """저장된 본문이 같은 file_loc에서 추출된 것인지 확인하는 함수"""
+        record = self.get(mid)
+        return record is not None and record.get("file_loc") == file_loc
+
+    # --- 추출 ---
+
+    def _pool(self):
+        """현재 프로세스의 추출 프로세스 풀을 반환하는 함수 (fork 이후에는 새로 생성)"""
+        with self._lock:
+            if self._pid != os.getpid():
+                # spawn: 스레드가 있는 프로세스를 fork하지 않도록 새 인터프리터로 시작
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+    def _recycle_pool(self, executor):
+        """
+        시간 초과/손상된 프로세스 풀을 버리는 함수 (다음 추출은 새 풀에서 실행)
+        멈춘 워커가 다음 추출의 자리를 계속 차지하지 않도록 워커 프로세스를 종료합니다.
+        """
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+                self._pid = None
+        # ProcessPoolExecutor는 실행 중인 작업을 중단하는 공개 API가 없어 워커 프로세스를 직접 종료
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            try:
+                process.terminate()
+            except Exception:
+                pass
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _local_copy(self, file_loc):
+        """
+        PDF의 로컬 파일 경로를 얻는 함수 (콘텐츠 캐시를 거치며, 캐시 비활성화 시 임시 파일로 내려받음)
+
+        Returns:
+            tuple: (로컬 경로, 임시 파일 여부)
+        """
+        entry = self._content_cache.fetch(self.bucket, file_loc)
+        if entry is not None:
+            return entry.file_path, False
+        upstream = self._registry.open_stream(self.bucket, file_loc, {"Accept-Encoding": "identity"})
+        try:
+            if upstream.status_code != 200:
+                raise FileNotFoundError(f"Storage returned {upstream.status_code} for {file_loc}")
+            fd, tmp_path = tempfile.mkstemp(suffix=".pdf")
+            with os.fdopen(fd, "wb") as fh:
+                for chunk in upstream.iter_raw(64 * 1024):
+                    fh.write(chunk)
+            return tmp_path, True
+        finally:
+            upstream.close()
+
+    def extract(self, mid, file_loc, force=False):
+        """
+        MSDS 하나의 PDF 본문을 추출하여 저장하는 함수
+
+        Args:
+            mid (str): MSDS ID
+            file_loc (str): PDF 스토리지 경로
+            force (bool): 같은 file_loc이어도 다시 추출할지 여부
+
+        Returns:
+            dict: 저장된 본문 기록 (텍스트 제외 요약: mid, file_loc, pages, chars, error, skipped)
+
+        Raises:
+            RuntimeError: pypdf가 설치되지 않은 경우
+            TimeoutError: 추출 시간 초과 (기록하지 않으므로 다음 백필에서 재시도)
+            BrokenProcessPool: 추출 워커가 비정상 종료된 경우 (기록하지 않으므로 다음 백필에서 재시도)
+        """
+        if pypdf is None:
+            raise RuntimeError("pypdf is not installed (pip install pypdf)")
+        if not force and self.is_current(mid, file_loc):
+            with self._lock:
+                self._stats["skipped"] += 1
+            return {"mid": mid, "file_loc": file_loc, "skipped": True}
+
+        record = {"mid": mid, "file_loc": file_loc, "text": "", "pages": 0, "error": None}
+        # 스토리지 오류는 기록하지 않고 예외로 전달 (일시적 오류이므로 다음 백필에서 재시도)
+        local_path, temporary = self._local_copy(file_loc)
+        executor = self._pool()
+        try:
+            future = executor.submit(extract_text, local_path, self.max_chars, self.timeout)
+            # 워커가 파싱 시간만 제한하므로 큐 대기 시간은 기다림 (타이머가 없는 플랫폼만 전체 대기 시간으로 제한)
+            record["text"], record["pages"] = future.result(timeout=None if WORKER_TIMER else self.timeout)
+        except (TimeoutError, FutureTimeoutError, BrokenProcessPool) as e:
+            # 시간 초과/워커 비정상 종료는 PDF 자체의 오류로 확정할 수 없으므로 기록하지 않고 전달 (다음 백필에서 재시도)
+            # 워커 안의 타이머로 끝난 경우만 풀이 정상이고, 그 밖에는 멈추거나 죽은 워커가 남아 있으므로 풀을 교체
+            if not (isinstance(e, TimeoutError) and WORKER_TIMER):
+                self._recycle_pool(executor)
+            with self._lock:
+                self._stats["timeouts"] += 1
+            raise
+        except Exception as e:
+            # 손상/암호화된 PDF 등은 오류와 함께 기록하여 같은 파일을 반복 처리하지 않음
+            record["error"] = str(e) or e.__class__.__name__
+        finally:
+            if temporary:
+                try:
+                    os.remove(local_path)
+                except OSError:
+                    pass
+        record["extracted_at"] = time.time()
+        self._save(record)
+        with self._lock:
+            self._stats["failed" if record["error"] else "extracted"] += 1
+        return {"mid": mid, "file_loc": file_loc, "pages": record["pages"],
+                "chars": len(record["text"]), "error": record["error"], "skipped": False}
+
+    def schedule(self, mid, file_loc):
+        """
+        본문 추출을 전용 작업 큐에 등록하는 함수 (업로드 직후 호출, 큐가 가득 차면 기록하고 백필에 맡김)
+
+        Args:
+            mid (str): MSDS ID
+            file_loc (str): PDF 스토리지 경로
+
+        Returns:
+            dict or None: 등록된 작업 기록
+        """
+        if pypdf is None or not file_loc:
+            return None
+        try:
+            return self._jobs.submit("pdf_text", lambda job: self.extract(mid, file_loc),
+                                     meta={"mid": mid, "file_loc": file_loc})
+        except JobQueueFull:
+            with self._lock:
+                self._stats["dropped"] += 1
+            if self._logger is not None:
+                self._logger.warning("pdf text queue is full, skipped %s (%s) - run `pdf-text backfill`", mid, file_loc)
+            return None
+
+    def backfill(self, engine, force=False, retry_failed=False, progress=None):
+        """
+        file_loc이 있는 MSDS 중 본문이 없거나 file_loc이 바뀐 항목만 추출하는 함수
+        내려받기(I/O)는 스레드로 겹치고, 추출은 프로세스 풀 워커 수만큼 동시에 실행됩니다.
+
+        Args:
+            engine: SQLAlchemy 엔진
+            force (bool): 모든 PDF를 다시 추출할지 여부
+            retry_failed (bool): 이전에 실패한 PDF를 다시 추출할지 여부
+            progress (callable, optional): MSDS마다 추출 결과 요약으로 호출되는 콜백
+
+        Returns:
+            dict: checked, extracted, skipped, failed, removed 건수
+        """
+        with engine.connect() as con:
+            rows = con.execute(text("SELECT mid, file_loc FROM msds")).all()
+
+        summary = {"checked": len(rows), "extracted": 0, "skipped": 0, "failed": 0, "removed": 0}
+        todo = []
+        for mid, file_loc in rows:
+            record = self.get(mid)
+            if not file_loc:
+                if record is not None:
+                    self.remove(mid)
+                    summary["removed"] += 1
+                continue
+            stale = record is None or record.get("file_loc") != file_loc
+            if force or stale or (retry_failed and record.get("error")):
+                todo.append((mid, file_loc))
+            else:
+                summary["skipped"] += 1
+
+        def run(item):
+            try:
+                return self.extract(*item, force=True)
+            except Exception as e:
+                return {"mid": item[0], "file_loc": item[1], "error": str(e) or e.__class__.__name__}
+
+        with ThreadPoolExecutor(max_workers=self.workers * 2) as threads:
+            for result in threads.map(run, todo):
+                summary["failed" if result.get("error") else "extracted"] += 1
+                if progress:
+                    progress(result)
+        return summary
+
+    def stats(self):
+        """
+        추출 통계를 반환하는 함수
+
+        Returns:
+            dict: 추출/건너뜀/실패/큐 초과로 건너뛴 수, 저장된 본문 수, pypdf 사용 가능 여부
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        try:
+            stats["documents"] = sum(1 for name in os.listdir(self.directory) if name.endswith(".json"))
+        except OSError:
+            stats["documents"] = 0
+        stats["available"] = self.available
+        stats["workers"] = self.workers
+        return stats
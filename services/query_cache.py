@@ -0,0 +1,85 @@
+"""
+쿼리 결과 캐시 모듈
+테이블 버전 카운터에 묶인 프로세스 내 캐시를 정의합니다.
+
+항목은 저장 당시의 테이블 버전 토큰과 함께 보관되며, 쓰기 라우트가 버전을 올리면
+다음 조회에서 토큰이 달라지므로 자동으로 무효화됩니다.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class VersionedCache:
+    """
+    테이블 버전 기반 캐시 클래스
+
+    - get_or_load(key, tables, loader): 현재 버전 토큰과 일치하는 항목이 있으면 반환하고,
+      없으면 loader()를 호출해 결과를 저장합니다.
+    - ttl이 지나면 버전이 같아도 다시 읽습니다 (DB를 직접 수정한 경우 대비).
+    - 최대 항목 수를 넘으면 가장 오래 사용되지 않은 항목부터 제거합니다.
+    """
+
+    def __init__(self, versions, app=None):
+        self._versions = versions
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (버전 토큰, 만료 시각, 값)
+        self.maxsize = 1024
+        self.ttl = 300
+        self._stats = {"hits": 0, "misses": 0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Flask 애플리케이션에 쿼리 캐시를 등록하는 함수
+
+        Args:
+            app (Flask): Flask 애플리케이션 인스턴스
+        """
+        self.maxsize = int(app.config.get("QUERY_CACHE_SIZE", 1024))
+        self.ttl = int(app.config.get("QUERY_CACHE_TTL", 300))
+        app.extensions["query_cache"] = self
+
+    def get_or_load(self, key, tables, loader):
+        """
+        캐시된 값을 반환하거나 loader로 새로 읽어 저장하는 함수
+
+        Args:
+            key: 캐시 키 (해시 가능한 값, 예: ("count", "msds"))
+            tables (tuple): 값이 의존하는 테이블명들
+            loader (callable): 캐시 미스 시 값을 읽는 함수
+
+        Returns:
+            tuple: (값, 버전 토큰)
+        """
+        token = self._versions.token(*tables)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == token and entry[1] > now:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry[2], token
+            self._stats["misses"] += 1
+
+        value = loader()
+        with self._lock:
+            self._entries[key] = (token, now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value, token
+
+    def stats(self):
+        """
+        캐시 통계를 반환하는 함수
+
+        Returns:
+            dict: 적중·미스 횟수와 현재 항목 수
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        return stats
@@ -0,0 +1,377 @@
+"""
+데이터 접근(리포지토리) 모듈
+라우트와 작업 함수가 공통으로 사용하는 요청 단위 데이터 접근 계층을 정의합니다.
+
+- 요청(앱 컨텍스트)마다 Repository 하나를 만들고, 첫 쿼리 때 연결을 한 번만 체크아웃하여
+  요청이 끝날 때(teardown_appcontext) 반환합니다. 헬퍼마다 연결을 열고 닫던 방식보다 풀 체크아웃이 줄어듭니다.
+- 쓰기는 transaction() 블록 안에서 실행하며, 블록이 중첩되면 SAVEPOINT를 사용합니다.
+- SQL 문자열은 statement()로 text() 객체를 한 번만 만들어 재사용하고, IN 목록은 확장(expanding) 바인드 파라미터를
+  사용하므로 목록 길이가 달라도 SQL 문자열(과 SQLAlchemy 컴파일 캐시 키)이 같습니다.
+- Loader는 같은 요청 안의 키 조회를 IN 쿼리 한 번으로 합치고 결과를 기억합니다 (DataLoader 방식).
+"""
+
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+
+from flask import g
+from sqlalchemy import bindparam, text
+
+from services.attachments import IN_CHUNK_SIZE, load_attachments
+
+# 재사용할 SQL 문 최대 개수 (동적 WHERE 조합 등을 포함해도 충분한 크기)
+STATEMENT_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def statement(sql, expanding=()):
+    """
+    SQL 문자열을 text() 객체로 만들어 캐시하는 함수
+
+    Args:
+        sql (str): SQL 문 (:name 바인드 파라미터 사용)
+        expanding (tuple): IN 목록으로 펼칠 파라미터 이름들 (예: ("mids",) → "mid IN :mids")
+
+    Returns:
+        TextClause: 실행 가능한 SQL 문
+    """
+    clause = text(sql)
+    if expanding:
+        clause = clause.bindparams(*(bindparam(name, expanding=True) for name in expanding))
+    return clause
+
+
+class Loader:
+    """
+    요청 단위 일괄 조회 클래스 (DataLoader 방식)
+
+    - load_many(keys)는 아직 읽지 않은 키만 모아 batch_fn으로 한 번에(IN_CHUNK_SIZE씩) 조회합니다.
+    - 한 번 읽은 키(없는 키 포함)는 요청이 끝날 때까지 다시 조회하지 않으며, 쓰기가 커밋되면 비워집니다.
+    """
+
+    def __init__(self, batch_fn, owner=None, copy=None):
+        self._batch_fn = batch_fn   # 키 목록 -> {키: 값} (없는 키는 생략)
+        self._owner = owner         # 통계 기록용 Repositories
+        self._copy = copy           # 캐시된 값을 호출 측이 수정해도 되도록 복사하는 함수
+        self._cache = {}
+
+    def load_many(self, keys):
+        """
+        여러 키의 값을 조회하는 함수
+
+        Args:
+            keys (list): 조회할 키 목록 (중복 허용)
+
+        Returns:
+            list: 키 순서대로의 값 (없는 키는 None)
+        """
+        missing = [key for key in dict.fromkeys(keys) if key not in self._cache]
+        if self._owner is not None:
+            self._owner._count("loader_hits", len(keys) - len(missing))
+        for start in range(0, len(missing), IN_CHUNK_SIZE):
+            chunk = missing[start:start + IN_CHUNK_SIZE]
+            found = self._batch_fn(chunk)
+            if self._owner is not None:
+                self._owner._count("loader_batches")
+            for key in chunk:
+                self._cache[key] = found.get(key)
+        values = [self._cache[key] for key in keys]
+        if self._copy is not None:
+            values = [self._copy(value) if value is not None else None for value in values]
+        return values
+
+    def load(self, key):
+        """
+        키 하나의 값을 조회하는 함수
+
+        Args:
+            key: 조회할 키
+
+        Returns:
+            값 또는 None
+        """
+        return self.load_many([key])[0]
+
+    def clear(self):
+        """기억한 결과를 모두 비우는 함수 (쓰기 후 호출)"""
+        self._cache.clear()
+
+
+class Repository:
+    """
+    요청 단위 데이터 접근 클래스
+
+    - all/one/scalar는 읽기, write는 쓰기 SQL을 실행합니다 (write는 트랜잭션 밖이면 자체 트랜잭션으로 감쌈).
+    - msds(mid -> 행), attachments(mid -> 첨부파일 목록)는 요청 안에서 결과를 기억하는 Loader입니다.
+    - release()는 연결을 풀에 먼저 돌려주며, 이후 쿼리가 있으면 다시 체크아웃합니다
+      (스토리지 다운로드/PDF 생성처럼 오래 걸리는 작업 동안 연결을 붙잡지 않기 위해 사용).
+    - 앱 컨텍스트 밖(스크립트 등)에서는 with Repository(db.engine) as repo: 형태로 사용합니다.
+    """
+
+    def __init__(self, engine, owner=None):
+        self._engine = engine
+        self._owner = owner
+        self._connection = None
+        self._depth = 0  # 중첩된 transaction() 깊이
+        self.msds = Loader(self._load_msds, owner, copy=dict)
+        self.attachments = Loader(self._load_attachments, owner)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def dialect(self):
+        """데이터베이스 종류 (mysql, sqlite 등)"""
+        return self._engine.dialect.name
+
+    @property
+    def connection(self):
+        """이 요청의 연결 (처음 사용할 때 풀에서 체크아웃)"""
+        if self._connection is None:
+            self._connection = self._engine.connect()
+            if self._owner is not None:
+                self._owner._count("connections")
+        return self._connection
+
+    # --- 실행 ---
+
+    def execute(self, sql, params=None, expanding=()):
+        """
+        SQL을 실행하고 결과 객체를 반환하는 함수
+
+        Args:
+            sql (str): SQL 문
+            params (dict or list, optional): 바인드 파라미터 (리스트면 executemany)
+            expanding (tuple): IN 목록으로 펼칠 파라미터 이름들
+
+        Returns:
+            CursorResult: 실행 결과
+        """
+        if self._owner is not None:
+            self._owner._count("statements")
+        return self.connection.execute(statement(sql, expanding), params or {})
+
+    def all(self, sql, params=None, expanding=()):
+        """
+        여러 행을 조회하는 함수
+
+        Returns:
+            list: 행 딕셔너리 리스트
+        """
+        return [dict(row) for row in self.execute(sql, params, expanding).mappings()]
+
+    def one(self, sql, params=None, expanding=()):
+        """
+        첫 행을 조회하는 함수
+
+        Returns:
+            dict or None: 행 딕셔너리 (없으면 None)
+        """
+        row = self.execute(sql, params, expanding).mappings().first()
+        return dict(row) if row else None
+
+    def scalar(self, sql, params=None, expanding=()):
+        """
+        첫 행의 첫 컬럼 값을 조회하는 함수
+
+        Returns:
+            값 또는 None
+        """
+        return self.execute(sql, params, expanding).scalar()
+
+    def write(self, sql, params=None, expanding=()):
+        """
+        INSERT/UPDATE/DELETE를 실행하는 함수 (transaction() 밖이면 이 문장만으로 커밋)
+
+        Returns:
+            int: 영향받은 행 수
+        """
+        with self.transaction():
+            return self.execute(sql, params, expanding).rowcount
+
+    def stream(self, sql, chunk_size, params=None):
+        """
+        서버 측 커서(stream_results)로 결과를 청크 단위로 읽는 제너레이터
+        스트리밍 중인 연결에서는 다른 쿼리를 실행할 수 없으므로 별도 연결을 사용하고,
+        청크 사이의 다른 조회(첨부파일 등)는 이 요청의 연결에서 실행됩니다.
+
+        Args:
+            sql (str): SELECT 문
+            chunk_size (int): 한 번에 가져올 행 수
+            params (dict, optional): 바인드 파라미터
+
+        Yields:
+            list: 행 딕셔너리 리스트 (최대 chunk_size개)
+        """
+        with self._engine.connect() as con:
+            if self._owner is not None:
+                self._owner._count("connections")
+                self._owner._count("statements")
+            result = con.execution_options(stream_results=True, yield_per=chunk_size).execute(
+                statement(sql), params or {}
+            )
+            for partition in result.mappings().partitions(chunk_size):
+                yield [dict(row) for row in partition]
+
+    @contextmanager
+    def transaction(self):
+        """
+        쓰기 트랜잭션 블록 (예외가 나면 롤백, 정상 종료 시 커밋)
+        이미 트랜잭션 블록 안이면 SAVEPOINT를 만들어 이 블록만 되돌릴 수 있게 합니다.
+
+        Yields:
+            Connection: 이 요청의 연결 (executemany/begin_nested 등 직접 사용 가능)
+        """
+        con = self.connection
+        if self._depth:
+            trans = con.begin_nested()
+        else:
+            if con.in_transaction():
+                # 앞선 읽기로 자동 시작된 트랜잭션을 끝내고 쓰기 트랜잭션을 새로 시작
+                con.commit()
+            trans = con.begin()
+        self._depth += 1
+        try:
+            yield con
+        except BaseException:
+            if trans.is_active:
+                trans.rollback()
+            raise
+        else:
+            trans.commit()
+        finally:
+            self._depth -= 1
+            # 바뀐 행을 다시 읽도록 기억한 조회 결과를 비움
+            self.msds.clear()
+            self.attachments.clear()
+
+    def release(self):
+        """연결을 풀에 돌려주는 함수 (열린 읽기 트랜잭션은 롤백, 이후 쿼리 시 다시 체크아웃)"""
+        if self._connection is not None and not self._depth:
+            self._connection.close()
+            self._connection = None
+
+    def close(self):
+        """연결을 닫는 함수 (요청 종료 시 호출, 커밋되지 않은 변경은 롤백)"""
+        self._depth = 0
+        self.release()
+
+    # --- 일괄 조회 ---
+
+    def _load_msds(self, mids):
+        """MSDS 행을 IN 쿼리 한 번으로 읽는 함수 (Loader 배치 함수)"""
+        rows = self.all("SELECT * FROM msds WHERE mid IN :mids", {"mids": mids}, expanding=("mids",))
+        return {row["mid"]: row for row in rows}
+
+    def _load_attachments(self, mids):
+        """첨부파일을 IN 쿼리로 읽는 함수 (Loader 배치 함수, 첨부파일이 없는 mid는 빈 리스트)"""
+        if self._owner is not None:
+            self._owner._count("statements", -(-len(mids) // IN_CHUNK_SIZE))
+        return load_attachments(self.connection, mids)
+
+    def msds_rows(self, mids):
+        """
+        여러 MSDS를 주어진 mid 순서대로 조회하는 함수
+
+        Args:
+            mids (list): MSDS ID 목록 (정렬 순서 유지)
+
+        Returns:
+            list: MSDS 행 딕셔너리 리스트 (없는 mid는 제외)
+        """
+        return [row for row in self.msds.load_many(mids) if row is not None]
+
+    def attachments_of(self, mids, newest_first=False, remember=True):
+        """
+        여러 MSDS의 첨부파일을 응답용 딕셔너리로 조회하는 함수
+
+        Args:
+            mids (list): MSDS ID 목록
+            newest_first (bool): True면 연결 시각 최신순, False면 aid 순
+            remember (bool): False면 Loader에 기억하지 않음 (전체 내보내기처럼 한 번만 읽는 대량 조회)
+
+        Returns:
+            dict: MSDS ID -> 첨부파일 딕셔너리 리스트
+        """
+        if remember:
+            loaded = dict(zip(mids, self.attachments.load_many(mids)))
+        else:
+            loaded = self._load_attachments(mids)
+        result = {}
+        for mid, atts in loaded.items():
+            atts = atts or []
+            if newest_first:
+                # 연결 시각 최신순 (같은 시각은 aid 순, 시각이 없으면 마지막 - MySQL DESC 정렬과 동일)
+                atts = sorted(atts, key=lambda a: (a.created_at is not None, a.created_at), reverse=True)
+            result[mid] = [att.to_dict() for att in atts]
+        return result
+
+
+class Repositories:
+    """
+    요청 단위 Repository 관리 클래스
+
+    - current()는 현재 앱 컨텍스트(요청 또는 작업 큐 워커)의 Repository를 반환합니다 (없으면 생성).
+    - 앱 컨텍스트가 끝나면 연결을 풀에 반환합니다.
+    - 통계는 프로세스(gunicorn 워커)별입니다.
+    """
+
+    def __init__(self, db, app=None):
+        self._db = db
+        self._lock = threading.Lock()
+        self._stats = {
+            "repositories": 0, "connections": 0, "statements": 0, "loader_batches": 0, "loader_hits": 0,
+        }
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Flask 애플리케이션에 요청 단위 Repository를 등록하는 함수
+
+        Args:
+            app (Flask): Flask 애플리케이션 인스턴스
+        """
+        app.teardown_appcontext(self._teardown)
+        app.extensions["repositories"] = self
+
+    def current(self):
+        """
+        현재 앱 컨텍스트의 Repository를 반환하는 함수
+
+        Returns:
+            Repository: 요청 단위 Repository
+        """
+        repo = g.get("_repository")
+        if repo is None:
+            repo = g._repository = Repository(self._db.engine, self)
+            self._count("repositories")
+        return repo
+
+    def _teardown(self, _exc):
+        """앱 컨텍스트 종료 시 연결을 반환하는 함수"""
+        repo = g.pop("_repository", None)
+        if repo is not None:
+            repo.close()
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def stats(self):
+        """
+        데이터 접근 통계를 반환하는 함수
+
+        Returns:
+            dict: Repository/연결 체크아웃/실행 문장/Loader 일괄 조회·재사용 수, SQL 문 캐시 현황
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        info = statement.cache_info()
+        stats["statement_cache"] = {
+            "hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize,
+        }
+        return stats
@@ -0,0 +1,656 @@
+"""
+MSDS 검색 엔진 모듈
+title, usage, mid를 대상으로 하는 프로세스 내 역색인(inverted index)을 정의합니다.
+
+LIKE '%q%' 검색은 인덱스를 쓸 수 없는 전체 테이블 스캔이므로, 문자 바이그램(2-gram)으로
+역색인을 만들어 한글 부분 문자열도 찾을 수 있게 하고 BM25 점수로 결과를 정렬합니다.
+"""
+
+import heapq
+import math
+import os
+import threading
+import time
+import unicodedata
+from collections import Counter
+
+from sqlalchemy import text
+
+# 필드별 가중치 (제목 일치를 가장 높게 평가)
+FIELD_WEIGHTS = {"title": 2.0, "mid": 1.5, "usage": 1.0}
+
+# BM25 파라미터
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def normalize(value):
+    """
+    검색용 문자열 정규화 함수 (NFKC 정규화 + 소문자 변환)
+
+    Args:
+        value (str): 원본 문자열
+
+    Returns:
+        str: 정규화된 문자열
+    """
+    if not value:
+        return ""
+    return unicodedata.normalize("NFKC", str(value)).lower().strip()
+
+
+# 한 글자 토큰 접두어 (바이그램과 구분하여 한 글자 검색어에만 사용)
+CHAR_PREFIX = "\x00"
+
+
+def ngrams(value):
+    """
+    문자열을 문자 바이그램 목록으로 변환하는 함수
+    공백으로 나눈 단어마다 바이그램을 만들고, 한 글자 단어는 한 글자 토큰으로 변환합니다.
+
+    Args:
+        value (str): 정규화된 문자열
+
+    Returns:
+        list: 바이그램(또는 한 글자) 토큰 목록
+    """
+    tokens = []
+    for word in value.split():
+        if len(word) == 1:
+            tokens.append(CHAR_PREFIX + word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def _rank(scored, offset=0, limit=None, after=None, before=None):
+    """
+    (-점수, mid) 키 목록을 정렬하여 요청한 구간만 반환하는 함수 (키셋/오프셋 페이지네이션 공용)
+
+    Args:
+        scored (list): (-점수, mid) 튜플 목록
+        offset (int): 건너뛸 결과 수
+        limit (int, optional): 반환할 최대 결과 수
+        after (list, optional): 이 정렬 키 다음 결과부터 반환
+        before (list, optional): 이 정렬 키 직전 결과까지 반환
+
+    Returns:
+        tuple: (전체 일치 수, [(mid, 정렬 키), ...] 정렬 키 오름차순)
+    """
+    total = len(scored)
+    if after is not None:
+        after = tuple(after)
+        scored = [key for key in scored if key > after]
+    if before is not None:
+        before = tuple(before)
+        scored = [key for key in scored if key < before]
+        # 커서 바로 앞의 limit개를 고른 뒤 오름차순으로 정렬
+        ranked = sorted(scored if limit is None else heapq.nlargest(limit, scored))
+    elif limit is None:
+        ranked = sorted(scored)[offset:]
+    else:
+        # 필요한 상위 결과만 부분 정렬
+        ranked = heapq.nsmallest(offset + limit, scored)[offset:]
+    return total, [(mid, [neg_score, mid]) for neg_score, mid in ranked]
+
+
+class SearchIndex:
+    """
+    MSDS 역색인 클래스
+
+    - 바이그램 역색인으로 후보를 좁힌 뒤, 질의 전체(공백 포함)가 한 필드에 부분 문자열로 포함되는 문서만 남깁니다
+      (기존 LIKE '%q%' 검색과 같은 결과를 보장).
+    - 남은 문서를 필드 가중치를 적용한 BM25 점수로 정렬합니다.
+    - 생성/수정/삭제 라우트가 upsert()/remove()로 색인을 즉시 갱신하고 advance()로 반영한 "msds" 버전을 기록합니다.
+      다른 워커나 CLI 가져오기가 버전을 올리면 다음 검색 전에 전체 재구성합니다 (검색 ETag와 같은 버전 기준).
+    - 재구성 중에 들어온 upsert()/remove()는 기록해 두었다가 새 색인으로 교체하기 직전에 다시 적용합니다.
+    """
+
+    def __init__(self, versions=None, app=None):
+        self._versions = versions
+        self._lock = threading.RLock()
+        self._build_lock = threading.RLock()  # 전체 재구성은 한 번에 하나만 실행
+        self._postings = {}  # 토큰 -> {mid: 가중 빈도}
+        self._docs = {}      # mid -> (정규화된 필드 문자열 dict, 문서 길이, 토큰 집합)
+        self._total_len = 0.0
+        self._built_at = None
+        self._version = None  # 색인이 반영한 "msds" 테이블 버전
+        self._journal = None  # 재구성 중 들어온 변경 [(mid, title, usage, 삭제 여부), ...]
+        self.refresh_seconds = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Flask 애플리케이션에 검색 색인을 등록하는 함수
+
+        Args:
+            app (Flask): Flask 애플리케이션 인스턴스
+        """
+        self.refresh_seconds = int(app.config.get("SEARCH_INDEX_REFRESH_SECONDS", 300))
+        app.extensions["search_index"] = self
+
+    # --- 색인 구성 ---
+
+    def _add(self, mid, title, usage):
+        """문서를 색인에 추가하는 함수 (호출 측에서 잠금 보유)"""
+        fields = {"title": normalize(title), "usage": normalize(usage), "mid": normalize(mid)}
+        weights = {}
+        length = 0.0
+        for field, value in fields.items():
+            weight = FIELD_WEIGHTS[field]
+            for token in ngrams(value):
+                if token.startswith(CHAR_PREFIX):
+                    continue  # 한 글자 토큰은 아래에서 따로 집계
+                weights[token] = weights.get(token, 0.0) + weight
+                length += weight
+            # 한 글자 검색어용 토큰 (문서 길이에는 포함하지 않음)
+            for char in set(value.replace(" ", "")):
+                token = CHAR_PREFIX + char
+                weights[token] = weights.get(token, 0.0) + weight * value.count(char)
+        for token, tf in weights.items():
+            self._postings.setdefault(token, {})[mid] = tf
+        self._docs[mid] = (fields, length, tuple(weights))
+        self._total_len += length
+
+    def _remove(self, mid):
+        """문서를 색인에서 제거하는 함수 (호출 측에서 잠금 보유)"""
+        doc = self._docs.pop(mid, None)
+        if not doc:
+            return
+        self._total_len -= doc[1]
+        for token in doc[2]:
+            posting = self._postings.get(token)
+            if posting is not None:
+                posting.pop(mid, None)
+                if not posting:
+                    del self._postings[token]
+
+    def upsert(self, mid, title, usage):
+        """
+        문서를 추가하거나 갱신하는 함수 (생성/수정 라우트에서 호출)
+
+        Args:
+            mid (str): MSDS ID
+            title (str): MSDS 제목
+            usage (str): 용도
+        """
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append((mid, title, usage, False))
+            if self._built_at is None:
+                return  # 아직 색인이 없으면 첫 검색 때 전체 구성
+            self._remove(mid)
+            self._add(mid, title, usage)
+
+    def remove(self, mid):
+        """
+        문서를 색인에서 제거하는 함수 (삭제 라우트에서 호출)
+
+        Args:
+            mid (str): MSDS ID
+        """
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append((mid, None, None, True))
+            self._remove(mid)
+
+    def advance(self, version):
+        """
+        이 워커의 쓰기로 올린 "msds" 버전을 색인에 기록하는 함수 (upsert()/remove() 적용 후 호출)
+        바로 직전 버전까지 반영된 상태일 때만 기록하므로, 그 사이 다른 워커의 변경이 있었다면 다음 검색 때 재구성됩니다.
+
+        Args:
+            version (int): bump()가 반환한 새 "msds" 버전
+        """
+        with self._lock:
+            if self._version is not None and self._version == version - 1:
+                self._version = version
+
+    def rebuild(self, engine):
+        """
+        데이터베이스에서 전체 MSDS를 읽어 색인을 새로 구성하는 함수
+
+        Args:
+            engine: SQLAlchemy 엔진
+
+        Returns:
+            int: 색인된 문서 수
+        """
+        with self._build_lock:
+            # 버전은 읽기 전에 기록 (읽는 동안의 변경은 버전이 달라져 다음 검색 때 다시 확인)
+            version = self._versions.get("msds") if self._versions is not None else None
+            with self._lock:
+                self._journal = []
+            try:
+                # 새 색인을 별도로 만든 뒤 한 번에 교체 (구성 중에도 기존 색인으로 검색 가능)
+                staging = SearchIndex()
+                with engine.connect() as con:
+                    for mid, title, usage in con.execute(text("SELECT mid, title, `usage` FROM msds")):
+                        staging._add(mid, title, usage)
+
+                with self._lock:
+                    # 구성 중에 커밋된 변경을 순서대로 다시 적용 (이미 읽은 값과 같아도 결과는 동일)
+                    for mid, title, usage, deleted in self._journal:
+                        staging._remove(mid)
+                        if not deleted:
+                            staging._add(mid, title, usage)
+                    self._postings = staging._postings
+                    self._docs = staging._docs
+                    self._total_len = staging._total_len
+                    self._built_at = time.monotonic()
+                    self._version = version
+            finally:
+                with self._lock:
+                    self._journal = None
+            return len(staging._docs)
+
+    def ensure_fresh(self, engine):
+        """
+        색인이 없거나, "msds" 버전이 바뀌었거나, 갱신 주기가 지났으면 재구성하는 함수
+
+        Args:
+            engine: SQLAlchemy 엔진
+        """
+        if not self._is_stale():
+            return
+        with self._build_lock:
+            # 다른 스레드가 먼저 재구성했으면 건너뜀
+            if self._is_stale():
+                self.rebuild(engine)
+
+    def _is_stale(self):
+        """색인이 없거나, 다른 워커/CLI가 "msds" 버전을 올렸거나, 갱신 주기가 지났는지 확인하는 함수"""
+        with self._lock:
+            built_at = self._built_at
+            version = self._version
+        if built_at is None:
+            return True
+        if self._versions is not None and self._versions.get("msds") != version:
+            return True
+        return self.refresh_seconds > 0 and time.monotonic() - built_at > self.refresh_seconds
+
+    # --- 검색 ---
+
+    def search(self, query, offset=0, limit=None, after=None, before=None):
+        """
+        질의어로 문서를 검색하여 BM25 점수 순으로 반환하는 함수
+        정렬 키는 [-점수, mid]이며, after/before에 이전 결과의 키를 주면 그 다음/이전 결과를 반환합니다
+        (키셋 페이지네이션).
+
+        Args:
+            query (str): 검색어
+            offset (int): 건너뛸 결과 수
+            limit (int, optional): 반환할 최대 결과 수
+            after (list, optional): 이 정렬 키 다음 결과부터 반환
+            before (list, optional): 이 정렬 키 직전 결과까지 반환 (가장 가까운 limit개)
+
+        Returns:
+            tuple: (전체 일치 수, [(mid, 정렬 키), ...] 정렬 키 오름차순)
+        """
+        words = normalize(query).split()
+        if not words:
+            return 0, []
+
+        with self._lock:
+            tokens = []
+            for word in words:
+                tokens.extend(ngrams(word))
+            postings = []
+            for token in set(tokens):
+                posting = self._postings.get(token)
+                if not posting:
+                    return 0, []
+                postings.append((token, posting))
+
+            # 가장 짧은 포스팅부터 교집합 (후보 수를 빠르게 줄임)
+            postings.sort(key=lambda item: len(item[1]))
+            candidates = set(postings[0][1])
+            for _token, posting in postings[1:]:
+                # 작은 후보 집합 기준으로 확인 (큰 포스팅 전체를 순회하지 않음)
+                candidates = {mid for mid in candidates if mid in posting}
+                if not candidates:
+                    return 0, []
+
+            n_docs = len(self._docs) or 1
+            avg_len = (self._total_len / n_docs) or 1.0
+            idf = {
+                token: math.log(1 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+                for token, posting in postings
+            }
+
+            # 바이그램 일치는 부분 문자열 일치의 필요조건이므로 세 글자 이상 단어는 실제 포함 여부를 확인
+            # (두 글자 이하 단어는 토큰 일치가 곧 부분 문자열 일치)
+            long_words = [w for w in words if len(w) > 2]
+            docs = self._docs
+            if long_words:
+                candidates = [
+                    mid for mid in candidates
+                    if all(any(w in v for v in docs[mid][0].values()) for w in long_words)
+                ]
+            if len(words) > 1:
+                # 여러 단어 질의는 LIKE '%q%'처럼 공백을 포함한 구문 전체가 한 필드에 있어야 일치
+                phrase = normalize(query)
+                candidates = [mid for mid in candidates if any(phrase in v for v in docs[mid][0].values())]
+
+            k1_plus = BM25_K1 + 1
+            norm_base = BM25_K1 * (1 - BM25_B)
+            norm_scale = BM25_K1 * BM25_B / avg_len
+            weighted = [(idf[token] * k1_plus, posting) for token, posting in postings]
+            scored = []
+            for mid in candidates:
+                norm = norm_base + norm_scale * docs[mid][1]
+                score = 0.0
+                for weight, posting in weighted:
+                    tf = posting[mid]
+                    score += weight * tf / (tf + norm)
+                scored.append((-score, mid))
+
+        return _rank(scored, offset, limit, after, before)
+
+    def stats(self):
+        """
+        색인 상태를 반환하는 함수
+
+        Returns:
+            dict: 문서 수, 토큰 수, 반영한 "msds" 버전, 마지막 구성 이후 경과 시간
+        """
+        with self._lock:
+            return {
+                "documents": len(self._docs),
+                "tokens": len(self._postings),
+                "version": self._version,
+                "age_seconds": None if self._built_at is None else round(time.monotonic() - self._built_at, 1),
+            }
+
+
+class ContentIndex:
+    """
+    PDF 본문 검색 클래스
+
+    - PdfTextStore에 저장된 정규화 본문 중 현재 file_loc과 일치하는 것만 바이그램 역색인(토큰 -> {mid: 빈도})으로
+      만들고, 본문 자체는 메모리에 두지 않습니다 (snippet은 결과 항목의 기록 파일만 읽음).
+    - 질의의 모든 단어에 대해 단어의 바이그램이 모두 들어 있는 본문을 일치로 봅니다. 세 글자 이상 단어는 바이그램의
+      인접 여부까지는 확인하지 않으므로 부분 문자열 검색보다 약간 넓게 일치할 수 있습니다.
+    - 단어 빈도는 바이그램 빈도의 최솟값으로 추정하여 BM25 방식으로 정렬합니다.
+    - "msds_content" 버전이 바뀌면 저장소의 변경 기록에서 바뀐 mid만, "msds" 버전이 바뀌면 file_loc이 바뀐 mid만
+      다시 색인합니다. 변경 기록이 교체(크기 제한)된 경우에만 전체를 다시 구성합니다.
+    """
+
+    def __init__(self, store, versions):
+        self._store = store
+        self._versions = versions
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._postings = {}     # 토큰 -> {mid: 빈도}
+        self._docs = {}         # mid -> (본문 길이(바이그램 수), 토큰 목록)
+        self._total_len = 0
+        self._locs = {}         # mid -> 현재 msds.file_loc
+        self._record_locs = {}  # mid -> 저장된 본문의 추출 당시 file_loc (본문이 있는 기록만)
+        self._log_position = None  # (변경 기록 inode, 읽은 위치)
+        self._versions_seen = None
+
+    # --- 색인 구성 ---
+
+    @staticmethod
+    def _tokens(body):
+        """본문의 토큰별 빈도와 본문 길이를 계산하는 함수 (바이그램 + 한 글자 토큰)"""
+        weights = {}
+        length = 0
+        for token, tf in Counter(map(str.__add__, body, body[1:])).items():
+            if " " not in token:
+                weights[token] = tf
+                length += tf
+        for char, tf in Counter(body).items():
+            if char != " ":
+                weights[CHAR_PREFIX + char] = tf
+        return weights, length
+
+    def _add(self, mid, body):
+        """본문을 색인에 추가하는 함수 (호출 측에서 잠금 보유)"""
+        weights, length = self._tokens(body)
+        for token, tf in weights.items():
+            self._postings.setdefault(token, {})[mid] = tf
+        self._docs[mid] = (length, tuple(weights))
+        self._total_len += length
+
+    def _remove(self, mid):
+        """본문을 색인에서 제거하는 함수 (호출 측에서 잠금 보유)"""
+        doc = self._docs.pop(mid, None)
+        if not doc:
+            return
+        self._total_len -= doc[0]
+        for token in doc[1]:
+            posting = self._postings.get(token)
+            if posting is not None:
+                posting.pop(mid, None)
+                if not posting:
+                    del self._postings[token]
+
+    def _read_changes(self):
+        """
+        마지막으로 읽은 위치 이후의 변경 기록을 읽는 함수
+
+        Returns:
+            set or None: 바뀐 mid 집합 (변경 기록이 교체되어 이어 읽을 수 없으면 None)
+        """
+        inode, position = self._log_position or (None, 0)
+        try:
+            with open(self._store.changes_path, "rb") as fh:
+                current = os.fstat(fh.fileno()).st_ino
+                if current != inode or os.fstat(fh.fileno()).st_size < position:
+                    return None
+                fh.seek(position)
+                data = fh.read()
+        except FileNotFoundError:
+            return None
+        # 아직 줄바꿈이 쓰이지 않은 마지막 줄은 다음에 다시 읽음
+        complete = data[:data.rfind(b"\n") + 1]
+        self._log_position = (inode, position + len(complete))
+        return {line for line in complete.decode("utf-8").split("\n") if line}
+
+    def _log_end(self):
+        """현재 변경 기록의 (inode, 끝 위치)를 반환하는 함수 (전체 재구성 직전에 기록, 없으면 빈 파일 생성)"""
+        fd = os.open(self._store.changes_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            st = os.fstat(fd)
+        finally:
+            os.close(fd)
+        return st.st_ino, st.st_size
+
+    def _load(self, mid):
+        """
+        mid의 저장된 본문을 읽어 (추출 당시 file_loc, 본문)을 반환하는 함수
+
+        Returns:
+            tuple: (file_loc 또는 None, 본문 또는 "")
+        """
+        record = self._store.get(mid) or {}
+        body = record.get("text") or ""
+        return (record.get("file_loc") if body else None), body
+
+    def _refresh(self, mid, reload):
+        """
+        mid 하나를 현재 file_loc과 저장된 본문에 맞게 다시 색인하는 함수 (_build_lock 보유 상태에서 호출)
+
+        Args:
+            mid (str): MSDS ID
+            reload (bool): 본문 기록이 바뀌었는지 여부 (아니면 알려진 기록의 file_loc이 일치할 때만 본문을 읽음)
+        """
+        loc = self._locs.get(mid)
+        body = None
+        if reload or (loc is not None and mid not in self._record_locs):
+            record_loc, body = self._load(mid)
+            if record_loc:
+                self._record_locs[mid] = record_loc
+            else:
+                self._record_locs.pop(mid, None)
+        if loc is None or self._record_locs.get(mid) != loc:
+            with self._lock:
+                self._remove(mid)
+            return
+        if body is None:
+            _record_loc, body = self._load(mid)
+        with self._lock:
+            self._remove(mid)
+            self._add(mid, body)
+
+    def ensure_fresh(self, engine):
+        """
+        본문 또는 MSDS 버전이 바뀌었으면 바뀐 MSDS만 다시 색인하는 함수
+
+        Args:
+            engine: SQLAlchemy 엔진
+        """
+        seen = (self._versions.get("msds"), self._versions.get("msds_content"))
+        if seen == self._versions_seen:
+            return
+        with self._build_lock:
+            previous = self._versions_seen
+            if seen == previous:
+                return
+            # 버전을 먼저 읽었으므로 그 버전까지의 변경은 아래에서 읽는 변경 기록/DB에 모두 포함됨
+            changed = self._read_changes() if previous is not None else None
+            if changed is None:
+                self.rebuild(engine)
+            else:
+                if seen[0] != previous[0]:
+                    changed_locs = self._reload_locs(engine)
+                else:
+                    changed_locs = set()
+                for mid in changed | changed_locs:
+                    self._refresh(mid, reload=mid in changed)
+            self._versions_seen = seen
+
+    def _reload_locs(self, engine):
+        """
+        현재 msds.file_loc을 다시 읽고 값이 바뀐 mid 집합을 반환하는 함수
+
+        Returns:
+            set: file_loc이 바뀌거나 추가/삭제된 mid
+        """
+        with engine.connect() as con:
+            locs = dict(con.execute(text("SELECT mid, file_loc FROM msds WHERE file_loc IS NOT NULL")).all())
+        previous = self._locs
+        changed = {mid for mid, loc in locs.items() if previous.get(mid) != loc}
+        changed.update(mid for mid in previous if mid not in locs)
+        self._locs = locs
+        return changed
+
+    def rebuild(self, engine):
+        """
+        현재 file_loc과 일치하는 본문을 모두 읽어 색인을 새로 구성하는 함수 (처음 또는 변경 기록이 교체된 경우)
+
+        Args:
+            engine: SQLAlchemy 엔진
+
+        Returns:
+            int: 검색 대상 문서 수
+        """
+        # 기록 위치를 먼저 잡아 두고 읽는 동안의 변경은 다음 ensure_fresh()에서 다시 적용 (같은 결과)
+        log_position = self._log_end()
+        self._locs = {}
+        self._reload_locs(engine)
+        staging = ContentIndex(self._store, self._versions)
+        record_locs = {}
+        for mid, loc in self._locs.items():
+            record_loc, body = self._load(mid)
+            if record_loc:
+                record_locs[mid] = record_loc
+            # 추출 이후 file_loc이 바뀐 본문은 제외 (백필/업로드 작업이 새로 추출할 때까지)
+            if record_loc == loc:
+                staging._add(mid, body)
+        with self._lock:
+            self._postings = staging._postings
+            self._docs = staging._docs
+            self._total_len = staging._total_len
+        self._record_locs = record_locs
+        self._log_position = log_position
+        return len(staging._docs)
+
+    # --- 검색 ---
+
+    def search(self, query, offset=0, limit=None, after=None, before=None):
+        """
+        질의어로 본문을 검색하는 함수 (SearchIndex.search와 같은 인자/반환 형식)
+
+        Returns:
+            tuple: (전체 일치 수, [(mid, 정렬 키), ...] 정렬 키 오름차순)
+        """
+        words = set(normalize(query).split())
+        if not words:
+            return 0, []
+        with self._lock:
+            n_docs = len(self._docs) or 1
+            avg_len = (self._total_len / n_docs) or 1.0
+            # 단어마다 (idf, 바이그램 포스팅 목록) - 단어 빈도는 바이그램 빈도의 최솟값으로 추정
+            terms = []
+            for word in words:
+                postings = []
+                for token in set(ngrams(word)):
+                    posting = self._postings.get(token)
+                    if not posting:
+                        return 0, []
+                    postings.append(posting)
+                postings.sort(key=len)
+                # 단어의 문서 빈도는 가장 드문 바이그램의 문서 빈도 이하
+                df = len(postings[0])
+                terms.append((math.log(1 + (n_docs - df + 0.5) / (df + 0.5)) * (BM25_K1 + 1), postings))
+
+            terms.sort(key=lambda term: len(term[1][0]))
+            candidates = set(terms[0][1][0])
+            for _idf, postings in terms:
+                for posting in postings:
+                    candidates = {mid for mid in candidates if mid in posting}
+                    if not candidates:
+                        return 0, []
+
+            norm_base = BM25_K1 * (1 - BM25_B)
+            norm_scale = BM25_K1 * BM25_B / avg_len
+            docs = self._docs
+            scored = []
+            for mid in candidates:
+                norm = norm_base + norm_scale * docs[mid][0]
+                score = 0.0
+                for weight, postings in terms:
+                    tf = min(posting[mid] for posting in postings)
+                    score += weight * tf / (tf + norm)
+                scored.append((-score, mid))
+        return _rank(scored, offset, limit, after, before)
+
+    def snippet(self, mid, query, width=80):
+        """
+        본문에서 첫 번째 일치 위치 주변을 잘라 반환하는 함수 (해당 MSDS의 기록 파일을 읽음)
+
+        Args:
+            mid (str): MSDS ID
+            query (str): 검색어
+            width (int): 일치 위치 앞뒤로 포함할 글자 수
+
+        Returns:
+            str or None: 본문 일부 (일치가 없으면 None)
+        """
+        _record_loc, body = self._load(mid)
+        if not body:
+            return None
+        positions = [p for p in (body.find(w) for w in normalize(query).split()) if p >= 0]
+        if not positions:
+            return None
+        start = max(min(positions) - width, 0)
+        end = min(min(positions) + width, len(body))
+        return ("…" if start else "") + body[start:end] + ("…" if end < len(body) else "")
+
+    def stats(self):
+        """
+        본문 검색 색인 상태를 반환하는 함수
+
+        Returns:
+            dict: 문서 수, 토큰 수, 평균 본문 길이(바이그램 수)
+        """
+        with self._lock:
+            n_docs = len(self._docs)
+            return {
+                "documents": n_docs,
+                "tokens": len(self._postings),
+                "avg_length": round(self._total_len / n_docs, 1) if n_docs else 0.0,
+            }
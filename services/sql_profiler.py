@@ -0,0 +1,215 @@
+"""
+SQL 프로파일러 모듈
+SQLAlchemy 엔진의 커서 이벤트로 요청마다 실행된 SQL 수와 DB 시간을 계측합니다 (SQL_PROFILE=true일 때만 등록).
+
+- 응답에 X-DB-Queries(쿼리 수)와 Server-Timing(db: DB 시간, app: 요청 처리 시간) 헤더를 붙여
+  브라우저 개발자 도구에서 요청별 DB 비중을 바로 확인할 수 있습니다.
+- SQL_SLOW_QUERY_MS 이상 걸린 문장은 경고 로그로 남기고, 최근 목록(SQL_SLOW_LOG_SIZE개)을 /debug/sql에서 보여줍니다.
+- 느린 SELECT/UPDATE/DELETE는 별도 연결에서 EXPLAIN 실행 계획을 받아 함께 기록합니다 (같은 문장은 한 번만).
+- 엔드포인트별 누적(요청 수, 쿼리 수, DB 시간)을 보관하여 다음 병목을 수치로 찾을 수 있게 합니다.
+- 스트리밍 응답(내보내기 등)은 헤더를 보낸 뒤 실행되는 쿼리가 헤더에 포함되지 않습니다.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+
+from flask import g, has_app_context, has_request_context, request
+from sqlalchemy import event
+
+# EXPLAIN 대상 문장 (앞부분 키워드)
+EXPLAINABLE = ("select", "with", "update", "delete")
+# 로그/기록에 남길 SQL 문장과 파라미터 최대 길이
+MAX_STATEMENT_CHARS = 2000
+MAX_PARAMS_CHARS = 500
+# 실행 계획을 기억할 최대 문장 수
+EXPLAIN_CACHE_SIZE = 256
+
+
+class SqlProfiler:
+    """
+    요청 단위 SQL 프로파일러 클래스
+
+    - init_app()은 SQL_PROFILE이 켜져 있을 때만 요청 훅을 등록합니다.
+    - watch(engine)은 db.init_app() 후 앱 컨텍스트 안에서 호출하여 커서 이벤트를 구독합니다.
+    - 작업 큐 워커의 쿼리는 요청 헤더/엔드포인트 누적에는 포함되지 않고 느린 쿼리 기록만 남습니다.
+    - 통계는 프로세스(gunicorn 워커)별입니다.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._local = threading.local()  # EXPLAIN 실행 중 표시 (자기 쿼리는 계측하지 않음)
+        self._logger = None
+        self.enabled = False
+        self.slow_seconds = 0.1
+        self.explain = True
+        self._slow = deque(maxlen=100)
+        self._plans = OrderedDict()  # SQL 문장 -> 실행 계획 (LRU)
+        self._endpoints = {}
+        self._stats = {"requests": 0, "queries": 0, "slow_queries": 0, "explained": 0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Flask 애플리케이션에 프로파일러를 등록하는 함수
+
+        Args:
+            app (Flask): Flask 애플리케이션 인스턴스
+        """
+        self.enabled = bool(app.config.get("SQL_PROFILE", False))
+        self.slow_seconds = float(app.config.get("SQL_SLOW_QUERY_MS", 100)) / 1000
+        self.explain = bool(app.config.get("SQL_EXPLAIN_SLOW", True))
+        self._slow = deque(maxlen=max(int(app.config.get("SQL_SLOW_LOG_SIZE", 100)), 1))
+        self._logger = app.logger
+        if self.enabled:
+            app.before_request(self._before_request)
+            app.after_request(self._after_request)
+        app.extensions["sql_profiler"] = self
+
+    def watch(self, engine):
+        """
+        엔진의 커서 실행 이벤트를 구독하는 함수 (SQL_PROFILE이 꺼져 있으면 아무것도 하지 않음)
+
+        Args:
+            engine: SQLAlchemy 엔진
+        """
+        if not self.enabled:
+            return
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    # --- 요청 훅 ---
+
+    def _before_request(self):
+        g.sql_profile = {"queries": 0, "seconds": 0.0, "started": time.perf_counter()}
+
+    def _after_request(self, response):
+        profile = g.pop("sql_profile", None)
+        if profile is None:
+            return response
+        db_ms = profile["seconds"] * 1000
+        app_ms = (time.perf_counter() - profile["started"]) * 1000
+        response.headers["X-DB-Queries"] = str(profile["queries"])
+        timing = f'db;dur={db_ms:.1f};desc="{profile["queries"]} queries", app;dur={app_ms:.1f}'
+        existing = response.headers.get("Server-Timing")
+        response.headers["Server-Timing"] = f"{existing}, {timing}" if existing else timing
+
+        endpoint = request.endpoint or "<unmatched>"
+        with self._lock:
+            self._stats["requests"] += 1
+            totals = self._endpoints.setdefault(
+                endpoint, {"requests": 0, "queries": 0, "db_ms": 0.0, "max_queries": 0, "max_db_ms": 0.0}
+            )
+            totals["requests"] += 1
+            totals["queries"] += profile["queries"]
+            totals["db_ms"] += db_ms
+            totals["max_queries"] = max(totals["max_queries"], profile["queries"])
+            totals["max_db_ms"] = max(totals["max_db_ms"], db_ms)
+        return response
+
+    # --- 커서 이벤트 ---
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # 시작 시각은 실행 컨텍스트(실행 한 번)에 기록 - 실행이 실패해도 남는 상태가 없음
+        if context is not None:
+            context._sql_profiler_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_sql_profiler_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        if getattr(self._local, "explaining", False):
+            return
+        with self._lock:
+            self._stats["queries"] += 1
+        if has_app_context():
+            profile = g.get("sql_profile")
+            if profile is not None:
+                profile["queries"] += 1
+                profile["seconds"] += elapsed
+        if elapsed >= self.slow_seconds:
+            self._record_slow(conn, statement, parameters, executemany, elapsed)
+
+    def _record_slow(self, conn, statement, parameters, executemany, elapsed):
+        """느린 문장을 로그와 최근 목록에 기록하는 함수 (가능하면 실행 계획 포함)"""
+        endpoint = (request.endpoint or "<unmatched>") if has_request_context() else "<background>"
+        plan = None
+        if self.explain and not executemany and statement.lstrip()[:6].lower().startswith(EXPLAINABLE):
+            plan = self._explain(conn, statement, parameters)
+        entry = {
+            "at": time.time(),
+            "ms": round(elapsed * 1000, 3),
+            "endpoint": endpoint,
+            "statement": " ".join(statement.split())[:MAX_STATEMENT_CHARS],
+            "params": repr(parameters)[:MAX_PARAMS_CHARS],
+            "plan": plan,
+        }
+        with self._lock:
+            self._stats["slow_queries"] += 1
+            self._slow.append(entry)
+        if self._logger is not None:
+            self._logger.warning(
+                "slow query %.1fms [%s] %s params=%s plan=%s",
+                entry["ms"], endpoint, entry["statement"], entry["params"], plan
+            )
+
+    def _explain(self, conn, statement, parameters):
+        """
+        느린 문장의 실행 계획을 별도 연결에서 조회하는 함수 (같은 문장은 기억한 결과 사용)
+
+        Returns:
+            list or str: 실행 계획 행 리스트 (실패 시 오류 문자열)
+        """
+        key = statement.strip()
+        with self._lock:
+            if key in self._plans:
+                self._plans.move_to_end(key)
+                return self._plans[key]
+        dialect = conn.engine.dialect.name
+        prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+        self._local.explaining = True
+        try:
+            # 결과를 아직 읽는 중일 수 있는 원래 연결 대신 풀에서 연결을 하나 더 사용
+            with conn.engine.connect() as con:
+                rows = con.exec_driver_sql(prefix + key, parameters).mappings().all()
+            plan = [{k: (v if isinstance(v, (int, float, str)) or v is None else str(v)) for k, v in row.items()}
+                    for row in rows]
+        except Exception as e:  # 실행 계획 조회 실패는 기록만 하고 요청에는 영향 없음
+            plan = f"EXPLAIN failed: {str(e) or e.__class__.__name__}"
+        finally:
+            self._local.explaining = False
+        with self._lock:
+            self._stats["explained"] += 1
+            self._plans[key] = plan
+            while len(self._plans) > EXPLAIN_CACHE_SIZE:
+                self._plans.popitem(last=False)
+        return plan
+
+    def stats(self):
+        """
+        SQL 프로파일 통계를 반환하는 함수
+
+        Returns:
+            dict: 전체 요청/쿼리/느린 쿼리 수, DB 시간이 큰 순의 엔드포인트별 누적, 최근 느린 쿼리(최신순)
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            endpoints = [
+                {"endpoint": name, **totals,
+                 "avg_queries": round(totals["queries"] / totals["requests"], 2),
+                 "avg_db_ms": round(totals["db_ms"] / totals["requests"], 3),
+                 "db_ms": round(totals["db_ms"], 3), "max_db_ms": round(totals["max_db_ms"], 3)}
+                for name, totals in self._endpoints.items()
+            ]
+            slow = list(reversed(self._slow))
+        endpoints.sort(key=lambda e: e["db_ms"], reverse=True)
+        stats.update(
+            enabled=self.enabled,
+            slow_threshold_ms=round(self.slow_seconds * 1000, 3),
+            explain=self.explain,
+            endpoints=endpoints,
+            slow_queries=slow,
+        )
+        return stats
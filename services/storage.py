@@ -0,0 +1,412 @@
+"""
+Supabase 스토리지 클라이언트 모듈
+애플리케이션 전체에서 공유하는 Supabase 클라이언트 레지스트리를 정의합니다.
+
+요청마다 create_client()를 호출하면 HTTP 세션 생성, TLS 핸드셰이크가 매번 발생하므로
+앱 팩토리에서 레지스트리를 한 번 초기화하고, 모든 스레드가 keep-alive 연결 풀을
+공유하는 단일 클라이언트를 사용합니다.
+"""
+
+import atexit
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import quote
+
+import httpx
+from supabase import create_client
+from supabase.lib.client_options import SyncClientOptions
+
+
+class StorageUploadError(Exception):
+    """스토리지 업로드가 오류 응답으로 끝났을 때 발생하는 예외"""
+
+
+class SupabaseRegistry:
+    """
+    Supabase 클라이언트 레지스트리 클래스
+    (url, key) 조합별로 클라이언트를 한 번만 생성하여 스레드 간에 공유합니다.
+
+    - httpx 연결 풀(keep-alive)을 공유하므로 요청마다 TLS 핸드셰이크가 발생하지 않습니다.
+    - gunicorn 등에서 fork된 워커는 프로세스 ID가 달라지므로 자체 클라이언트를 새로 만듭니다.
+    - 클라이언트 재사용 횟수와 실제 TCP 연결 생성 횟수를 카운터로 기록합니다.
+    - metrics가 주어지면 모든 스토리지 호출의 작업 종류별 지연 시간을 /metrics 히스토그램에 기록합니다.
+    """
+
+    def __init__(self, metrics=None, app=None):
+        self._metrics = metrics
+        self._lock = threading.Lock()
+        self._clients = {}       # (url, key) -> (pid, supabase client)
+        self._http_clients = []  # 종료 시 닫아야 할 httpx 클라이언트 목록
+        self._settings = {}
+        self._stats = {
+            "clients_created": 0,     # 생성된 Supabase 클라이언트 수
+            "clients_reused": 0,      # 기존 클라이언트 재사용 횟수
+            "requests": 0,            # 스토리지로 보낸 HTTP 요청 수
+            "connections_opened": 0,  # 새로 맺은 TCP 연결 수
+        }
+        self._atexit_registered = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Flask 애플리케이션에 레지스트리를 등록하는 함수
+
+        Args:
+            app (Flask): Flask 애플리케이션 인스턴스
+        """
+        self._settings = {
+            "url": app.config.get("SUPABASE_URL", ""),
+            "key": app.config.get("SUPABASE_SERVICE_ROLE_KEY", ""),
+            "max_connections": int(app.config.get("SUPABASE_POOL_MAXSIZE", 20)),
+            "max_keepalive": int(app.config.get("SUPABASE_POOL_KEEPALIVE", 10)),
+            "keepalive_expiry": float(app.config.get("SUPABASE_KEEPALIVE_EXPIRY", 30)),
+            "connect_timeout": float(app.config.get("SUPABASE_CONNECT_TIMEOUT", 5)),
+            "read_timeout": float(app.config.get("SUPABASE_READ_TIMEOUT", 30)),
+        }
+        app.extensions["supabase_registry"] = self
+
+        # 프로세스 종료 시 연결 풀 정리
+        if not self._atexit_registered:
+            atexit.register(self.close)
+            self._atexit_registered = True
+
+    def _build_http_client(self):
+        """
+        연결 풀 크기와 타임아웃이 설정된 httpx 클라이언트를 생성하는 함수
+
+        Returns:
+            httpx.Client: keep-alive 연결 풀을 가진 HTTP 클라이언트
+        """
+        s = self._settings
+        limits = httpx.Limits(
+            max_connections=s["max_connections"],
+            max_keepalive_connections=s["max_keepalive"],
+            keepalive_expiry=s["keepalive_expiry"],
+        )
+        timeout = httpx.Timeout(s["read_timeout"], connect=s["connect_timeout"])
+        transport = None
+        if self._metrics is not None and self._metrics.enabled:
+            # 전송 계층을 직접 지정하면 Client의 limits는 무시되므로 연결 풀 설정은 전송 계층에 전달
+            transport = self._metrics.timed_transport(httpx.HTTPTransport(limits=limits))
+        return httpx.Client(
+            limits=limits,
+            transport=transport,
+            timeout=timeout,
+            follow_redirects=True,
+            event_hooks={"request": [self._on_request]},
+        )
+
+    def _on_request(self, request):
+        """요청마다 호출되어 연결 생성 여부를 추적하는 httpx 이벤트 훅"""
+        with self._lock:
+            self._stats["requests"] += 1
+        request.extensions["trace"] = self._trace
+
+    def _trace(self, event_name, info):
+        """httpcore trace 콜백 - 새 TCP 연결이 맺어질 때만 카운트합니다"""
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self._stats["connections_opened"] += 1
+
+    def get_client(self, url=None, key=None):
+        """
+        공유 Supabase 클라이언트를 반환하는 함수
+        최초 호출 시에만 클라이언트를 생성하고 이후에는 재사용합니다.
+
+        Args:
+            url (str, optional): Supabase 프로젝트 URL (기본값: 설정값)
+            key (str, optional): 서비스 롤 키 (기본값: 설정값)
+
+        Returns:
+            SupabaseClient: 공유 Supabase 클라이언트 인스턴스
+        """
+        url = url or self._settings.get("url", "")
+        key = key or self._settings.get("key", "")
+        cache_key = (url, key)
+        pid = os.getpid()
+
+        with self._lock:
+            entry = self._clients.get(cache_key)
+            if entry and entry[0] == pid:
+                self._stats["clients_reused"] += 1
+                return entry[1]
+
+            # fork 이후이거나 최초 호출인 경우 새 클라이언트 생성
+            http_client = self._build_http_client()
+            client = create_client(url, key, options=SyncClientOptions(httpx_client=http_client))
+            self._clients[cache_key] = (pid, client)
+            self._http_clients.append((pid, http_client))
+            self._stats["clients_created"] += 1
+            return client
+
+    def open_stream(self, bucket, path, headers=None):
+        """
+        스토리지 객체를 스트리밍으로 여는 함수
+        본문을 메모리에 올리지 않고 호출 측이 청크 단위로 읽을 수 있는 응답을 반환합니다.
+        Range/If-None-Match 등 조건부 헤더는 그대로 스토리지에 전달됩니다.
+
+        Args:
+            bucket (str): 스토리지 버킷명
+            path (str): 버킷 내 파일 경로
+            headers (dict, optional): 스토리지로 전달할 추가 요청 헤더
+
+        Returns:
+            httpx.Response: 스트리밍 응답 (사용 후 반드시 close() 호출)
+        """
+        client = self.get_client()
+        http_client = client.options.httpx_client
+        key = self._settings.get("key", "")
+        url = f"{str(client.storage_url).rstrip('/')}/object/{bucket}/{quote(path)}"
+        request_headers = {"apikey": key, "Authorization": f"Bearer {key}"}
+        request_headers.update(headers or {})
+        request = http_client.build_request("GET", url, headers=request_headers)
+        return http_client.send(request, stream=True)
+
+    def upload_stream(self, bucket, path, fileobj, size, content_type="application/pdf",
+                      upsert=False, progress=None, chunk_size=256 * 1024):
+        """
+        파일 객체를 청크 단위로 읽어 스토리지에 업로드하는 함수
+        storage3의 upload()와 달리 파일 전체를 메모리에 올리지 않고 원본 바이트를 그대로 전송합니다.
+
+        Args:
+            bucket (str): 스토리지 버킷명
+            path (str): 버킷 내 파일 경로
+            fileobj: 읽기 가능한 바이너리 파일 객체
+            size (int): 전송할 바이트 수 (Content-Length)
+            content_type (str): 객체 MIME 타입
+            upsert (bool): 같은 경로의 객체가 있으면 덮어쓸지 여부
+            progress (callable, optional): 청크 전송마다 누적 바이트 수로 호출되는 콜백
+            chunk_size (int): 한 번에 읽을 바이트 수
+
+        Returns:
+            dict: 스토리지 응답 JSON
+
+        Raises:
+            StorageUploadError: 스토리지가 오류 상태 코드를 반환한 경우
+        """
+        client = self.get_client()
+        http_client = client.options.httpx_client
+        key = self._settings.get("key", "")
+        url = f"{str(client.storage_url).rstrip('/')}/object/{bucket}/{quote(path)}"
+        headers = {
+            "apikey": key,
+            "Authorization": f"Bearer {key}",
+            "Content-Type": content_type,
+            "Content-Length": str(size),
+            "x-upsert": "true" if upsert else "false",
+            "cache-control": "max-age=3600",
+        }
+
+        def body():
+            sent = 0
+            while True:
+                chunk = fileobj.read(chunk_size)
+                if not chunk:
+                    break
+                sent += len(chunk)
+                yield chunk
+                if progress:
+                    progress(sent)
+
+        response = http_client.post(url, content=body(), headers=headers)
+        if response.status_code >= 400:
+            raise StorageUploadError(f"Storage upload failed ({response.status_code}): {response.text[:200]}")
+        try:
+            return response.json()
+        except ValueError:
+            return {}
+
+    def stats(self):
+        """
+        클라이언트/연결 재사용 통계를 반환하는 함수
+
+        Returns:
+            dict: 클라이언트 생성·재사용 횟수와 연결 생성·재사용 횟수
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats["connections_reused"] = max(stats["requests"] - stats["connections_opened"], 0)
+        stats["pool"] = {
+            "max_connections": self._settings.get("max_connections"),
+            "max_keepalive": self._settings.get("max_keepalive"),
+            "keepalive_expiry": self._settings.get("keepalive_expiry"),
+        }
+        return stats
+
+    def close(self):
+        """현재 프로세스가 만든 HTTP 연결 풀을 모두 닫는 함수"""
+        pid = os.getpid()
+        with self._lock:
+            owned = [c for p, c in self._http_clients if p == pid]
+            self._http_clients = [(p, c) for p, c in self._http_clients if p != pid]
+            self._clients = {k: v for k, v in self._clients.items() if v[0] != pid}
+        for http_client in owned:
+            try:
+                http_client.close()
+            except Exception:
+                pass
+
+
+class SignedUrlCache:
+    """
+    서명 URL TTL 캐시 클래스
+    (bucket, path)를 키로 서명 URL을 보관하여 같은 파일에 대한 반복 서명 요청을 줄입니다.
+
+    - 항목은 SUPABASE_SIGNED_URL_EXPIRES보다 안전 여유(margin)만큼 먼저 만료되므로
+      캐시에서 꺼낸 URL은 최소 margin 초 동안 유효합니다.
+    - 최대 항목 수를 넘으면 가장 오래 사용되지 않은 항목부터 제거합니다 (LRU).
+    - 여러 경로가 캐시에 없으면 create_signed_urls 한 번으로 일괄 서명합니다.
+    """
+
+    def __init__(self, registry, app=None):
+        self._registry = registry
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # (bucket, path) -> (만료 시각, 서명 URL)
+        self.expires_in = 300
+        self.maxsize = 4096
+        self.margin = 60
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "batch_calls": 0, "sign_errors": 0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Flask 애플리케이션에 서명 URL 캐시를 등록하는 함수
+
+        Args:
+            app (Flask): Flask 애플리케이션 인스턴스
+        """
+        self.expires_in = int(app.config.get("SUPABASE_SIGNED_URL_EXPIRES", 300))
+        self.maxsize = int(app.config.get("SIGNED_URL_CACHE_SIZE", 4096))
+        self.margin = int(app.config.get("SIGNED_URL_CACHE_MARGIN", 60))
+        app.extensions["signed_url_cache"] = self
+
+    @property
+    def ttl(self):
+        """캐시 보관 시간(초) - 만료 시간에서 안전 여유를 뺀 값 (최소 만료 시간의 절반)"""
+        return max(self.expires_in - self.margin, self.expires_in // 2, 1)
+
+    @property
+    def min_validity(self):
+        """캐시에서 꺼낸 서명 URL이 보장하는 최소 잔여 유효 시간(초)"""
+        return self.expires_in - self.ttl
+
+    def get(self, bucket, path):
+        """
+        단일 경로의 서명 URL을 반환하는 함수
+
+        Args:
+            bucket (str): 스토리지 버킷명
+            path (str): 버킷 내 파일 경로
+
+        Returns:
+            str or None: 서명 URL (서명 실패 시 None)
+        """
+        return self.get_many(bucket, [path]).get(path)
+
+    def get_many(self, bucket, paths):
+        """
+        여러 경로의 서명 URL을 한 번에 반환하는 함수
+        캐시에 없는 경로들만 모아 일괄 서명합니다.
+
+        Args:
+            bucket (str): 스토리지 버킷명
+            paths (list): 버킷 내 파일 경로 목록
+
+        Returns:
+            dict: 경로 -> 서명 URL (서명 실패한 경로는 None)
+        """
+        now = time.monotonic()
+        result = {}
+        missing = []
+
+        with self._lock:
+            for path in dict.fromkeys(p for p in paths if p):  # 순서를 유지한 중복 제거
+                entry = self._entries.get((bucket, path))
+                if entry and entry[0] > now:
+                    self._entries.move_to_end((bucket, path))
+                    self._stats["hits"] += 1
+                    result[path] = entry[1]
+                else:
+                    self._stats["misses"] += 1
+                    missing.append(path)
+
+        if missing:
+            signed = self._sign(bucket, missing)
+            expires_at = time.monotonic() + self.ttl
+            with self._lock:
+                for path in missing:
+                    url = signed.get(path)
+                    result[path] = url
+                    if not url:
+                        continue
+                    self._entries[(bucket, path)] = (expires_at, url)
+                    self._entries.move_to_end((bucket, path))
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self._stats["evictions"] += 1
+        return result
+
+    def _sign(self, bucket, paths):
+        """
+        스토리지 API로 서명 URL을 발급하는 함수 (여러 경로는 일괄 서명)
+
+        Args:
+            bucket (str): 스토리지 버킷명
+            paths (list): 서명할 파일 경로 목록
+
+        Returns:
+            dict: 경로 -> 서명 URL
+        """
+        proxy = self._registry.get_client().storage.from_(bucket)
+        signed = {}
+        try:
+            if len(paths) == 1:
+                res = proxy.create_signed_url(paths[0], self.expires_in)
+                signed[paths[0]] = res.get("signed_url") or res.get("signedURL")
+            else:
+                with self._lock:
+                    self._stats["batch_calls"] += 1
+                for item in proxy.create_signed_urls(paths, self.expires_in):
+                    if not item.get("error"):
+                        signed[item.get("path")] = item.get("signedURL") or item.get("signedUrl")
+        except Exception:
+            # 서명 실패는 호출 측에서 None으로 처리 (404 응답 등)
+            with self._lock:
+                self._stats["sign_errors"] += 1
+        return signed
+
+    def invalidate(self, bucket, path):
+        """
+        특정 경로의 캐시 항목을 제거하는 함수 (파일 삭제/교체 시 호출)
+
+        Args:
+            bucket (str): 스토리지 버킷명
+            path (str): 버킷 내 파일 경로
+        """
+        with self._lock:
+            self._entries.pop((bucket, path), None)
+
+    def clear(self):
+        """캐시 전체를 비우는 함수"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        캐시 적중/미스 통계를 반환하는 함수
+
+        Returns:
+            dict: 적중·미스·제거 횟수, 현재 항목 수, 적중률
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["maxsize"] = self.maxsize
+        stats["ttl"] = self.ttl
+        return stats
@@ -0,0 +1,232 @@
+"""
+이미지 변형(썸네일) 모듈
+첨부 이미지(경고 표지, 보호구 등)를 요청한 너비로 줄인 변형을 만들어 로컬 콘텐츠 캐시에 보관합니다.
+
+- 카드 목록은 아이콘을 32px 정도로만 표시하므로 ?w=64 같은 작은 변형을 내려보내면 전송량이 크게 줄어듭니다.
+- 클라이언트의 Accept 헤더가 WebP를 허용하면 WebP, 아니면 PNG로 인코딩합니다.
+- 디코딩/리사이즈/인코딩은 크기가 제한된 워커 풀에서 실행하고 (Pillow는 이 구간에서 GIL을 놓음),
+  같은 변형을 동시에 요청하면 한 번만 만들고 나머지는 결과를 기다립니다.
+- 변형은 "{file_loc}#w{너비}.{형식}" 키로 콘텐츠 캐시에 저장되므로 용량 제한(LRU)을 함께 적용받고,
+  원본 file_loc이 바뀌거나 삭제되면 invalidate()로 모든 변형을 제거합니다.
+- Pillow는 선택 의존성이며, 없으면 항상 원본을 제공합니다 (pip install pillow).
+"""
+
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from PIL import Image, ImageOps, features  # 선택 의존성 (이미지 리사이즈)
+except ImportError:  # pragma: no cover
+    Image = None
+
+# 형식별 MIME 타입
+FORMAT_MIMETYPES = {"webp": "image/webp", "png": "image/png"}
+
+
+def render_variant(path, width, fmt, quality):
+    """
+    원본 이미지를 지정한 너비 이하로 줄여 인코딩하는 함수 (워커 풀에서 실행)
+
+    Args:
+        path (str): 원본 이미지 로컬 경로
+        width (int): 최대 너비(px) - 원본보다 크게 늘리지 않음
+        fmt (str): "webp" 또는 "png"
+        quality (int): WebP 품질 (1~100)
+
+    Returns:
+        bytes: 인코딩된 이미지
+    """
+    with Image.open(path) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            # 팔레트/흑백 이미지는 투명도를 유지한 채 RGBA로 변환 (리사이즈 품질 확보)
+            image = image.convert("RGBA")
+        if image.width > width:
+            height = max(round(image.height * width / image.width), 1)
+            image = image.resize((width, height), Image.LANCZOS)
+        output = io.BytesIO()
+        if fmt == "webp":
+            image.save(output, "WEBP", quality=quality, method=4)
+        else:
+            image.save(output, "PNG", optimize=True)
+        return output.getvalue()
+
+
+class ImageVariants:
+    """
+    이미지 변형 생성/캐시 클래스
+
+    - get(bucket, file_loc, width, fmt)은 캐시에 변형이 있으면 바로 반환하고,
+      없으면 원본을 콘텐츠 캐시로 가져와 워커 풀에서 변형을 만든 뒤 저장합니다.
+    - 요청 너비는 IMAGE_VARIANT_WIDTHS 중 같거나 큰 가장 작은 값으로 맞춰 변형 종류 수를 제한합니다.
+    """
+
+    def __init__(self, content_cache, app=None):
+        self._content_cache = content_cache
+        self._lock = threading.Lock()
+        self._inflight = {}  # 변형 키 -> 생성 중인 Future (동시 요청 합치기)
+        self._unsupported = set()  # 디코딩할 수 없는 원본 file_loc (SVG 등 - 매번 다시 시도하지 않음)
+        self._executor = None
+        self.widths = (64, 128, 256)
+        self.workers = 2
+        self.quality = 80
+        self.timeout = 30
+        self._stats = {"hits": 0, "renders": 0, "joined": 0, "errors": 0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Flask 애플리케이션에 이미지 변형 생성기를 등록하는 함수
+
+        Args:
+            app (Flask): Flask 애플리케이션 인스턴스
+        """
+        widths = str(app.config.get("IMAGE_VARIANT_WIDTHS", "64,128,256"))
+        self.widths = tuple(sorted({int(w) for w in widths.split(",") if w.strip()}))
+        self.workers = max(int(app.config.get("IMAGE_VARIANT_WORKERS", 2)), 1)
+        self.quality = int(app.config.get("IMAGE_VARIANT_QUALITY", 80))
+        self.timeout = float(app.config.get("IMAGE_VARIANT_TIMEOUT", 30))
+        app.extensions["image_variants"] = self
+
+    @property
+    def available(self):
+        """변형 생성 가능 여부 (Pillow 설치 + 콘텐츠 캐시 사용 중)"""
+        return Image is not None and bool(self.widths) and self._content_cache.enabled
+
+    @property
+    def webp(self):
+        """WebP 인코딩 가능 여부"""
+        return Image is not None and features.check("webp")
+
+    def snap_width(self, width):
+        """
+        요청 너비를 허용된 너비로 맞추는 함수
+
+        Args:
+            width (int): 요청 너비(px)
+
+        Returns:
+            int: 요청 너비 이상인 가장 작은 허용 너비 (모두 작으면 가장 큰 허용 너비)
+        """
+        for allowed in self.widths:
+            if allowed >= width:
+                return allowed
+        return self.widths[-1]
+
+    def choose_format(self, accept_mimetypes):
+        """
+        Accept 헤더로 변형 형식을 고르는 함수
+
+        Args:
+            accept_mimetypes: werkzeug MIMEAccept 객체 (request.accept_mimetypes)
+
+        Returns:
+            str: "webp" 또는 "png"
+        """
+        # image/*, */* 와일드카드가 아니라 image/webp를 명시한 경우만 WebP (브라우저는 지원 시 명시함)
+        if self.webp and any(value == "image/webp" and quality > 0 for value, quality in accept_mimetypes):
+            return "webp"
+        return "png"
+
+    @staticmethod
+    def variant_path(file_loc, width, fmt):
+        """변형의 콘텐츠 캐시 키 경로"""
+        return f"{file_loc}#w{width}.{fmt}"
+
+    def _pool(self):
+        """변형 생성 워커 풀을 반환하는 함수 (호출 측에서 잠금 보유)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="image-variant")
+        return self._executor
+
+    def get(self, bucket, file_loc, width, fmt):
+        """
+        이미지 변형을 반환하는 함수 (없으면 생성하여 캐시에 저장)
+
+        Args:
+            bucket (str): 스토리지 버킷명
+            file_loc (str): 원본 이미지 경로
+            width (int): 허용된 너비 (snap_width 결과)
+            fmt (str): "webp" 또는 "png"
+
+        Returns:
+            CacheEntry or None: 변형 캐시 항목 (이미지가 아니거나 생성할 수 없으면 None - 원본 제공)
+        """
+        if file_loc in self._unsupported:
+            return None
+        path = self.variant_path(file_loc, width, fmt)
+        entry = self._content_cache.lookup(bucket, path)
+        if entry is not None:
+            with self._lock:
+                self._stats["hits"] += 1
+            return entry
+
+        with self._lock:
+            future = self._inflight.get(path)
+            owner = future is None
+            if owner:
+                future = self._pool().submit(self._render, bucket, file_loc, path, width, fmt)
+                self._inflight[path] = future
+                self._stats["renders"] += 1
+            else:
+                self._stats["joined"] += 1
+        try:
+            return future.result(timeout=self.timeout)
+        except Exception:
+            with self._lock:
+                self._stats["errors"] += 1
+            return None
+        finally:
+            if owner:
+                with self._lock:
+                    self._inflight.pop(path, None)
+
+    def _render(self, bucket, file_loc, path, width, fmt):
+        """원본을 가져와 변형을 만들고 콘텐츠 캐시에 저장하는 함수 (워커 풀에서 실행)"""
+        source = self._content_cache.fetch(bucket, file_loc)
+        if source is None:
+            return None
+        try:
+            data = render_variant(source.file_path, width, fmt, self.quality)
+        except (OSError, ValueError, Image.DecompressionBombError):
+            # 이미지가 아니거나 지원하지 않는 형식 (UnidentifiedImageError는 OSError 하위 클래스)
+            with self._lock:
+                self._unsupported.add(file_loc)
+            return None
+        writer = self._content_cache.writer(bucket, path, FORMAT_MIMETYPES[fmt])
+        try:
+            writer.write(data)
+        except Exception:
+            writer.discard()
+            raise
+        return writer.commit()
+
+    def invalidate(self, bucket, file_loc):
+        """
+        원본 이미지의 모든 변형을 캐시에서 제거하는 함수 (file_loc 변경/삭제 시 호출)
+
+        Args:
+            bucket (str): 스토리지 버킷명
+            file_loc (str): 원본 이미지 경로
+        """
+        with self._lock:
+            self._unsupported.discard(file_loc)
+        for width in self.widths:
+            for fmt in FORMAT_MIMETYPES:
+                self._content_cache.invalidate(bucket, self.variant_path(file_loc, width, fmt))
+
+    def stats(self):
+        """
+        변형 생성 통계를 반환하는 함수
+
+        Returns:
+            dict: 캐시 적중/생성/합류/오류 수, 허용 너비, WebP 지원 여부
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats["available"] = self.available
+        stats["webp"] = self.webp
+        stats["widths"] = list(self.widths)
+        return stats
@@ -0,0 +1,399 @@
+"""
+이어 올리기(resumable) 업로드 모듈
+큰 PDF를 여러 조각(part)으로 나누어 받고, 모든 조각이 모이면 하나의 파일로 스토리지에 올리는 세션을 관리합니다.
+
+- 세션마다 스풀 디렉터리 아래에 manifest.json과 조각 파일(part-00001 ...)을 둡니다.
+  파일 기반이므로 gunicorn 워커 어느 쪽이 조각을 받아도 같은 세션에 모입니다.
+- 조각은 SHA-256 체크섬과 함께 받고, 일치할 때만 저장합니다 (임시 파일 → os.replace).
+  조각 번호가 독립적이므로 클라이언트는 여러 조각을 동시에 보내고, 실패한 조각만 다시 보낼 수 있습니다.
+- 완료 요청은 세션 디렉터리에 completing 표시 파일을 O_EXCL로 만들어 선점하므로, 여러 워커 프로세스에
+  동시에 들어온 완료 요청 중 하나만 업로드 작업을 만듭니다.
+- 세션 디렉터리의 수정 시각(조각 저장 시 갱신) 기준으로 UPLOAD_SESSION_TTL 동안 활동이 없으면 만료되어 삭제됩니다.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+
+# 세션 ID 형식 (uuid4 hex) - 경로 조작 방지를 위해 검증
+SESSION_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+# 세션 상태
+OPEN = "open"
+COMPLETING = "completing"
+
+
+class UploadSessionNotFound(LookupError):
+    """세션이 없거나 만료된 경우 발생하는 예외"""
+
+
+class UploadPartError(ValueError):
+    """조각 번호/크기/체크섬이 올바르지 않은 경우 발생하는 예외"""
+
+
+class UploadIncomplete(Exception):
+    """
+    받지 못한 조각이 있는데 완료를 요청한 경우 발생하는 예외
+
+    Args:
+        missing (list): 받지 못한 조각 번호 목록
+    """
+
+    def __init__(self, missing):
+        super().__init__(f"Missing parts: {missing[:20]}")
+        self.missing = missing
+
+
+class PartReader:
+    """
+    조각 파일들을 순서대로 이어 읽는 파일 객체 클래스
+    합친 파일을 디스크에 다시 쓰지 않고 스토리지 업로드에 바로 사용합니다.
+
+    Args:
+        paths (list): 조각 파일 경로 (순서대로)
+    """
+
+    def __init__(self, paths):
+        self._paths = list(paths)
+        self._current = None
+
+    def read(self, size=-1):
+        while self._paths or self._current:
+            if self._current is None:
+                self._current = open(self._paths.pop(0), "rb")
+            chunk = self._current.read(size)
+            if chunk:
+                return chunk
+            self._current.close()
+            self._current = None
+        return b""
+
+    def close(self):
+        if self._current is not None:
+            self._current.close()
+            self._current = None
+        self._paths = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class UploadSessions:
+    """
+    이어 올리기 세션 저장소 클래스
+
+    - create()로 세션을 만들고, put_part()로 조각을 받고, status()로 받은 조각/빠진 조각을 확인합니다.
+    - begin_complete()는 모든 조각이 모였는지 확인한 뒤 세션을 completing 상태로 바꾸고 조각 경로를 돌려줍니다.
+    - 업로드 작업이 실패하면 reopen()으로 되돌려 완료를 다시 요청할 수 있습니다 (조각은 유지).
+    """
+
+    def __init__(self, app=None):
+        self.directory = None
+        self.part_size = 8 * 1024 * 1024
+        self.max_size = 512 * 1024 * 1024
+        self.ttl = 86400
+        self._last_purge = 0.0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Flask 애플리케이션에 세션 저장소를 등록하는 함수
+
+        Args:
+            app (Flask): Flask 애플리케이션 인스턴스
+        """
+        spool_dir = app.config.get("UPLOAD_SPOOL_DIR") or os.path.join(app.instance_path, "uploads")
+        self.directory = os.path.abspath(os.path.join(spool_dir, "sessions"))
+        self.part_size = int(app.config.get("UPLOAD_PART_SIZE", 8 * 1024 * 1024))
+        self.max_size = int(app.config.get("UPLOAD_MAX_SIZE", 512 * 1024 * 1024))
+        self.ttl = int(app.config.get("UPLOAD_SESSION_TTL", 86400))
+        os.makedirs(self.directory, exist_ok=True)
+        app.extensions["upload_sessions"] = self
+
+    def create(self, mid, filename, size, part_size=None):
+        """
+        업로드 세션을 만드는 함수
+
+        Args:
+            mid (str): MSDS ID
+            filename (str): 원본 파일명
+            size (int): 전체 파일 크기(바이트)
+            part_size (int, optional): 조각 크기 (기본값: UPLOAD_PART_SIZE, 최대값도 UPLOAD_PART_SIZE)
+
+        Returns:
+            dict: 세션 정보 (status() 형식)
+
+        Raises:
+            UploadPartError: 크기가 0 이하이거나 UPLOAD_MAX_SIZE를 넘는 경우
+        """
+        if size <= 0 or size > self.max_size:
+            raise UploadPartError(f"size must be between 1 and {self.max_size}")
+        part_size = min(int(part_size or self.part_size), self.part_size)
+        if part_size < 1:
+            raise UploadPartError("part_size must be positive")
+        self._purge_expired()
+
+        manifest = {
+            "id": uuid.uuid4().hex,
+            "mid": mid,
+            "filename": filename,
+            "size": size,
+            "part_size": part_size,
+            "parts_total": -(-size // part_size),  # 올림 나눗셈
+            "state": OPEN,
+            "created_at": time.time(),
+        }
+        os.makedirs(self._session_dir(manifest["id"]))
+        self._write_manifest(manifest)
+        return self.status(manifest["id"])
+
+    def manifest(self, session_id):
+        """
+        세션 manifest를 읽는 함수 (만료된 세션은 삭제 후 없음으로 처리)
+
+        Args:
+            session_id (str): 세션 ID
+
+        Returns:
+            dict: manifest
+
+        Raises:
+            UploadSessionNotFound: 세션이 없거나 만료된 경우
+        """
+        if not SESSION_ID_PATTERN.match(session_id or ""):
+            raise UploadSessionNotFound(session_id)
+        session_dir = self._session_dir(session_id)
+        try:
+            if self.ttl > 0 and time.time() - os.stat(session_dir).st_mtime > self.ttl:
+                shutil.rmtree(session_dir, ignore_errors=True)
+                raise UploadSessionNotFound(session_id)
+            with open(os.path.join(session_dir, "manifest.json"), "r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            raise UploadSessionNotFound(session_id) from None
+
+    def status(self, session_id):
+        """
+        세션 상태를 반환하는 함수 (받은 조각/빠진 조각 번호 포함)
+
+        Args:
+            session_id (str): 세션 ID
+
+        Returns:
+            dict: manifest + received, missing, bytes_received, expires_at
+        """
+        manifest = self.manifest(session_id)
+        received = self._received(session_id)
+        status = dict(manifest)
+        status["received"] = sorted(received)
+        status["missing"] = [n for n in range(1, manifest["parts_total"] + 1) if n not in received]
+        status["bytes_received"] = sum(received.values())
+        mtime = os.stat(self._session_dir(session_id)).st_mtime
+        status["expires_at"] = mtime + self.ttl if self.ttl > 0 else None
+        return status
+
+    def expected_part_size(self, manifest, number):
+        """
+        조각 번호별 기대 크기를 계산하는 함수 (마지막 조각만 작을 수 있음)
+
+        Raises:
+            UploadPartError: 조각 번호가 범위를 벗어난 경우
+        """
+        if number < 1 or number > manifest["parts_total"]:
+            raise UploadPartError(f"part number must be between 1 and {manifest['parts_total']}")
+        if number < manifest["parts_total"]:
+            return manifest["part_size"]
+        return manifest["size"] - manifest["part_size"] * (manifest["parts_total"] - 1)
+
+    def put_part(self, session_id, number, stream, checksum, chunk_size=64 * 1024):
+        """
+        조각 하나를 받아 체크섬을 확인한 뒤 저장하는 함수
+        같은 조각을 다시 보내면 덮어씁니다 (재시도 허용).
+
+        Args:
+            session_id (str): 세션 ID
+            number (int): 조각 번호 (1부터)
+            stream: 요청 본문 스트림 (read(n) 지원)
+            checksum (str): 조각 본문의 SHA-256 (16진수)
+            chunk_size (int): 한 번에 읽을 바이트 수
+
+        Returns:
+            dict: 저장된 조각 정보 (number, size, sha256)
+
+        Raises:
+            UploadSessionNotFound: 세션이 없거나 만료된 경우
+            UploadPartError: 번호/크기/체크섬 오류이거나 완료 처리 중인 세션인 경우
+        """
+        manifest = self.manifest(session_id)
+        if manifest["state"] != OPEN or self._claimed(session_id):
+            raise UploadPartError("Upload session is being completed")
+        expected = self.expected_part_size(manifest, number)
+        checksum = (checksum or "").strip().lower()
+        if not re.match(r"^[0-9a-f]{64}$", checksum):
+            raise UploadPartError("X-Part-SHA256 header (hex SHA-256 of the part) is required")
+
+        path = self._part_path(session_id, number)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        digest = hashlib.sha256()
+        written = 0
+        try:
+            with open(tmp_path, "wb") as fh:
+                while True:
+                    chunk = stream.read(min(chunk_size, expected - written + 1))
+                    if not chunk:
+                        break
+                    written += len(chunk)
+                    if written > expected:
+                        raise UploadPartError(f"part {number} must be {expected} bytes")
+                    digest.update(chunk)
+                    fh.write(chunk)
+            if written != expected:
+                raise UploadPartError(f"part {number} must be {expected} bytes (received {written})")
+            if digest.hexdigest() != checksum:
+                raise UploadPartError(f"part {number} checksum mismatch")
+            if self._claimed(session_id):
+                # 받는 동안 완료 요청이 선점했으면 업로드 중인 조각을 바꾸지 않음
+                raise UploadPartError("Upload session is being completed")
+            # 조각 파일을 먼저 바꾼 뒤 체크섬 파일 기록 (체크섬 파일이 있어야 받은 조각으로 인정)
+            os.replace(tmp_path, path)
+            with open(f"{path}.sha256", "w", encoding="ascii") as fh:
+                fh.write(checksum)
+        except Exception:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        return {"number": number, "size": written, "sha256": checksum}
+
+    def begin_complete(self, session_id):
+        """
+        모든 조각이 모였는지 확인하고 세션을 완료 처리 상태로 바꾸는 함수
+        (중복 완료 요청이 업로드 작업을 두 번 만들지 않도록, 다른 워커 프로세스와도 겹치지 않는
+        completing 표시 파일(O_EXCL 생성)로 세션을 선점한 뒤 상태를 바꿉니다)
+
+        Args:
+            session_id (str): 세션 ID
+
+        Returns:
+            tuple: (manifest, 조각 파일 경로 목록)
+
+        Raises:
+            UploadSessionNotFound: 세션이 없거나 만료된 경우
+            UploadIncomplete: 빠진 조각이 있는 경우
+            UploadPartError: 이미 완료 처리 중인 경우
+        """
+        self.manifest(session_id)  # 없거나 만료된 세션 확인
+        try:
+            os.close(os.open(self._claim_path(session_id), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644))
+        except FileExistsError:
+            raise UploadPartError("Upload session is already being completed") from None
+        except OSError:
+            raise UploadSessionNotFound(session_id) from None
+        try:
+            manifest = self.manifest(session_id)
+            if manifest["state"] != OPEN:
+                raise UploadPartError("Upload session is already being completed")
+            received = self._received(session_id)
+            missing = [n for n in range(1, manifest["parts_total"] + 1) if n not in received]
+            if missing:
+                raise UploadIncomplete(missing)
+            manifest["state"] = COMPLETING
+            self._write_manifest(manifest)
+        except BaseException:
+            self._release(session_id)
+            raise
+        paths = [self._part_path(session_id, n) for n in range(1, manifest["parts_total"] + 1)]
+        return manifest, paths
+
+    def reopen(self, session_id):
+        """업로드 작업이 실패한 세션을 다시 open 상태로 되돌리는 함수 (조각 재사용)"""
+        try:
+            manifest = self.manifest(session_id)
+        except UploadSessionNotFound:
+            return
+        manifest["state"] = OPEN
+        self._write_manifest(manifest)
+        self._release(session_id)
+
+    def _claim_path(self, session_id):
+        return os.path.join(self._session_dir(session_id), "completing")
+
+    def _claimed(self, session_id):
+        """완료 요청이 세션을 선점했는지 확인하는 함수"""
+        return os.path.exists(self._claim_path(session_id))
+
+    def _release(self, session_id):
+        """완료 선점 표시 파일을 지우는 함수 (다시 완료를 요청할 수 있게 됨)"""
+        try:
+            os.remove(self._claim_path(session_id))
+        except OSError:
+            pass
+
+    def discard(self, session_id):
+        """세션과 조각 파일을 모두 삭제하는 함수"""
+        if SESSION_ID_PATTERN.match(session_id or ""):
+            shutil.rmtree(self._session_dir(session_id), ignore_errors=True)
+
+    def _received(self, session_id):
+        """받은 조각 번호 -> 크기 딕셔너리를 반환하는 함수 (체크섬 파일이 있는 조각만)"""
+        received = {}
+        session_dir = self._session_dir(session_id)
+        for name in os.listdir(session_dir):
+            match = re.match(r"^part-(\d{5})\.sha256$", name)
+            if match:
+                try:
+                    received[int(match.group(1))] = os.path.getsize(os.path.join(session_dir, name[:-7]))
+                except OSError:
+                    pass
+        return received
+
+    def _session_dir(self, session_id):
+        return os.path.join(self.directory, session_id)
+
+    def _part_path(self, session_id, number):
+        return os.path.join(self._session_dir(session_id), f"part-{number:05d}")
+
+    def _write_manifest(self, manifest):
+        """manifest를 임시 파일에 쓴 뒤 교체하는 함수"""
+        path = os.path.join(self._session_dir(manifest["id"]), "manifest.json")
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(manifest, fh, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _purge_expired(self):
+        """활동 없이 TTL이 지난 세션을 삭제하는 함수 (최대 10분에 한 번)"""
+        now = time.time()
+        if self.ttl <= 0 or now - self._last_purge < 600:
+            return
+        self._last_purge = now
+        for name in os.listdir(self.directory):
+            session_dir = os.path.join(self.directory, name)
+            try:
+                if now - os.stat(session_dir).st_mtime > self.ttl:
+                    shutil.rmtree(session_dir, ignore_errors=True)
+            except OSError:
+                pass
+
+    def stats(self):
+        """
+        세션 통계를 반환하는 함수
+
+        Returns:
+            dict: 현재 세션 수와 설정값
+        """
+        try:
+            sessions = len(os.listdir(self.directory))
+        except OSError:
+            sessions = 0
+        return {"sessions": sessions, "part_size": self.part_size, "max_size": self.max_size, "ttl": self.ttl}
@@ -0,0 +1,171 @@
+"""
+테이블 버전 카운터 모듈
+쓰기 작업마다 증가하는 테이블별 버전 번호를 관리합니다.
+
+캐시(개수, 옵션 목록 등)는 저장 당시의 버전과 현재 버전을 비교하여 유효성을 판단합니다.
+gunicorn 워커 여러 개가 같은 값을 보도록 카운터는 로컬 파일에 저장하며,
+읽기는 SQL 없이 작은 파일 하나를 읽는 것으로 끝납니다. (단일 호스트 기준)
+"""
+
+import os
+import threading
+import time
+
+try:
+    import fcntl  # POSIX 파일 잠금 (Windows에서는 사용 불가)
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+# 버전을 관리하는 테이블 목록 (msds_content: PDF 본문 저장소 - services/pdf_text.py)
+TABLES = ("msds", "msds_additional_info", "msds_additional_relation", "msds_content")
+
+
+class TableVersions:
+    """
+    테이블 버전 카운터 클래스
+
+    - bump(table)는 파일 잠금 아래에서 카운터를 1 증가시키고 os.replace로 원자적으로 기록합니다 (워커 간 공유).
+    - get(table)은 잠금 없이 현재 카운터를 읽습니다.
+    - 카운터 파일이 없으면 현재 시각(ms)에서 시작하므로 파일을 지워도 이전 값과 겹치지 않습니다.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self.directory = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Flask 애플리케이션에 버전 카운터를 등록하는 함수
+
+        Args:
+            app (Flask): Flask 애플리케이션 인스턴스
+        """
+        self.directory = os.path.abspath(app.config.get("TABLE_VERSION_DIR") or
+                                         os.path.join(app.instance_path, "table_versions"))
+        os.makedirs(self.directory, exist_ok=True)
+        app.extensions["table_versions"] = self
+
+    def _path(self, table):
+        if table not in TABLES:
+            raise ValueError(f"Unknown table: {table}")
+        return os.path.join(self.directory, table)
+
+    def get(self, table):
+        """
+        테이블의 현재 버전을 반환하는 함수
+
+        Args:
+            table (str): 테이블명
+
+        Returns:
+            int: 현재 버전
+        """
+        value = self._read(table)
+        if value is None:
+            with self._locked(table):
+                value = self._read(table)
+                if value is None:
+                    value = int(time.time() * 1000)
+                    self._write(table, value)
+        return value
+
+    def bump(self, *tables):
+        """
+        테이블 버전을 1씩 증가시키는 함수 (쓰기 라우트에서 호출)
+
+        Args:
+            *tables (str): 변경된 테이블명들
+
+        Returns:
+            dict: 테이블명 -> 새 버전
+        """
+        result = {}
+        for table in tables:
+            with self._locked(table):
+                current = self._read(table)
+                value = (current if current is not None else int(time.time() * 1000)) + 1
+                self._write(table, value)
+                result[table] = value
+        return result
+
+    def token(self, *tables):
+        """
+        여러 테이블 버전을 하나의 문자열로 합치는 함수 (캐시 키/ETag용)
+
+        Args:
+            *tables (str): 테이블명들
+
+        Returns:
+            str: 예) "msds.12-msds_additional_info.7"
+        """
+        return "-".join(f"{table}.{self.get(table)}" for table in tables)
+
+    def last_modified(self, *tables):
+        """
+        테이블들의 마지막 변경 시각을 반환하는 함수 (Last-Modified 헤더용)
+        카운터 파일은 bump마다 교체되므로 파일 수정 시각이 곧 마지막 쓰기 시각입니다.
+
+        Args:
+            *tables (str): 테이블명들
+
+        Returns:
+            float: 가장 최근 변경 시각 (epoch 초)
+        """
+        latest = 0.0
+        for table in tables:
+            self.get(table)  # 카운터 파일이 없으면 생성
+            try:
+                latest = max(latest, os.stat(self._path(table)).st_mtime)
+            except OSError:
+                latest = max(latest, time.time())
+        return latest
+
+    def _read(self, table):
+        """카운터 파일을 읽는 함수 (없거나 손상된 경우 None)"""
+        try:
+            with open(self._path(table), "r", encoding="ascii") as fh:
+                return int(fh.read().strip())
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, table, value):
+        """카운터 값을 임시 파일에 쓴 뒤 교체하는 함수 (읽는 쪽이 중간 상태를 보지 않음)"""
+        path = self._path(table)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="ascii") as fh:
+            fh.write(str(value))
+        os.replace(tmp_path, path)
+
+    def _locked(self, table):
+        """카운터를 배타적으로 잠그는 컨텍스트 매니저를 반환하는 함수"""
+        return _CounterLock(self._path(table) + ".lock", self._lock)
+
+
+class _CounterLock:
+    """프로세스 내(threading.Lock)와 프로세스 간(fcntl.flock) 잠금을 함께 거는 컨텍스트 매니저"""
+
+    def __init__(self, path, thread_lock):
+        self._path = path
+        self._thread_lock = thread_lock
+        self._fd = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        try:
+            self._fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+        except Exception:
+            self._thread_lock.release()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+        finally:
+            self._thread_lock.release()
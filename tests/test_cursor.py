@@ -0,0 +1,121 @@
+"""
+커서 페이지네이션 회귀 테스트
+목록/검색 엔드포인트가 서로의 커서(또는 다른 검색 범위의 커서)를 받으면 500 대신 400을 반환하는지 확인합니다.
+"""
+
+import os
+import sqlite3
+
+import pytest
+
+from services.pagination import encode_cursor, NEXT, PREV
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    """
+    임시 SQLite 카탈로그(염산 30건)로 앱을 만들어 테스트 클라이언트를 반환하는 픽스처
+    """
+    import config
+
+    state_dir = tmp_path_factory.mktemp("msds-state")
+    database = state_dir / "msds.db"
+    conn = sqlite3.connect(database)
+    conn.executescript("""
+        CREATE TABLE msds (
+            mid VARCHAR(20) PRIMARY KEY, title VARCHAR(255) NOT NULL, usage VARCHAR(255), file_loc VARCHAR(1024),
+            is_osh INTEGER NOT NULL DEFAULT 0, is_chr INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE msds_additional_info (
+            aid INTEGER PRIMARY KEY, mid VARCHAR(20), title VARCHAR(255), type INTEGER, file_loc VARCHAR(1024),
+            createdAt TEXT DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE msds_additional_relation (
+            mid VARCHAR(20), aid INTEGER, createdAt TEXT DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+    conn.executemany(
+        "INSERT INTO msds (mid, title, usage) VALUES (?, ?, ?)",
+        [(f"M{i:04d}", f"염산 {i}", "세척용" if i % 2 else "실험용") for i in range(1, 31)]
+    )
+    conn.commit()
+    conn.close()
+
+    overrides = {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{database}",
+        "SUPABASE_URL": "http://127.0.0.1:9",
+        "SUPABASE_SERVICE_ROLE_KEY": "test.service.role",
+        "SQL_PROFILE": False,
+        "JOB_WORKERS": 1,
+        "PDF_TEXT_WORKERS": 1,
+    }
+    for name in ("CONTENT_CACHE_DIR", "TABLE_VERSION_DIR", "JOB_DIR", "UPLOAD_SPOOL_DIR", "PDF_TEXT_DIR", "METRICS_DIR"):
+        overrides[name] = os.path.join(state_dir, name.lower())
+    for key, value in overrides.items():
+        setattr(config.Config, key, value)
+
+    from app import create_app
+
+    return create_app().test_client()
+
+
+def _walk(client, url):
+    """첫 페이지부터 next_cursor로 끝까지 넘기며 (응답 목록, mid 목록)을 반환하는 헬퍼 함수"""
+    pages, mids = [], []
+    response = client.get(url)
+    while True:
+        assert response.status_code == 200
+        body = response.get_json()
+        pages.append(body)
+        mids.extend(item["mid"] for item in body["items"])
+        if not body["next_cursor"]:
+            return pages, mids
+        sep = "&" if "?" in url else "?"
+        response = client.get(f"{url}{sep}cursor={body['next_cursor']}")
+
+
+@pytest.mark.parametrize("url", [
+    "/api/msds?per_page=7",
+    "/api/msds/search?per_page=7",
+    "/api/msds/search?q=%EC%97%BC%EC%82%B0&per_page=7",
+])
+def test_cursor_round_trip(client, url):
+    pages, mids = _walk(client, url)
+    assert len(mids) == 30 and len(set(mids)) == 30
+
+    # 마지막 페이지의 prev_cursor로 돌아가면 직전 페이지와 같은 항목이 나와야 함
+    sep = "&" if "?" in url else "?"
+    response = client.get(f"{url}{sep}cursor={pages[-1]['prev_cursor']}")
+    assert response.status_code == 200
+    assert [item["mid"] for item in response.get_json()["items"]] == [item["mid"] for item in pages[-2]["items"]]
+
+
+def test_cursor_from_other_endpoint_is_rejected(client):
+    list_cursor = client.get("/api/msds?per_page=5").get_json()["next_cursor"]
+    meta_cursor = client.get("/api/msds/search?q=%EC%97%BC%EC%82%B0&per_page=5").get_json()["next_cursor"]
+    assert list_cursor and meta_cursor
+
+    cases = [
+        f"/api/msds?cursor={meta_cursor}",
+        f"/api/msds/search?q=%EC%97%BC%EC%82%B0&cursor={list_cursor}",
+        f"/api/msds/search?q=%EC%97%BC%EC%82%B0&scope=content&cursor={meta_cursor}",
+        f"/api/msds/search?cursor={meta_cursor}",
+    ]
+    for url in cases:
+        response = client.get(url)
+        assert response.status_code == 400, url
+        assert response.get_json()["message"] == "Invalid cursor"
+
+
+@pytest.mark.parametrize("key", [["x", "M0001"], [True, "M0001"], [1.0], 7, {"k": 1}])
+def test_malformed_search_key_is_rejected(client, key):
+    for direction in (NEXT, PREV):
+        cursor = encode_cursor(key, direction, "meta")
+        response = client.get(f"/api/msds/search?q=%EC%97%BC%EC%82%B0&cursor={cursor}")
+        assert response.status_code == 400
+
+
+@pytest.mark.parametrize("key", [["M0001"], 3, {"mid": "M0001"}])
+def test_malformed_list_key_is_rejected(client, key):
+    response = client.get(f"/api/msds?cursor={encode_cursor(key, NEXT, 'list')}")
+    assert response.status_code == 400